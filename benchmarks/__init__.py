@@ -0,0 +1,7 @@
+"""
+Benchmarks of tikzplotly.
+
+The benchmarks follow the conventions of airspeed velocity (asv): each class may define `params`, `param_names` and a
+`setup` method, methods prefixed by `time_` are timed, methods prefixed by `track_` return a value to record.
+They can also be run without asv, see `python -m benchmarks --help`.
+"""
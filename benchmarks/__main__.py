@@ -0,0 +1,85 @@
+"""
+Run the benchmarks without asv.
+
+    python -m benchmarks                    # all benchmarks
+    python -m benchmarks data_container     # only the modules / classes / methods matching the pattern
+    python -m benchmarks --max-size 100000  # skip the parameters larger than 1e5 points
+"""
+import argparse
+import importlib
+import inspect
+import itertools
+import pkgutil
+import timeit
+from pathlib import Path
+
+
+def iter_benchmark_classes():
+    """Yield (module name, class) for every benchmark class of the package."""
+    for module_info in pkgutil.iter_modules([str(Path(__file__).parent)]):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"{__package__}.{module_info.name}")
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            # Like asv, skip the private classes, used as base classes
+            if cls.__module__ == module.__name__ and not cls.__name__.startswith("_"):
+                yield module_info.name, cls
+
+
+def time_call(func, repeat):
+    """Best wall time of `repeat` calls of func, in seconds."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def format_time(seconds):
+    """Format a duration with a suitable unit."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def run_class(module_name, cls, pattern, repeat, max_size=None):
+    """Run all the benchmarks of a class, for all its parameters not larger than max_size."""
+    params = getattr(cls, "params", [])
+    if params and not isinstance(params[0], (list, tuple)):
+        params = [params]
+    param_names = getattr(cls, "param_names", [f"param{i}" for i in range(len(params))])
+    methods = [name for name, _ in inspect.getmembers(cls, inspect.isfunction) if name.startswith(("time_", "track_"))]
+    methods = [name for name in methods if pattern in f"{module_name}.{cls.__name__}.{name}"]
+    if not methods:
+        return
+
+    for combination in itertools.product(*params):
+        if max_size is not None and any(isinstance(v, int) and v > max_size for v in combination):
+            continue
+        instance = cls()
+        if hasattr(instance, "setup"):
+            instance.setup(*combination)
+        label = ", ".join(f"{name}={value}" for name, value in zip(param_names, combination))
+        for name in methods:
+            method = getattr(instance, name)
+            if name.startswith("time_"):
+                result = format_time(time_call(lambda: method(*combination), repeat))
+            else:
+                result = f"{method(*combination)} {getattr(method, 'unit', '')}".rstrip()
+            print(f"{module_name}.{cls.__name__}.{name}({label}): {result}", flush=True)
+        if hasattr(instance, "teardown"):
+            instance.teardown(*combination)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pattern", nargs="?", default="", help="only run the benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timings per benchmark, the best one is kept")
+    parser.add_argument("--max-size", type=int, default=None,
+                        help="skip the benchmarks with an integer parameter (size, number of traces) larger than this")
+    args = parser.parse_args()
+
+    for module_name, cls in iter_benchmark_classes():
+        run_class(module_name, cls, args.pattern, args.repeat, args.max_size)
+
+
+if __name__ == "__main__":
+    main()
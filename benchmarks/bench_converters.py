@@ -0,0 +1,116 @@
+"""
+Benchmarks of get_tikz_code for each converter, on synthetic figures of 1e3 to 1e7 points.
+
+Each class times the conversion of one figure and tracks the size of the output (TeX code, plus the PNG image for
+heatmaps), so that regressions in speed or in output size are both visible.
+"""
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+import numpy as np
+import plotly.graph_objects as go
+from tikzplotly import get_tikz_code
+
+SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+
+class _ConverterBenchmark(ABC):
+    """Base class of the converter benchmarks, the figure is built by `make_figure` from the number of points."""
+    params = SIZES
+    param_names = ["n_points"]
+    timeout = 600
+
+    @abstractmethod
+    def make_figure(self, n_points):
+        """Build the figure of the benchmark, with n_points points."""
+
+    def setup(self, *params):
+        self.fig = self.make_figure(*params)
+        self.tmp_dir = tempfile.mkdtemp()
+        self.kwargs = {"img_name": os.path.join(self.tmp_dir, "heatmap.png")}
+
+    def teardown(self, *params):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def time_get_tikz_code(self, *params):
+        get_tikz_code(self.fig, **self.kwargs)
+
+    def track_output_bytes(self, *params):
+        size = len(get_tikz_code(self.fig, **self.kwargs).encode())
+        for file_name in os.listdir(self.tmp_dir):
+            size += os.path.getsize(os.path.join(self.tmp_dir, file_name))
+        return size
+    track_output_bytes.unit = "bytes"
+
+
+class Scatter(_ConverterBenchmark):
+    """Line trace with numeric x and y."""
+
+    def make_figure(self, n_points):
+        rng = np.random.default_rng(0)
+        x = np.arange(n_points, dtype=float)
+        return go.Figure(go.Scatter(x=x, y=np.sin(x / 100) + rng.normal(0, 0.1, n_points), mode="lines"))
+
+
+class Bar(_ConverterBenchmark):
+    """Bar trace with one bar per point."""
+
+    def make_figure(self, n_points):
+        rng = np.random.default_rng(0)
+        return go.Figure(go.Bar(x=np.arange(n_points), y=rng.integers(0, 100, n_points)))
+
+
+class Histogram(_ConverterBenchmark):
+    """Histogram of normal samples, binned by pgfplots or by NumPy."""
+    params = (SIZES, [False, True])
+    param_names = ["n_points", "prebin_histograms"]
+
+    def make_figure(self, n_points, prebin_histograms):
+        rng = np.random.default_rng(0)
+        return go.Figure(go.Histogram(x=rng.normal(0, 1, n_points)))
+
+    def setup(self, n_points, prebin_histograms):
+        super().setup(n_points, prebin_histograms)
+        self.kwargs["prebin_histograms"] = prebin_histograms
+
+
+class Heatmap(_ConverterBenchmark):
+    """Square heatmap of n_points cells, rasterized to a PNG image."""
+
+    def make_figure(self, n_points):
+        side = int(np.sqrt(n_points))
+        rng = np.random.default_rng(0)
+        return go.Figure(go.Heatmap(z=rng.random((side, side)), colorscale="Viridis"))
+
+
+class ScatterPolar(_ConverterBenchmark):
+    """Polar line trace, with theta in degrees."""
+
+    def make_figure(self, n_points):
+        theta = np.linspace(0, 360, n_points)
+        return go.Figure(go.Scatterpolar(r=1 + np.cos(np.radians(theta) * 5), theta=theta, mode="lines"))
+
+
+class Scatter3D(_ConverterBenchmark):
+    """3D marker trace."""
+
+    def make_figure(self, n_points):
+        rng = np.random.default_rng(0)
+        x, y, z = rng.random((3, n_points))
+        return go.Figure(go.Scatter3d(x=x, y=y, z=z, mode="markers"))
+
+
+class ManyTraces(_ConverterBenchmark):
+    """Figure of n_traces line traces of 1000 points, sharing their x values or not."""
+    params = ([10, 100, 1000], ["shared", "distinct"])
+    param_names = ["n_traces", "x_values"]
+
+    def make_figure(self, n_traces, x_values):
+        rng = np.random.default_rng(0)
+        x = np.arange(1000, dtype=float)
+        fig = go.Figure()
+        for i in range(n_traces):
+            fig.add_scatter(x=x if x_values == "shared" else x + i, y=rng.standard_normal(1000), mode="lines",
+                            name=f"trace{i}")
+        return fig
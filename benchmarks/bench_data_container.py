@@ -0,0 +1,32 @@
+"""
+Benchmarks of DataContainer, with many traces sharing (or not) their x values.
+"""
+import numpy as np
+from tikzplotly._dataContainer import DataContainer
+
+
+class TimeAddDataManyTraces:
+    """Add `n_traces` traces of 1000 points to a DataContainer, as a px.line figure with many color groups does."""
+    params = ([10, 100, 1000], ["shared", "distinct"])
+    param_names = ["n_traces", "x_values"]
+
+    def setup(self, n_traces, x_values):
+        rng = np.random.default_rng(0)
+        n_points = 1000
+        if x_values == "shared":
+            self.xs = [np.arange(n_points, dtype=float)] * n_traces
+        else:
+            self.xs = [np.arange(n_points, dtype=float) + i for i in range(n_traces)]
+        self.ys = [rng.standard_normal(n_points) for _ in range(n_traces)]
+
+    def time_add_data(self, n_traces, x_values):
+        data_container = DataContainer()
+        for i, (x, y) in enumerate(zip(self.xs, self.ys)):
+            data_container.add_data(x, y, f"trace{i}")
+
+    def track_tables(self, n_traces, x_values):
+        data_container = DataContainer()
+        for i, (x, y) in enumerate(zip(self.xs, self.ys)):
+            data_container.add_data(x, y, f"trace{i}")
+        return len(data_container.data)
+    track_tables.unit = "tables"
@@ -0,0 +1,73 @@
+"""
+Import time of tikzplotly, measured in a fresh interpreter with `python -X importtime`.
+
+Also usable as a check with a budget, as done in the CI:
+
+    python -m benchmarks.bench_import --budget 25
+"""
+import argparse
+import subprocess
+import sys
+
+# Modules that `import tikzplotly` must not load, they are only needed to convert figures
+HEAVY_MODULES = ["numpy", "PIL", "plotly", "tikzplotly._save", "tikzplotly._color", "tikzplotly._cache",
+                 "tikzplotly._datastore"]
+
+
+def import_time(module="tikzplotly", repeat=5):
+    """Measure the cumulative import time of a module in fresh interpreters.
+
+    Parameters
+    ----------
+    module, optional
+        name of the module to import, by default "tikzplotly"
+    repeat, optional
+        number of measurements, the best one is kept, by default 5
+
+    Returns
+    -------
+        tuple (time, loaded), where time is the import time in microseconds and loaded the set of the modules imported
+    """
+    best = None
+    loaded = set()
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                capture_output=True, text=True, check=True)
+        # Lines are "import time: self [us] | cumulative | imported package"
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            loaded.add(name.strip())
+            if name.strip() == module:
+                best = int(cumulative) if best is None else min(best, int(cumulative))
+    return best, loaded
+
+
+class ImportTime:
+    """Cold import time of tikzplotly."""
+    timeout = 120
+
+    def track_import_tikzplotly(self):
+        return import_time("tikzplotly")[0]
+    track_import_tikzplotly.unit = "us"
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_import", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=25, help="maximal import time, in milliseconds")
+    parser.add_argument("--repeat", type=int, default=5, help="number of measurements, the best one is kept")
+    args = parser.parse_args()
+
+    time, loaded = import_time("tikzplotly", args.repeat)
+    heavy = [module for module in HEAVY_MODULES if module in loaded]
+    print(f"import tikzplotly: {time / 1e3:.2f} ms (budget {args.budget:g} ms)")
+    if heavy:
+        print(f"modules loaded by import tikzplotly, but only needed for the conversion: {', '.join(heavy)}")
+    if heavy or time > args.budget * 1e3:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
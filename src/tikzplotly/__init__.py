@@ -4,11 +4,46 @@ tikzplotly package initialization.
 This module imports and exposes the package version, as well as the main
 functions for generating and saving TikZ code from plotly figures.
 
+The functions are imported on first access, so that `import tikzplotly` does not load numpy, Pillow or the
+converters until a figure is actually converted.
+
 Exports:
     get_tikz_code (Callable): Function to generate TikZ code from a plotly figure.
+    iter_tikz_code (Callable): Function to generate TikZ code from a plotly figure, chunk by chunk.
     save (Callable): Function to save TikZ code to a file.
+    save_many (Callable): Function to save several figures in parallel worker processes.
+    Profile (class): Timings of the stages of a conversion, filled when given as the `profile` argument.
+    TraceCache (class): Cache of converted traces, reused when given as the `cache` argument.
+    DataStore (class): Columns shared by the figures of a document, given as the `data_store` argument.
+    Diagnostics (class): Diagnostics of a conversion, collected when given as the `diagnostics` argument.
 """
+from importlib import import_module
 from .__about__ import __version__, __author__, __license__, __description__
-from ._save import get_tikz_code, save
 
-__all__ = ["__version__", "__author__", "__license__", "__description__", "get_tikz_code", "save"]
+# Module defining each lazily imported attribute
+_LAZY_ATTRIBUTES = {
+    "get_tikz_code": "._save",
+    "iter_tikz_code": "._save",
+    "save": "._save",
+    "save_many": "._batch",
+    "Profile": "._profile",
+    "TraceCache": "._cache",
+    "DataStore": "._datastore",
+    "Diagnostics": "._diagnostics",
+}
+
+__all__ = ["__version__", "__author__", "__license__", "__description__", "get_tikz_code", "iter_tikz_code", "save",
+           "save_many", "Profile", "TraceCache",
+           "DataStore", "Diagnostics"]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -79,7 +79,10 @@ def str_from_annotation(annotation_list, axis: Axis, colors_set):
         y_anchor = anchor_dict[annotation.yanchor]
         x_ref = annotation.xref
         y_ref = annotation.yref
-        x_coordinate, y_coordinate, relative = get_coordinates(annotation.x, annotation.y, x_ref, y_ref)
+        # The coordinates in the axis are placed as those of the traces: categories at their positions, encoded dates
+        x = annotation.x if x_ref == "paper" else axis.encode_position("x", annotation.x)
+        y = annotation.y if y_ref == "paper" else axis.encode_position("y", annotation.y)
+        x_coordinate, y_coordinate, relative = get_coordinates(x, y, x_ref, y_ref)
         anchor_option = f"{y_anchor} {x_anchor}".rstrip()
 
         if anchor_option != "":
@@ -5,17 +5,21 @@ This module provides the Axis class, which manages the TikZ axis environment for
 It handles axis options, labels, ticks, background, and bar layout, supporting customization via Plotly figure layout and color sets.
 """
 
-from warnings import warn
 from ._color import convert_color
 from ._tex import tex_begin_environment
-from ._utils import sanitize_tex_text, option_dict_to_str, get_ticks_str
+import numpy as np
+from ._utils import sanitize_tex_text, option_dict_to_str
+from ._diagnostics import report
+from ._data import format_value, format_floats, factorize_strings, column_info
+from ._dates import parse_dates, format_dates, format_coordinates, date_offsets, date_ticks
 
 class Axis():
     """Class to handle the axis environment in TikZ.
     This class manages the options and environment for the TikZ axis, including labels, ticks, and background.
     """
 
-    def __init__(self, layout, colors_set, axis_options=None):
+    def __init__(self, layout, colors_set, axis_options=None, precompute_bars=False, float_formats=None,
+                 date_encoding="dateplot"):
         """Initialize an Axis.
 
         Parameters
@@ -27,8 +31,18 @@ class Axis():
         axis_options
             options given to the axis environment, by default None.
             Can be a dict ({option: value}) or a string ("option1=value1, option2=value2").
+        precompute_bars
+            the bars are drawn as rectangles laid out by tikzplotly, so the bar options of pgfplots are not used,
+            by default False.
+        float_formats
+            format of the floats of the limits of each axis, as a dict {"x": format, "y": format}, see
+            `format_floats`, by default None.
+        date_encoding
+            encoding of the dates, "dateplot" or "numeric", see `tikzplotly._dates`, by default "dateplot".
         """
         self.layout = layout
+        self.float_formats = float_formats or {}
+        self.date_encoding = date_encoding
 
         self.options = {}
         if isinstance(axis_options, dict):
@@ -43,13 +57,23 @@ class Axis():
                     self.options[option] = None
         self.environment = "axis"
 
-        self.xticks = None
+        # Categories of the x and y axes, mapped to their positions, shared by all the traces
+        self.categories = {"x": {}, "y": {}}
+        self.category_labels = {"x": [], "y": []}
+        # Numeric date encoding: origin of the dates of the x and y axes, ranges of the dates of each trace, and
+        # limits of the dates given by the layout
+        self.date_origins = {"x": None, "y": None}
+        self.date_ranges = {"x": [], "y": []}
+        self.date_limits = {"x": None, "y": None}
+        # List where the calls to add_option and set_environment are recorded, if not None
+        self.recorder = None
         self.x_label = None
         self.y_label = None
 
         self.treat_axis_layout()
         self.treat_background_layout(colors_set)
-        self.treat_bar_layout()
+        if not precompute_bars:
+            self.treat_bar_layout()
 
     def set_x_label(self, x_label):
         """Set the x label.
@@ -71,6 +95,205 @@ class Axis():
         """
         self.y_label = y_label
 
+    def add_categories(self, direction, categories):
+        """Add categories to an axis, after the categories already placed on it.
+
+        Parameters
+        ----------
+        direction
+            "x" or "y"
+        categories
+            categories to add, those already on the axis are ignored
+        """
+        index = self.categories[direction]
+        labels = self.category_labels[direction]
+        for category in categories:
+            if category not in index:
+                index[category] = len(index)
+                labels.append(sanitize_tex_text(str(category)))
+        if not index:
+            return
+        self.add_option(f"{direction}tick", "{" + ",".join(map(str, range(len(index)))) + "}")
+        self.add_option(f"{direction}ticklabels", "{" + ",".join(labels) + "}")
+
+    def encode_categories(self, direction, values):
+        """Get the positions of categorical values on an axis, placing their new categories on it.
+
+        The categories are numbered in order of first appearance across all the traces of the axis, and labelled with
+        `xtick`/`xticklabels` (or `ytick`/`yticklabels`), which pgfplots handles much faster than symbolic coords.
+
+        Parameters
+        ----------
+        direction
+            "x" or "y"
+        values
+            values of a coordinate of a trace
+
+        Returns
+        -------
+            NumPy array of the positions of the values, or None if the values are not all strings
+        """
+        factorized = factorize_strings(values)
+        if factorized is None:
+            return None
+        uniques, codes = factorized
+        self.add_categories(direction, uniques)
+        index = self.categories[direction]
+        return np.array([index[category] for category in uniques], dtype=int)[codes]
+
+    def category_state(self):
+        """Get the categories of the axes, to identify the state of the axis in cache keys.
+
+        Returns
+        -------
+            tuple of the lists of the categories of the x and y axes
+        """
+        return list(self.categories["x"]), list(self.categories["y"])
+
+    def add_date_range(self, direction, low, high):
+        """Add the range of the dates of a trace to an axis, whose ticks cover the dates of all the traces.
+
+        The origin of the dates of the axis is the day of the first range added.
+
+        Parameters
+        ----------
+        direction
+            "x" or "y"
+        low
+            first date of the trace, `datetime64`
+        high
+            last date of the trace, `datetime64`
+        """
+        if self.date_origins[direction] is None:
+            self.date_origins[direction] = low.astype("datetime64[D]")
+        self.date_ranges[direction].append((low, high))
+
+    def encode_dates(self, direction, values):
+        """Get the positions of dates on an axis, as numbers of days since the origin of the axis.
+
+        The ticks of the axis are labelled with the dates, see `date_ticks`, so the `pgfplots.dateplot` library is not
+        needed to read the dates.
+
+        Parameters
+        ----------
+        direction
+            "x" or "y"
+        values
+            dates of a coordinate of a trace, see `parse_dates`
+
+        Returns
+        -------
+            NumPy array of floats, NaN for the missing dates
+        """
+        dates = parse_dates(values)
+        valid = dates[~np.isnat(dates)]
+        if len(valid) > 0:
+            self.add_date_range(direction, valid.min(), valid.max())
+        if self.date_origins[direction] is None:
+            return np.full(len(dates), np.nan)
+        return date_offsets(dates, self.date_origins[direction])
+
+    def encode_coordinates(self, direction, values):
+        """Get the coordinates of a trace as written in its table.
+
+        Parameters
+        ----------
+        direction
+            "x" or "y"
+        values
+            values of a coordinate of a trace
+
+        Returns
+        -------
+            the positions of the categories on the axis, the dates as `datetime64` (written as strings read by
+            `pgfplots.dateplot`, or as categories in y) or as numbers (see `date_encoding`), or the values
+        """
+        info = column_info(values)
+        if info.kind == "categorical":
+            codes = self.encode_categories(direction, values)
+            return values if codes is None else codes
+        if info.kind == "datetime" and self.date_encoding == "numeric":
+            return self.encode_dates(direction, values)
+        if info.kind == "datetime" and direction == "y":
+            # pgfplots.dateplot reads the dates of x only: the dates of y are placed as categories labelled by them
+            dates = parse_dates(values)
+            valid = ~np.isnat(dates)
+            if not valid.any():
+                return values
+            codes = self.encode_categories(direction, format_dates(dates[valid]))
+            if valid.all():
+                return codes
+            positions = np.full(len(dates), np.nan)
+            positions[valid] = codes
+            return positions
+        if info.kind == "datetime":
+            return parse_dates(values)
+        return values
+
+    def encode_position(self, direction, value):
+        """Get the coordinate of a single point on the axis, e.g. of an annotation, as written in `axis cs`.
+
+        Parameters
+        ----------
+        direction
+            "x" or "y"
+        value
+            coordinate of the point
+
+        Returns
+        -------
+            the coordinate encoded as those of the traces, see `encode_coordinates`
+        """
+        if value is None:
+            return value
+        return format_coordinates(self.encode_coordinates(direction, [value]))[0]
+
+    def date_state(self):
+        """Get the origins of the dates of the axes, to identify the state of the axis in cache keys.
+
+        Returns
+        -------
+            tuple of the origins of the x and y axes, as strings, or None
+        """
+        return tuple(None if origin is None else str(origin) for origin in self.date_origins.values())
+
+    def encode_range(self, direction, axis_range):
+        """Encode the range of an axis given by the layout, if its limits are dates and the dates are numeric.
+
+        Parameters
+        ----------
+        direction
+            "x" or "y"
+        axis_range
+            range of the axis in the layout, or None
+
+        Returns
+        -------
+            range of the axis, as numbers of days since the origin of the axis if it is made of dates
+        """
+        if self.date_encoding != "numeric" or axis_range is None or column_info(axis_range).kind != "datetime":
+            return axis_range
+        dates = parse_dates(axis_range)
+        self.date_limits[direction] = (dates.min(), dates.max())
+        return self.encode_dates(direction, dates).tolist()
+
+    def treat_date_ticks(self):
+        """Label the ticks of the axes with numeric dates, covering the limits of the layout or the dates of all the
+        traces.
+        """
+        for direction in "xy":
+            limits = self.date_limits[direction]
+            if limits is None and not self.date_ranges[direction]:
+                continue
+            if limits is None:
+                lows, highs = zip(*self.date_ranges[direction])
+                limits = min(lows), max(highs)
+            ticks, labels = date_ticks(*limits)
+            positions = date_offsets(ticks, self.date_origins[direction])
+            tick_format = self.float_formats.get(direction) or "shortest"
+            self.add_option(f"{direction}tick", "{" + ",".join(format_floats(positions, tick_format)) + "}")
+            self.add_option(f"{direction}ticklabels", "{" + ",".join(labels) + "}")
+
     def add_option(self, option, value):
         """Add an option to the axis, to be used in the axis environment.
 
@@ -81,8 +304,22 @@ class Axis():
         value
             value of the option, can be None
         """
+        if self.recorder is not None:
+            self.recorder.append(("add_option", (option, value)))
         self.options[option] = value
 
+    def set_environment(self, environment):
+        """Set the environment of the axis.
+
+        Parameters
+        ----------
+        environment
+            name of the environment, e.g. "axis" or "polaraxis"
+        """
+        if self.recorder is not None:
+            self.recorder.append(("set_environment", (environment,)))
+        self.environment = environment
+
     def open_environment(self, stack_env):
         """Open the axis environment.
 
@@ -101,6 +338,7 @@ class Axis():
         -------
             string of all options with their values
         """
+        self.treat_date_ticks()
         if self.title is not None:
             self.options["title"] = sanitize_tex_text(self.title)
         if self.x_label is not None:
@@ -133,12 +371,15 @@ class Axis():
         # Handle range
         # In log mode, the range is the exponent of the range : https://plotly.com/python/reference/layout/xaxis/#layout-xaxis-range
         # For more information, refer to documentation https://plotly.com/python/reference/layout/xaxis/#layout-xaxis-autorange
-        if self.layout.xaxis.autorange is False or self.layout.xaxis.range is not None:
-            self.add_option("xmin", self.layout.xaxis.range[0] if self.layout.xaxis.type != "log" else 10**self.layout.xaxis.range[0])
-            self.add_option("xmax", self.layout.xaxis.range[1] if self.layout.xaxis.type != "log" else 10**self.layout.xaxis.range[1])
-        if self.layout.yaxis.autorange is False or self.layout.yaxis.range is not None:
-            self.add_option("ymin", self.layout.yaxis.range[0] if self.layout.yaxis.type != "log" else 10**self.layout.yaxis.range[0])
-            self.add_option("ymax", self.layout.yaxis.range[1] if self.layout.yaxis.type != "log" else 10**self.layout.yaxis.range[1])
+        x_format, y_format = self.float_formats.get("x"), self.float_formats.get("y")
+        x_range = self.encode_range("x", self.layout.xaxis.range)
+        y_range = self.encode_range("y", self.layout.yaxis.range)
+        if self.layout.xaxis.autorange is False or x_range is not None:
+            self.add_option("xmin", format_value(x_range[0] if self.layout.xaxis.type != "log" else 10**x_range[0], x_format))
+            self.add_option("xmax", format_value(x_range[1] if self.layout.xaxis.type != "log" else 10**x_range[1], x_format))
+        if self.layout.yaxis.autorange is False or y_range is not None:
+            self.add_option("ymin", format_value(y_range[0] if self.layout.yaxis.type != "log" else 10**y_range[0], y_format))
+            self.add_option("ymax", format_value(y_range[1] if self.layout.yaxis.type != "log" else 10**y_range[1], y_format))
         if self.layout.xaxis.autorange == "reversed":
             self.add_option("x dir", "reverse")
         if self.layout.yaxis.autorange == "reversed":
@@ -149,18 +390,15 @@ class Axis():
         if self.layout.yaxis.showline is False:
             self.add_option("axis y line", "none")
         if self.layout.xaxis.categoryorder == "array":
-            self.xticks = self.layout.xaxis.categoryarray
-            ticks, ticklabels = get_ticks_str(self.layout.xaxis.categoryarray)
-            self.add_option("xtick", ticks)
-            self.add_option("xticklabels", ticklabels)
+            self.add_categories("x", self.layout.xaxis.categoryarray)
 
         # At this point, only layout.xaxis.categoryarray = "array" is supported
         if self.layout.xaxis.categoryorder is not None and self.layout.xaxis.categoryorder not in ["array"]:
-            warn(
+            report("xaxis-categoryorder-unsupported",
             f"The xaxis categoryorder option {self.layout.xaxis.categoryorder} is not supported (yet 🤞) for the axis environment."
             )
         if self.layout.yaxis.categoryorder is not None and self.layout.yaxis.categoryorder not in []:
-            warn(
+            report("yaxis-categoryorder-unsupported",
             f"The yaxis categoryorder option {self.layout.yaxis.categoryorder} is not supported (yet 🤞) for the axis environment."
             )
 
@@ -1,21 +1,32 @@
 """
 This module handles bar plots.
+
+By default, the bars are drawn with the `ybar`/`xbar` styles of pgfplots, which stacks and groups them itself. With
+`precompute_bars`, the layout of the bars (positions, widths and bases, for every `barmode`) is computed with NumPy
+and each trace is drawn as a set of filled rectangles, so that the compilation time does not grow with the number of
+stacked or grouped series.
 """
-from warnings import warn
+from typing import NamedTuple
+import numpy as np
 from ._axis import Axis
 from ._utils import option_dict_to_str
 from ._tex import tex_addplot
 from ._color import convert_color
-from ._utils import sanitize_text
+from ._data import column_info
+from ._diagnostics import report
+
+# Default gap between the bars of adjacent positions, as a fraction of the distance between positions, as in Plotly
+DEFAULT_BARGAP = 0.2
 
 
-def draw_bar(data_name_macro, x_col_name, y_col_name, trace, axis: Axis, colors_set):
+def draw_bar(data_name_macro, x_col_name, y_col_name, trace, axis: Axis, colors_set, x_expr=None, axis_style=True):
     r"""
     Draw a bar chart (vertical or horizontal) referencing the data table
     created by DataContainer.add_data(...).
 
     If trace.orientation == 'h', we do xbar (horizontal).
     Otherwise, we do ybar (vertical).
+    Categorical positions are written in the table as their positions on the axis, see `Axis.encode_categories`.
 
     Parameters
     ----------
@@ -31,6 +42,11 @@ def draw_bar(data_name_macro, x_col_name, y_col_name, trace, axis: Axis, colors_
         The axis object to which the bar chart will be added.
     colors_set : set
         A set to keep track of colors used in the plot (for \\definecolor).
+    x_expr : str, optional
+        Expression of the positions of the bars, when the x column is not exported (see `DataContainer.x_expr`).
+    axis_style : bool, optional
+        Set the bar style (`ybar`, `ybar stacked`...) on the whole axis. When other bars of the figure are drawn as
+        rectangles by `draw_bar_rectangles`, the style is only set on the plot, and the bars are not stacked.
     """
     code = ""
     plot_options = {}
@@ -38,29 +54,27 @@ def draw_bar(data_name_macro, x_col_name, y_col_name, trace, axis: Axis, colors_
 
     orientation = getattr(trace, "orientation", "v")  # default vertical
     stack = " stacked" if axis.layout.barmode in ("stack", "relative") else ""
+    if stack and not axis_style:
+        report("bar-layout-not-stacked", "Bars that cannot be precomputed are not stacked with the precomputed ones.")
 
     if orientation == "h":
         plot_options["xbar"] = None
-        axis.add_option("xbar" + stack, None)
+        if axis_style:
+            axis.add_option("xbar" + stack, None)
         type_options["x"] = y_col_name
-        type_options["y"] = x_col_name
-        categories = trace.y
+        if x_expr is None:
+            type_options["y"] = x_col_name
+        else:
+            type_options["y expr"] = x_expr
     else:
         plot_options["ybar"] = None
-        axis.add_option("ybar" + stack, None)
-        type_options["x"] = x_col_name
-        type_options["y"] = y_col_name
-        categories = trace.x
-
-    # Handle symbolic coords
-    if all(isinstance(value, str) for value in categories):
-        symbolic = sanitize_text(",".join(categories), keep_space=-1)
-        if orientation == "h":
-            axis.add_option("symbolic y coords", "{" + symbolic + "}")
-            axis.add_option("ytick", "data")
+        if axis_style:
+            axis.add_option("ybar" + stack, None)
+        if x_expr is None:
+            type_options["x"] = x_col_name
         else:
-            axis.add_option("symbolic x coords", "{" + symbolic + "}")
-            axis.add_option("xtick", "data")
+            type_options["x expr"] = x_expr
+        type_options["y"] = y_col_name
 
     # Handle marker style (color, opacity, line)
     if trace.marker is not None:
@@ -81,7 +95,7 @@ def draw_bar(data_name_macro, x_col_name, y_col_name, trace, axis: Axis, colors_
                 plot_options["draw"] = linecol[0]
 
     if trace.text is not None:
-        warn("Text display for bar chart is not supported yet (ignored).")
+        report("bar-text-unsupported", "Text display for bar chart is not supported yet (ignored).")
 
     # Build the final addplot referencing the table
     code += tex_addplot(
@@ -92,3 +106,221 @@ def draw_bar(data_name_macro, x_col_name, y_col_name, trace, axis: Axis, colors_
     )
 
     return code
+
+
+class BarGeometry(NamedTuple):
+    """Rectangles of the bars of a trace, computed by `compute_bar_layout`."""
+    orientation: str
+    position_low: np.ndarray
+    position_high: np.ndarray
+    value_low: np.ndarray
+    value_high: np.ndarray
+
+
+def bar_coordinates(trace):
+    """Get the positions and the values of the bars of a trace.
+
+    Parameters
+    ----------
+    trace
+        bar trace
+
+    Returns
+    -------
+        tuple (positions, values, orientation), positions being None if the trace has no values
+    """
+    orientation = "h" if trace.orientation == "h" else "v"
+    positions, values = (trace.y, trace.x) if orientation == "h" else (trace.x, trace.y)
+    if values is None:
+        return None, None, orientation
+    if positions is None:
+        positions = np.arange(len(values))
+    return positions, values, orientation
+
+
+def compute_bar_layout(traces, layout, axis: Axis):
+    """Compute the rectangles of the bars of a figure, for the barmodes group, overlay, stack and relative.
+
+    The bars of the traces of each orientation are laid out together, as Plotly does: they share the width of the
+    positions, minus `layout.bargap`. In group mode, each trace gets its own slot of the positions, reduced by
+    `layout.bargroupgap`. In stack mode, the bars are piled up in the order of the traces; in relative mode, the
+    negative values are piled up below the axis and the positive ones above. The `width`, `offset` and `base` of the
+    traces are taken into account.
+
+    Parameters
+    ----------
+    traces
+        traces of the figure
+    layout
+        layout of the figure
+    axis
+        Axis of the figure, on which the categorical positions are placed
+
+    Returns
+    -------
+        dictionary mapping the indices of the bar traces to their BarGeometry. Traces that cannot be laid out (values
+        that are not numbers, categorical and numeric positions mixed) are missing, they are drawn by pgfplots
+    """
+    barmode = layout.barmode or "group"
+    if barmode not in ("group", "overlay", "stack", "relative"):
+        report("barmode-unsupported", f"Bar mode {barmode} is not supported, the bars are grouped.")
+        barmode = "group"
+    bargap = layout.bargap if layout.bargap is not None else DEFAULT_BARGAP
+    bargroupgap = layout.bargroupgap or 0
+
+    groups = {"v": [], "h": []}
+    for trace_index, trace in enumerate(traces):
+        if trace.type != "bar":
+            continue
+        positions, values, orientation = bar_coordinates(trace)
+        if positions is None:
+            continue
+        try:
+            values = np.array(values, dtype=float)
+        except (TypeError, ValueError):
+            report("bar-layout-non-numeric", "Bars with non-numeric values cannot be precomputed, they are drawn by pgfplots.")
+            continue
+        groups[orientation].append((trace_index, trace, positions, values))
+
+    geometries = {}
+    for orientation, group in groups.items():
+        if not group:
+            continue
+
+        # Positions: categories are placed on the axis, at 0, 1, 2... in the order of their first appearance
+        direction = "y" if orientation == "h" else "x"
+        categorical = [column_info(positions).is_text for _, _, positions, _ in group]
+        if all(categorical):
+            group_positions = [axis.encode_categories(direction, positions).astype(float)
+                               for _, _, positions, _ in group]
+        elif not any(categorical):
+            try:
+                group_positions = [np.array(positions, dtype=float) for _, _, positions, _ in group]
+            except (TypeError, ValueError):
+                report("bar-layout-non-numeric", "Bars with non-numeric positions cannot be precomputed, they are drawn by pgfplots.")
+                continue
+        else:
+            report("bar-layout-mixed-positions", "Bars with categorical and numeric positions cannot be precomputed, they are drawn by pgfplots.")
+            continue
+
+        # Width of the bars of a position: the smallest distance between positions, minus the gap
+        distinct = np.unique(np.concatenate(group_positions))
+        distinct = distinct[np.isfinite(distinct)]
+        spacing = np.diff(distinct).min() if len(distinct) > 1 else 1.
+        slot = spacing * (1 - bargap)
+
+        positive_tops = np.zeros(max(len(distinct), 1))
+        negative_tops = np.zeros(max(len(distinct), 1))
+        for rank, ((trace_index, trace, _, values), positions) in enumerate(zip(group, group_positions)):
+            if barmode == "group":
+                width = slot / len(group)
+                centers = positions - slot / 2 + (rank + 0.5) * width
+                width = width * (1 - bargroupgap)
+            else:
+                width = slot
+                centers = positions
+            if trace.width is not None:
+                width = np.array(trace.width, dtype=float)
+            if trace.offset is not None:
+                low = positions + np.array(trace.offset, dtype=float)
+            else:
+                low = centers - width / 2
+            high = low + width
+
+            # Bars without value or without position are not drawn, and do not shift the bars stacked on them
+            missing = np.isnan(values) | np.isnan(positions)
+            heights = np.where(missing, 0., values)
+            if barmode in ("stack", "relative"):
+                slots = np.where(missing, 0, np.searchsorted(distinct, positions))
+                if barmode == "stack":
+                    bases = positive_tops[slots]
+                    np.add.at(positive_tops, slots, heights)
+                else:
+                    bases = np.where(heights < 0, negative_tops[slots], positive_tops[slots])
+                    np.add.at(positive_tops, slots, np.maximum(heights, 0))
+                    np.add.at(negative_tops, slots, np.minimum(heights, 0))
+            else:
+                bases = np.broadcast_to(np.array(trace.base if trace.base is not None else 0, dtype=float),
+                                        values.shape)
+
+            keep = ~missing
+            geometries[trace_index] = BarGeometry(
+                orientation,
+                np.broadcast_to(low, values.shape)[keep], np.broadcast_to(high, values.shape)[keep],
+                bases[keep], (bases + heights)[keep],
+            )
+    return geometries
+
+
+def rectangles_path(geometry):
+    """Build the path of the rectangles of a BarGeometry, the rectangles being separated by NaN.
+
+    Returns
+    -------
+        tuple (x, y) of arrays of coordinates, each rectangle being closed and followed by a NaN point
+    """
+    corners_position = [geometry.position_low, geometry.position_low, geometry.position_high,
+                        geometry.position_high, geometry.position_low]
+    corners_value = [geometry.value_low, geometry.value_high, geometry.value_high, geometry.value_low,
+                     geometry.value_low]
+    nan = np.full(len(geometry.value_low), np.nan)
+    # Rounded to hide the floating point errors of the offsets (e.g. 2.4000000000000004)
+    positions = np.round(np.column_stack(corners_position + [nan]).ravel()[:-1], 12)
+    values = np.round(np.column_stack(corners_value + [nan]).ravel()[:-1], 12)
+    if geometry.orientation == "h":
+        return values, positions
+    return positions, values
+
+
+def draw_bar_rectangles(geometry, trace, axis: Axis, colors_set, data_container):
+    r"""
+    Draw the bars of a trace as filled rectangles, laid out by `compute_bar_layout`.
+
+    Parameters
+    ----------
+    geometry : BarGeometry
+        rectangles of the bars of the trace
+    trace : plotly.graph_objs._bar.Bar
+        The bar trace object containing data and style information.
+    axis : Axis
+        The axis object to which the bar chart will be added.
+    colors_set : set
+        A set to keep track of colors used in the plot (for \definecolor).
+    data_container : DataContainer
+        container where the coordinates of the rectangles are stored
+
+    Returns
+    -------
+        string of tikz code
+    """
+    plot_options = {"mark": "none", "area legend": None, "unbounded coords": "jump", "fill": None}
+
+    m = trace.marker
+    if m.color is not None:
+        c = convert_color(m.color)
+        colors_set.add(c[:3])
+        plot_options["fill"] = c[0]
+        plot_options["color"] = c[0]
+    if m.opacity is not None:
+        plot_options["opacity"] = m.opacity
+    if m.line.width is not None:
+        plot_options["line width"] = m.line.width
+    if m.line.color is not None:
+        linecol = convert_color(m.line.color)
+        colors_set.add(linecol[:3])
+        plot_options["draw"] = linecol[0]
+
+    if trace.text is not None:
+        report("bar-text-unsupported", "Text display for bar chart is not supported yet (ignored).")
+
+    x, y = rectangles_path(geometry)
+    data_name_macro, y_col_name = data_container.add_data(x, y, trace.name)
+    x_expr = data_container.x_expr(data_name_macro)
+    type_options = {"x": "x"} if x_expr is None else {"x expr": x_expr}
+    type_options["y"] = y_col_name
+    return tex_addplot(
+        data_str=data_name_macro,
+        plot_type="table",
+        options=option_dict_to_str(plot_options),
+        type_options=option_dict_to_str(type_options),
+    )
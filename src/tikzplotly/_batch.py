@@ -0,0 +1,138 @@
+"""
+Convert several figures at once, in parallel worker processes.
+
+The figures are sent to the workers as plotly JSON dictionaries, which are cheap to pickle, and converted there
+without rebuilding Plotly figures, so that the workers do not even import plotly. The errors and warnings raised by
+each conversion are collected in its result, so that one failing figure does not abort the batch.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+import warnings
+from ._save import save
+
+# Arguments of `save` filled or called in the converting process, which would be lost in the workers
+IN_PROCESS_ARGUMENTS = ("cache", "outputs", "profile", "diagnostics", "data_store")
+
+
+class SaveResult:
+    """Result of the conversion of one figure by `save_many`.
+    """
+
+    def __init__(self, filepath, error=None, warnings_list=None, written=False):
+        """Initialize a SaveResult object.
+
+        Parameters
+        ----------
+        filepath
+            path of the file where the figure is saved
+        error, optional
+            description of the exception raised by the conversion, by default None
+        warnings_list, optional
+            messages of the warnings raised by the conversion, by default None
+        written, optional
+            True if any file was written, False if the outputs were already up to date, by default False
+        """
+        self.filepath = filepath
+        self.error = error
+        self.warnings = warnings_list if warnings_list is not None else []
+        self.written = written
+
+    @property
+    def ok(self):
+        """True if the figure was saved without error."""
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"SaveResult({self.filepath!r}, {status}, {len(self.warnings)} warning(s))"
+
+
+def figure_to_json(fig):
+    """Get the plotly JSON representation of a figure.
+
+    Parameters
+    ----------
+    fig
+        Plotly figure, or its dictionary representation
+
+    Returns
+    -------
+        dictionary representation of the figure
+    """
+    if isinstance(fig, dict):
+        return fig
+    return fig.to_plotly_json()
+
+
+def save_figure_json(filepath, fig_json, kwargs):
+    """Save a figure from its JSON representation, collecting the errors and warnings.
+
+    Parameters
+    ----------
+    filepath
+        path of the file where the figure is saved
+    fig_json
+        dictionary representation of the figure
+    kwargs
+        keyword arguments given to `save`
+
+    Returns
+    -------
+        SaveResult of the conversion
+    """
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        try:
+            written = save(filepath, fig_json, **kwargs)
+            error = None
+        except Exception as e:
+            written = False
+            error = f"{type(e).__name__}: {e}"
+    return SaveResult(os.fspath(filepath), error, [str(w.message) for w in caught], written)
+
+
+def save_many(items, workers=None, **kwargs):
+    """Save several figures, in parallel worker processes.
+
+    Parameters
+    ----------
+    items
+        iterable of tuples (filepath, fig) or (filepath, fig, options), where fig is a Plotly figure (or its dictionary
+        representation) and options a dictionary of keyword arguments given to `save` for this figure only
+    workers, optional
+        number of worker processes, by default None (number of CPUs). With 1 worker, the figures are converted in the
+        current process
+    **kwargs
+        keyword arguments given to `save` for all the figures
+
+    Returns
+    -------
+        list of SaveResult, in the order of the items
+
+    Raises
+    ------
+    ValueError
+        if arguments filled in the converting process (see `IN_PROCESS_ARGUMENTS`) are given with several workers
+    """
+    tasks = []
+    for item in items:
+        filepath, fig, *options = item
+        figure_kwargs = dict(kwargs, **options[0]) if options else kwargs
+        tasks.append((filepath, figure_to_json(fig), figure_kwargs))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+
+    if workers > 1:
+        arguments = sorted({name for *_, figure_kwargs in tasks for name in IN_PROCESS_ARGUMENTS
+                            if figure_kwargs.get(name) is not None})
+        if arguments:
+            raise ValueError(f"The arguments {', '.join(arguments)} are filled in the converting process, they "
+                             "cannot be used with several workers (use workers=1, or cache_dir instead of cache).")
+
+    if workers <= 1:
+        return [save_figure_json(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(save_figure_json, *task) for task in tasks]
+        return [future.result() for future in futures]
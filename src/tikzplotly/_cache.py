@@ -0,0 +1,540 @@
+"""
+Cache of converted traces, to speed up the repeated export of figures where only some traces change.
+
+A `TraceCache` stores, for each converted trace, everything the conversion produced: its plot code, the data it added
+to the DataContainer, the options it added to the axis, its colors and its diagnostics. The entries are keyed by a
+hash of the content of the trace, of the layout and of the conversion options, so that an unchanged trace is not
+converted again but replayed. The serialized columns of the data tables are cached as well.
+
+The entries are kept in memory, or pickled in a directory to be shared between processes, and the least recently
+used ones are evicted when the number of entries exceeds `maxsize`.
+
+A `FigureCache` stores the whole outputs of `save` in a directory, so that an unchanged figure is not converted at
+all, its outputs are restored.
+"""
+import builtins
+from collections import OrderedDict
+import hashlib
+import json
+import numbers
+import os
+from pathlib import Path
+import pickle
+import shutil
+import tempfile
+import time
+import numpy as np
+from .__about__ import __version__
+from ._data import numeric_array, treat_column
+from ._diagnostics import current_diagnostics, report
+from ._figure import FigureDict, Node
+from ._files import write_if_changed
+
+# Trace types whose conversion writes files, they are always converted
+UNCACHED_TYPES = frozenset({"heatmap"})
+
+
+def update_hash(hasher, obj):
+    """Feed the content of an object to a hasher.
+
+    Parameters
+    ----------
+    hasher
+        hashlib object
+    obj
+        object made of dictionaries, lists, tuples, arrays and scalars
+    """
+    if obj is None or isinstance(obj, (str, bool, numbers.Number)):
+        hasher.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, dict):
+        hasher.update(b"{")
+        for key in sorted(obj, key=str):
+            update_hash(hasher, key)
+            update_hash(hasher, obj[key])
+        hasher.update(b"}")
+    elif isinstance(obj, np.ndarray) and obj.dtype.kind in "biufcmM":
+        hasher.update(f"array:{obj.dtype.str}:{obj.shape};".encode())
+        hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple, np.ndarray)):
+        array = numeric_array(obj) if len(obj) > 0 else None
+        if array is not None:
+            update_hash(hasher, array)
+        else:
+            hasher.update(b"[")
+            for item in obj:
+                update_hash(hasher, item)
+            hasher.update(b"]")
+    else:
+        hasher.update(f"{type(obj).__name__}:{obj!r};".encode())
+
+
+def content_hash(*objs):
+    """Compute a hash of the content of objects.
+
+    Parameters
+    ----------
+    *objs
+        objects made of dictionaries, lists, tuples, arrays and scalars
+
+    Returns
+    -------
+        hexadecimal digest
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for obj in objs:
+        update_hash(hasher, obj)
+    return hasher.hexdigest()
+
+
+def plain_values(obj):
+    """Get the dictionary of the values of a trace or a layout.
+
+    Parameters
+    ----------
+    obj
+        Plotly object, or Node of a figure dictionary
+
+    Returns
+    -------
+        dictionary of the values
+    """
+    if isinstance(obj, Node):
+        return obj._values
+    return obj.to_plotly_json()
+
+
+class LRUStore:
+    """Mapping keeping at most `maxsize` entries, the least recently used ones being evicted.
+    """
+
+    def __init__(self, maxsize, directory=None, prefix=""):
+        """Initialize a LRUStore object.
+
+        Parameters
+        ----------
+        maxsize
+            maximal number of entries
+        directory, optional
+            directory where the entries are pickled, by default None (the entries are kept in memory)
+        prefix, optional
+            prefix of the names of the files of the entries, by default ""
+        """
+        self.maxsize = maxsize
+        self.directory = directory
+        self.prefix = prefix
+        self.entries = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        """Return the path of the file of an entry."""
+        return os.path.join(self.directory, f"{self.prefix}{key}.pkl")
+
+    def files(self):
+        """Return the paths of the files of the entries, from the least to the most recently used."""
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                 if name.startswith(self.prefix) and name.endswith(".pkl")]
+        return sorted(paths, key=os.path.getmtime)
+
+    def get(self, key):
+        """Get an entry, marking it as recently used.
+
+        Parameters
+        ----------
+        key
+            key of the entry
+
+        Returns
+        -------
+            value of the entry, or None if it is not stored
+        """
+        if self.directory is None:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        try:
+            with open(self.path(key), "rb") as f:
+                value = pickle.load(f)
+            os.utime(self.path(key))
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        return value
+
+    def set(self, key, value):
+        """Store an entry, evicting the least recently used ones if needed.
+
+        Parameters
+        ----------
+        key
+            key of the entry
+        value
+            value of the entry
+        """
+        if self.directory is None:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            return
+        # Write then rename, so that other processes never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path(key))
+        for path in self.files()[:-self.maxsize]:
+            os.remove(path)
+
+    def clear(self):
+        """Remove all the entries."""
+        self.entries.clear()
+        if self.directory is not None:
+            for path in self.files():
+                os.remove(path)
+
+    def __len__(self):
+        if self.directory is None:
+            return len(self.entries)
+        return len(self.files())
+
+
+class TraceCache:
+    """Cache of converted traces, to give as the `cache` argument of `get_tikz_code`, `iter_tikz_code` or `save`.
+
+    The same cache can be used for several figures and several exports. The number of cache hits and misses of the
+    traces and of the serialized columns of the data tables are counted in `hits`, `misses`, `column_hits` and
+    `column_misses`.
+    """
+
+    def __init__(self, maxsize=128, directory=None):
+        """Initialize a TraceCache object.
+
+        Parameters
+        ----------
+        maxsize, optional
+            maximal number of traces, and of columns, kept in the cache, by default 128
+        directory, optional
+            directory where the entries are stored, by default None (the entries are kept in memory)
+        """
+        self.traces = LRUStore(maxsize, directory, prefix="trace-")
+        self.columns = LRUStore(maxsize, directory, prefix="column-")
+        self.hits = 0
+        self.misses = 0
+        self.column_hits = 0
+        self.column_misses = 0
+
+    def stats(self):
+        """Return the counters of the cache, as a dictionary."""
+        return {"hits": self.hits, "misses": self.misses, "column_hits": self.column_hits,
+                "column_misses": self.column_misses, "traces": len(self.traces), "columns": len(self.columns)}
+
+    def clear(self):
+        """Remove all the entries of the cache, and reset its counters."""
+        self.traces.clear()
+        self.columns.clear()
+        self.hits = self.misses = self.column_hits = self.column_misses = 0
+
+    def figure_context(self, layout, *options):
+        """Compute the part of the keys of the traces common to a figure.
+
+        Parameters
+        ----------
+        layout
+            layout of the figure
+        *options
+            conversion options that the traces may depend on
+
+        Returns
+        -------
+            hexadecimal digest of the layout, the options and the version of tikzplotly
+        """
+        return content_hash(__version__, plain_values(layout), options)
+
+    def trace_key(self, trace, context, *options):
+        """Compute the key of a trace.
+
+        Parameters
+        ----------
+        trace
+            Plotly trace
+        context
+            digest returned by `figure_context`
+        *options
+            conversion options specific to the trace
+
+        Returns
+        -------
+            key of the trace, or None if the trace should not be cached
+        """
+        if trace.type in UNCACHED_TYPES:
+            return None
+        return content_hash(context, plain_values(trace), options)
+
+    def serialize_column(self, values, float_format=None):
+        """Serialize a column of a data table, as `treat_column`, reusing the cached result if any.
+
+        Parameters
+        ----------
+        values
+            values of the column
+        float_format, optional
+            format of the floats of the column, see `format_floats`, by default None
+
+        Returns
+        -------
+            list of strings
+        """
+        key = content_hash(values, float_format)
+        treated = self.columns.get(key)
+        if treated is not None:
+            self.column_hits += 1
+            return treated
+        self.column_misses += 1
+        treated = treat_column(values, float_format)
+        self.columns.set(key, treated)
+        return treated
+
+    def convert_trace(self, key, convert, data_container, axis, colors_set, data_str):
+        """Convert a trace, or replay its cached conversion.
+
+        Parameters
+        ----------
+        key
+            key of the trace returned by `trace_key`, None to convert it without caching
+        convert
+            function converting the trace, adding its code to data_str, its data to data_container, its options to
+            axis and its colors to colors_set
+        data_container
+            DataContainer of the figure
+        axis
+            Axis of the figure
+        colors_set
+            set of the colors of the figure
+        data_str
+            list of the code of the plots of the figure
+        """
+        if key is None:
+            convert()
+            return
+        entry = self.traces.get(key)
+        if entry is not None and self.replay(entry, data_container, axis, colors_set, data_str):
+            self.hits += 1
+            return
+        self.misses += 1
+
+        categories_before = axis.category_state()
+        nb_date_ranges = {direction: len(ranges) for direction, ranges in axis.date_ranges.items()}
+        colors_before = set(colors_set)
+        nb_code = len(data_str)
+        diagnostics = current_diagnostics()
+        data_container.recorder = calls = []
+        # All the options added by the trace are recorded, even those already set by the previous traces
+        axis.recorder = axis_calls = []
+        reports = []
+        if diagnostics is not None:
+            diagnostics.recorder = reports
+        try:
+            convert()
+        finally:
+            data_container.recorder = None
+            axis.recorder = None
+            if diagnostics is not None:
+                diagnostics.recorder = None
+
+        self.traces.set(key, {
+            "calls": calls,
+            "code": data_str[nb_code:],
+            "axis_calls": axis_calls,
+            "categories": axis.category_state() if axis.category_state() != categories_before else None,
+            "date_ranges": [(direction, low, high) for direction, ranges in axis.date_ranges.items()
+                            for low, high in ranges[nb_date_ranges[direction]:]],
+            "colors": colors_set - colors_before,
+            "diagnostics": reports,
+        })
+
+    @staticmethod
+    def replay(entry, data_container, axis, colors_set, data_str):
+        """Apply the cached conversion of a trace to a figure.
+
+        The data is added again to the container: if it gets other names than when the trace was converted (the
+        tables of the figure changed), the container is restored and the trace has to be converted again.
+
+        Returns
+        -------
+            True if the conversion was replayed, False if the trace has to be converted
+        """
+        checkpoint = data_container.checkpoint()
+        for method, args, result in entry["calls"]:
+            if getattr(data_container, method)(*args) != result:
+                data_container.rollback(checkpoint)
+                return False
+        for method, args in entry["axis_calls"]:
+            getattr(axis, method)(*args)
+        if entry["categories"] is not None:
+            for direction, categories in zip("xy", entry["categories"]):
+                axis.add_categories(direction, categories)
+        for direction, low, high in entry["date_ranges"]:
+            axis.add_date_range(direction, low, high)
+        colors_set.update(entry["colors"])
+        data_str.extend(entry["code"])
+        for code, message, category in entry["diagnostics"]:
+            report(code, message, category)
+        return True
+
+
+def figure_values(fig):
+    """Get the dictionary representation of a figure.
+
+    Parameters
+    ----------
+    fig
+        Plotly figure, or FigureDict
+
+    Returns
+    -------
+        dictionary with the keys "data" and "layout"
+    """
+    if isinstance(fig, FigureDict):
+        return {"data": [trace._values for trace in fig.data], "layout": fig.layout._values}
+    return fig.to_plotly_json()
+
+
+def warning_category(name):
+    """Get a built-in warning category from its name, UserWarning if there is none.
+
+    Parameters
+    ----------
+    name
+        name of the category
+
+    Returns
+    -------
+        warning class
+    """
+    category = getattr(builtins, name, None)
+    if isinstance(category, type) and issubclass(category, Warning):
+        return category
+    return UserWarning
+
+
+class FigureCache:
+    """Cache of the outputs of `save` in a directory: the code and the files written besides it.
+
+    Each entry is a subdirectory named by the hash of the figure, of the options and of the version of tikzplotly.
+    Entries unused for more than `max_age` seconds are evicted, then the least recently used ones until the total
+    size of the cache is below `max_size` bytes.
+    """
+
+    def __init__(self, directory, max_age, max_size):
+        """Initialize a FigureCache object.
+
+        Parameters
+        ----------
+        directory
+            directory of the cache, created if needed
+        max_age
+            maximal time since the last use of an entry, in seconds
+        max_size
+            maximal total size of the entries, in bytes
+        """
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self.max_size = max_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key(self, fig, options):
+        """Compute the key of a figure.
+
+        Parameters
+        ----------
+        fig
+            Plotly figure, or FigureDict
+        options
+            dictionary of the conversion options
+
+        Returns
+        -------
+            hexadecimal digest
+        """
+        return content_hash(__version__, figure_values(fig), options)
+
+    def restore(self, key):
+        """Restore the files written besides the code of a figure from the cache.
+
+        Parameters
+        ----------
+        key
+            key of the figure
+
+        Returns
+        -------
+            tuple (code, files, diagnostics), where code is the code of the figure, files the paths of the restored
+            files and diagnostics the list of the (code, message, category, count) of the diagnostics reported by the
+            conversion, or None if the figure is not in the cache
+        """
+        entry = self.directory / key
+        try:
+            with open(entry / "manifest.json", encoding="utf-8") as f:
+                manifest = json.load(f)
+            files = manifest["files"]
+            diagnostics = [(code, message, warning_category(category), count)
+                           for code, message, category, count in manifest.get("diagnostics", [])]
+            code = (entry / "code.tex").read_text(encoding="utf-8")
+            # The whole entry is read before writing, as another process sharing the cache may evict it meanwhile
+            contents = [(entry / str(index)).read_bytes() for index in range(len(files))]
+            os.utime(entry)
+        except (OSError, ValueError, KeyError):
+            return None
+        for path, content in zip(files, contents):
+            write_if_changed(path, [content])
+        self.evict()
+        return code, files, diagnostics
+
+    def store(self, key, code, files, diagnostics=()):
+        """Store the outputs of a figure in the cache, then evict the old entries.
+
+        Parameters
+        ----------
+        key
+            key of the figure
+        code
+            code of the figure
+        files
+            paths of the files written besides the code
+        diagnostics, optional
+            list of the (code, message, category, count) of the diagnostics reported by the conversion, by default ()
+        """
+        # The entry is filled in a temporary directory then renamed, other processes never see a partial entry
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.directory, prefix=".tmp-"))
+        (tmp_dir / "code.tex").write_text(code, encoding="utf-8")
+        for index, path in enumerate(files):
+            shutil.copyfile(path, tmp_dir / str(index))
+        with open(tmp_dir / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump({"files": [os.fspath(path) for path in files],
+                       "diagnostics": [(code, message, category.__name__, count)
+                                       for code, message, category, count in diagnostics]}, f)
+        try:
+            os.rename(tmp_dir, self.directory / key)
+        except OSError:
+            # Stored meanwhile by another process
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.evict()
+
+    def evict(self):
+        """Remove the entries unused for more than `max_age` seconds, then the least recently used ones until the
+        total size is below `max_size` bytes."""
+        now = time.time()
+        entries = []
+        for entry in self.directory.iterdir():
+            if not entry.is_dir():
+                continue
+            mtime = entry.stat().st_mtime
+            if now - mtime > self.max_age:
+                shutil.rmtree(entry, ignore_errors=True)
+            elif not entry.name.startswith("."):
+                entries.append((mtime, sum(f.stat().st_size for f in entry.iterdir()), entry))
+        total_size = 0
+        for _, size, entry in sorted(entries, reverse=True):
+            total_size += size
+            if total_size > self.max_size:
+                shutil.rmtree(entry, ignore_errors=True)
@@ -1,34 +1,177 @@
 """
 This module contains the code to handle data types in TikZ using Plotly data.
 """
-from warnings import warn
+from contextlib import contextmanager
+from contextvars import ContextVar
+import datetime
+import hashlib
+import numbers
+import re
+from typing import NamedTuple
+import numpy as np
 from ._utils import sanitize_text
+from ._dates import format_date_cells
 
-def data_type(data):
-    """Return the type of data, for special handling.
+# Characters of the names of columns that pgfplots or pgfkeys would not read as part of the name
+LABEL_UNSAFE_PATTERN = re.compile(r"[,%#\\/&$^~{}]")
+
+# Minimal length of the columns replaced by an expression when they are arithmetic progressions
+MIN_PROGRESSION_LENGTH = 3
+
+class ColumnInfo(NamedTuple):
+    """Type of a column of data, inferred by `column_info`.
+
+    The kind of the column is one of:
+        - 'empty' : no values
+        - 'integer' : booleans or integers
+        - 'numeric' : numbers, possibly of several types, or missing
+        - 'datetime' : dates (`datetime64`, `datetime` objects or strings such as '2021-07-20' or
+          '2021-07-20 19:30:00'), possibly missing
+        - 'categorical' : strings that are not dates, possibly missing
+        - 'mixed' : anything else
+    """
+    kind: str
+    # Values as a NumPy array, if they are all of the same numeric type, see `numeric_array`
+    numeric: object
+    # Mask of the missing values (None or NaN)
+    missing: np.ndarray
+    # True if the values are strings, possibly missing
+    strings: bool = False
+
+    @property
+    def has_missing(self):
+        """True if some values are missing."""
+        return bool(self.missing.any())
+
+    @property
+    def is_text(self):
+        """True if the values are all strings."""
+        return self.strings and not self.missing.any()
+
+    @property
+    def is_number(self):
+        """True if the values are numbers, possibly missing."""
+        return self.kind in ("integer", "numeric")
+
+
+NUMBER_TYPES = (bool, int, float, np.bool_, np.integer, np.floating)
+INTEGER_TYPES = (bool, int, np.bool_, np.integer)
+
+# Columns whose type was inferred during the current conversion, by id, see `column_scope`
+_column_infos = ContextVar("column_infos", default=None)
+
+
+def is_date_array(array):
+    """Check whether an array of strings only holds dates, starting with a year: '2021-07-20', '2021-07-20 19:30'...
 
     Parameters
     ----------
-    data
-        string of data
+    array
+        NumPy array of strings
 
     Returns
     -------
-        Type of data, can be :
-            - None : no special handling
-            - 'date' : data is a date
-            - 'string' : a symbolic data
+        True if all the strings are made of three parts separated by dashes, and start with four digits
     """
-    if isinstance(data, str):
-        if len(data.split('-')) == 3:
-            warn("Assuming this is a date, add \"\\usetikzlibrary{pgfplots.dateplot}\" to your tex preamble.")
-            return 'date'
+    return bool(len(array) > 0 and (np.char.count(array, "-") == 2).all() and np.char.isdigit(array.astype("U4")).all())
 
-        if data.lower() in ['january', 'february', 'march', 'april', 'may', 'june',
-                            'july', 'august', 'september', 'october', 'november', 'december']:
-            warn(f"Assuming data {data} is a month. This feature is experimental.")
-            return 'month'
-    return None
+def infer_column(values):
+    """Infer the type of a column of data, in a single pass over its values.
+
+    Parameters
+    ----------
+    values
+        sequence or array of values
+
+    Returns
+    -------
+        ColumnInfo of the column
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind != "O":
+        kind = values.dtype.kind
+        numeric = values if values.ndim == 1 and kind in "biuf" else None
+        if values.size == 0:
+            return ColumnInfo("empty", numeric, np.zeros(0, dtype=bool))
+        if kind in "biu":
+            return ColumnInfo("integer", numeric, np.zeros(values.shape, dtype=bool))
+        if kind == "f":
+            return ColumnInfo("numeric", numeric, np.isnan(values))
+        if kind == "M":
+            return ColumnInfo("datetime", None, np.isnat(values))
+        if kind == "U":
+            return ColumnInfo("datetime" if is_date_array(values.ravel()) else "categorical", None,
+                              np.zeros(values.shape, dtype=bool), strings=True)
+        return ColumnInfo("mixed", None, np.zeros(values.shape, dtype=bool))
+
+    if len(values) == 0:
+        return ColumnInfo("empty", None, np.zeros(0, dtype=bool))
+    value_types = set(map(type, values))
+    if type(None) in value_types:
+        missing = np.equal(np.array(values, dtype=object), None)
+        value_types.discard(type(None))
+    else:
+        missing = np.zeros(len(values), dtype=bool)
+
+    if all(issubclass(value_type, NUMBER_TYPES) for value_type in value_types):
+        numeric = None
+        if len(value_types) == 1 and not missing.any():
+            try:
+                numeric = np.asarray(values)
+            except OverflowError:
+                numeric = None
+            if numeric is not None and (numeric.dtype.kind not in "biuf" or numeric.ndim != 1):
+                numeric = None
+        if all(issubclass(value_type, INTEGER_TYPES) for value_type in value_types) and not missing.any():
+            return ColumnInfo("integer", numeric, missing)
+        try:
+            missing = missing | np.isnan(np.array(values, dtype=float))
+        except (OverflowError, TypeError, ValueError):
+            pass
+        return ColumnInfo("numeric", numeric, missing)
+
+    if all(issubclass(value_type, (datetime.date, np.datetime64)) for value_type in value_types):
+        return ColumnInfo("datetime", None, missing)
+
+    if value_types == {str}:
+        array = np.array(values, dtype=object)[~missing].astype(str) if missing.any() else np.array(values, dtype=str)
+        return ColumnInfo("datetime" if is_date_array(array) else "categorical", None, missing, strings=True)
+
+    return ColumnInfo("mixed", None, missing)
+
+def column_info(values):
+    """Get the type of a column of data, inferred once per conversion.
+
+    Within a `column_scope`, the type of each column is inferred once and shared by all the converters that examine
+    it, as long as they are given the same object.
+
+    Parameters
+    ----------
+    values
+        sequence or array of values
+
+    Returns
+    -------
+        ColumnInfo of the column
+    """
+    infos = _column_infos.get()
+    if infos is None:
+        return infer_column(values)
+    entry = infos.get(id(values))
+    if entry is not None and entry[0] is values:
+        return entry[1]
+    info = infer_column(values)
+    # The values are kept with their type, so that their id is not reused during the scope
+    infos[id(values)] = (values, info)
+    return info
+
+@contextmanager
+def column_scope():
+    """Share the types of the columns inferred by `column_info` in the block."""
+    token = _column_infos.set({})
+    try:
+        yield
+    finally:
+        _column_infos.reset(token)
 
 def treat_data(data_str):
     """Treat data for correct TeX display
@@ -49,6 +192,285 @@ def treat_data(data_str):
             return data_str
     return data_str
 
+def column_label(name):
+    """Get the name of a column of a data table, from the name of a trace.
+
+    The name is treated as data (see `treat_data`), and the characters that would split or end the name in the header
+    of the table, in the `y=` option of the plots or in the keys of `\\pgfplotstablenew` (such as ',' '%' or '/') are
+    replaced by their hexadecimal code, as `sanitize_text` does.
+
+    Parameters
+    ----------
+    name
+        name of the trace
+
+    Returns
+    -------
+        name of the column
+    """
+    return LABEL_UNSAFE_PATTERN.sub(lambda match: f"x{ord(match.group()):x}", treat_data(name))
+
+def numeric_array(values):
+    """Return the values as a numeric NumPy array, if this can be done without changing their text representation.
+
+    Parameters
+    ----------
+    values
+        sequence or array of values
+
+    Returns
+    -------
+        NumPy array of booleans, integers or floats, or None if the values are not all of the same numeric type
+    """
+    if isinstance(values, np.ndarray) and values.ndim == 1 and values.dtype.kind in "biuf":
+        return values
+    return column_info(values).numeric
+
+def get_float_format(precision, float_format, *keys):
+    """Get the format of the floats of a table or of an axis.
+
+    Parameters
+    ----------
+    precision
+        None, a number of significant digits, or a dictionary mapping keys to numbers of significant digits, with the
+        key None for the default
+    float_format
+        None, a format (see `format_floats`), or a dictionary mapping keys to formats, with the key None for the
+        default. Takes precedence over precision for the same key
+    *keys
+        keys looked up in the dictionaries, in order (e.g. trace index and trace name, or axis name)
+
+    Returns
+    -------
+        format of the floats, None for the default format
+    """
+    options = [option if isinstance(option, dict) else {None: option} for option in (float_format, precision)]
+    for key in [key for key in keys if key is not None] + [None]:
+        for option in options:
+            if option.get(key) is not None:
+                return option[key]
+    return None
+
+def round_significant(array, digits):
+    """Round floats to a number of significant digits.
+
+    Parameters
+    ----------
+    array
+        NumPy array of floats
+    digits
+        number of significant digits
+
+    Returns
+    -------
+        array of the rounded floats, the values that cannot be rounded (infinite, NaN, or too close to the limits of
+        float64) are kept as is
+    """
+    if not isinstance(digits, numbers.Integral) or isinstance(digits, bool) or digits < 1:
+        raise ValueError(f"The precision should be a positive integer, not {digits!r}.")
+    with np.errstate(all="ignore"):
+        magnitude = np.abs(array)
+        exponent = np.floor(np.log10(np.where((magnitude > 0) & np.isfinite(magnitude), magnitude, 1.)))
+        shift = digits - 1 - exponent
+        factor = 10. ** np.abs(shift)
+        # Dividing by an exact power of ten gives the closest float to the decimal value, with a short repr
+        rounded = np.where(shift >= 0, np.round(array * factor) / factor, np.round(array / factor) * factor)
+    return np.where(np.isfinite(rounded), rounded, array)
+
+def format_floats(array, float_format=None):
+    """Format a numeric array, in bulk.
+
+    Parameters
+    ----------
+    array
+        NumPy array of booleans, integers or floats
+    float_format, optional
+        format of the floats:
+            - None : `str` of each value, as Python prints them
+            - 'shortest' : shortest representation reading back to the same float
+            - integer : shortest representation of the value rounded to this number of significant digits
+            - string containing '%' : printf-style format applied to each value (e.g. '%.3f')
+        With 'shortest' and a number of digits, the columns whose values are all integers are written without
+        decimal point. By default None
+
+    Returns
+    -------
+        list of strings, one per value
+    """
+    if float_format is None or array.dtype.kind != "f":
+        return array.astype(str).tolist()
+    if isinstance(float_format, str) and "%" in float_format:
+        return np.char.mod(float_format, array).tolist()
+    # The floats are written in their own precision (e.g. float32 as the shortest float32), up to float64
+    dtype = array.dtype if array.dtype.itemsize <= 8 else np.dtype(np.float64)
+    if float_format != "shortest":
+        array = round_significant(array.astype(np.float64), float_format)
+    array = array.astype(dtype)
+    finite = np.isfinite(array)
+    if (array[finite] == np.round(array[finite])).all() and (np.abs(array[finite]) < 2.**53).all():
+        formatted = np.where(finite, array, 0).astype(np.int64).astype(str)
+        return np.where(finite, formatted, array.astype(str)).tolist()
+    return array.astype(str).tolist()
+
+def format_value(value, float_format=None):
+    """Format a single number, as `format_floats`.
+
+    Parameters
+    ----------
+    value
+        number
+    float_format, optional
+        format of the floats, see `format_floats`, by default None
+
+    Returns
+    -------
+        number, or string of the formatted number if a float format is given
+    """
+    if float_format is None or not isinstance(value, numbers.Real):
+        return value
+    return format_floats(np.array([value], dtype=float), float_format)[0]
+
+def treat_column(values, float_format=None):
+    """Treat a whole column of data for correct TeX display.
+    Numeric and `datetime64` columns are formatted in bulk with NumPy, only textual values go through `treat_data`.
+
+    Parameters
+    ----------
+    values
+        sequence or array of values
+    float_format, optional
+        format of the floats of numeric columns, see `format_floats`, by default None
+
+    Returns
+    -------
+        list of sanitized TeX strings, one per value
+    """
+    array = numeric_array(values)
+    if array is not None:
+        return format_floats(array, float_format)
+    if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+        return format_date_cells(values)
+
+    treated = {}
+    column = []
+    for value in values:
+        key = (type(value), value)
+        try:
+            column.append(treated[key])
+        except KeyError:
+            treated[key] = treat_data(value)
+            column.append(treated[key])
+        except TypeError:   # unhashable value
+            column.append(treat_data(value))
+    return column
+
+def arithmetic_progression(values, tolerance=1e-6):
+    """Detect a numeric column whose values are regularly spaced, such as `range(n)` or a uniform sampling.
+
+    Parameters
+    ----------
+    values
+        sequence or array of values
+    tolerance, optional
+        maximal deviation of the values from the progression, relative to its step, by default 1e-6
+
+    Returns
+    -------
+        tuple (start, step), or None if the values are not numbers in arithmetic progression, or are too few
+    """
+    array = numeric_array(values)
+    if array is None or array.dtype.kind not in "iuf" or len(array) < MIN_PROGRESSION_LENGTH:
+        return None
+    if array.dtype.kind in "iu":
+        steps = np.diff(array.astype(np.int64))
+        if (steps == steps[0]).all():
+            return array[0].item(), steps[0].item()
+        return None
+    if not np.isfinite(array).all():
+        return None
+    start = array[0].item()
+    step = (array[-1].item() - start) / (len(array) - 1)
+    deviation = np.abs(array - (start + np.arange(len(array)) * step)).max()
+    if deviation <= tolerance * abs(step):
+        return start, step
+    return None
+
+def progression_expr(start, step):
+    """Get the pgfplots expression of the coordinates of an arithmetic progression, from the index of the row.
+
+    The step and the start are written in full, whatever the format of the floats of the table, since their rounding
+    errors would add up along the column.
+
+    Parameters
+    ----------
+    start
+        first value of the progression
+    step
+        difference between two consecutive values
+
+    Returns
+    -------
+        expression of `\\coordindex`, e.g. `\\coordindex*0.5+2`
+    """
+    if step == 1:
+        expr = "\\coordindex"
+    elif step < 0:
+        expr = f"\\coordindex*({format_value(step, 'shortest')})"
+    else:
+        expr = f"\\coordindex*{format_value(step, 'shortest')}"
+    if start > 0:
+        expr += f"+{format_value(start, 'shortest')}"
+    elif start < 0:
+        expr += f"-{format_value(-start, 'shortest')}"
+    return expr
+
+def factorize_strings(values):
+    """Factorize a column of strings: get its distinct values and the index of each value among them.
+
+    Parameters
+    ----------
+    values
+        sequence or array of values
+
+    Returns
+    -------
+        tuple (uniques, codes), where uniques is the list of the distinct values in order of first appearance and
+        codes the NumPy array of the indices of the values in uniques, or None if the values are not all strings
+    """
+    info = column_info(values)
+    if not info.is_text:
+        return None
+    array = values.ravel() if isinstance(values, np.ndarray) and values.dtype.kind == "U" else np.array(values, dtype=str)
+    uniques, first, inverse = np.unique(array, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return uniques[order].tolist(), rank[inverse.ravel()]
+
+def column_key(values):
+    """Return a hashable key identifying the content of a column: its length, the kind of its values and a digest.
+
+    Numeric values are hashed as float64, so columns comparing equal with `==` (e.g. `[1, 2]` and `[1.0, 2.0]`)
+    share the same key. Different columns may share a key, so a match should be confirmed by a full comparison.
+
+    Parameters
+    ----------
+    values
+        sequence or array of values
+
+    Returns
+    -------
+        tuple (length, kind, digest)
+    """
+    array = numeric_array(values)
+    if array is not None:
+        buffer = np.ascontiguousarray(array, dtype=np.float64) + 0.0   # + 0.0 maps -0.0 to 0.0
+        return len(array), "f8", hashlib.blake2b(buffer.tobytes(), digest_size=16).hexdigest()
+    text = "\x1f".join(
+        repr(float(value)) if isinstance(value, numbers.Real) else str(value) for value in values
+    )
+    return len(values), "O", hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
 def post_treat_data(data_str):
     """Post-treat the data string to replace all months with their corresponding number.
     Parameters
@@ -2,9 +2,12 @@
 Contain the code to handle data in TikZ plots.
 """
 import hashlib
+from pathlib import Path
 import numpy as np
 from ._utils import replace_all_digits, sanitize_text
-from ._data import treat_data, post_treat_data
+from ._data import treat_data, treat_column, column_label, column_key, post_treat_data, arithmetic_progression, progression_expr
+from ._profile import NULL_PROFILE
+from ._files import write_if_changed
 
 def hexid_to_alpha(num):
     """
@@ -42,11 +45,72 @@ def index_to_letters(idx):
         idx -= 1
     return letters
 
+def digest_name(digest):
+    """Name a table after the digest of its content, so that it does not depend on the order of the traces.
+
+    Parameters
+    ----------
+    digest
+        hexadecimal digest
+
+    Returns
+    -------
+        "data" followed by 8 letters
+    """
+    return f"data{hexid_to_alpha(digest[:8])}"
+
+def table_rows(header, columns, serialize_column=treat_column, float_format=None):
+    """Serialize the columns of a table, one line per row.
+
+    Parameters
+    ----------
+    header
+        first line of the table, containing the names of the columns
+    columns
+        list of columns, the rows are truncated to the length of the shortest one
+    serialize_column, optional
+        function converting a column to a list of strings, by default `treat_column`
+    float_format, optional
+        format of the floats of the table, see `format_floats`, by default None
+
+    Returns
+    -------
+        string containing the header and the rows, each followed by a new line
+    """
+    treated_columns = [serialize_column(column, float_format) for column in columns]
+    rows = "\n".join(map(" ".join, zip(*treated_columns)))
+    if rows:
+        return header + "\n" + rows + "\n"
+    return header + "\n"
+
+def write_data_file(body, data_dir):
+    """Write the body of a table to a file named by the hash of its content.
+
+    The file is not rewritten if it already exists, so that its modification time only changes with its content.
+
+    Parameters
+    ----------
+    body
+        content of the table
+    data_dir
+        directory where the file is written, created if needed
+
+    Returns
+    -------
+        path of the file, in POSIX form so that it can be used in LaTeX
+    """
+    digest = hashlib.blake2b(body.encode(), digest_size=8).hexdigest()
+    data_dir = Path(data_dir)
+    file_path = data_dir / f"{digest}.dat"
+    if not file_path.exists():
+        write_if_changed(file_path, [body])
+    return file_path.as_posix()
+
 class Data:
     """Class to handle data in TikZ plots.
     """
 
-    def __init__(self, name, x):
+    def __init__(self, name, x, float_format=None):
         """Initialize a Data object.
 
         Parameters
@@ -55,10 +119,16 @@ class Data:
             name of the data
         x
             x_values of the data
+        float_format, optional
+            format of the floats of the table, see `format_floats`, by default None
         """
         self.name = name
+        self.float_format = float_format
         self.macro_name = "\\" + replace_all_digits(name)
         self.x = x
+        # Expression replacing the x column when it is an arithmetic progression, the column is then not exported
+        progression = arithmetic_progression(x)
+        self.x_expr = progression_expr(*progression) if progression is not None else None
         self.y_label = []
         self.y_data = []
 
@@ -84,7 +154,7 @@ class Data:
 class Data3D:
     """Handle 3D data in Tikz plots
     """
-    def __init__(self, x, y, z, name):
+    def __init__(self, x, y, z, name, float_format=None):
         """Initialize the Data3D object
 
         Parameters
@@ -97,36 +167,113 @@ class Data3D:
             z_values of the data
         name
             name of the data
+        float_format, optional
+            format of the floats of the table, see `format_floats`, by default None
         """
+        self.float_format = float_format
         self.x = np.array(x)
         self.y = np.array(y)
         self.z = np.array(z)
         if name:
             self.name = sanitize_text(name, keep_space=0)
         else:
-            hash_digest = self.get_hash()
-            self.name = f"data{hexid_to_alpha(hash_digest)}"
+            self.name = digest_name(self.get_hash())
         self.z_name = "z"
 
     def get_hash(self, tolerance=1e-6):
         """
         Generates the unique hash corresponding to the data, up to tolerance
+
+        The numeric values are rounded to multiples of tolerance and hashed as float64 bytes, other values are hashed
+        as `column_key` does.
         """
-        def normalize_float(value):
-            return np.round(value / tolerance) * tolerance
-        x_norm = normalize_float(self.x)
-        y_norm = normalize_float(self.y)
-        z_norm = normalize_float(self.z)
-        hash_input = f"{x_norm}{y_norm}{z_norm}"
-        return hashlib.md5(hash_input.encode()).hexdigest()
+        hasher = hashlib.blake2b(digest_size=16)
+        for values in (self.x, self.y, self.z):
+            if values.dtype.kind in "biuf":
+                normalized = np.round(values.astype(np.float64) / tolerance) + 0.0   # + 0.0 maps -0.0 to 0.0
+                normalized[np.isnan(normalized)] = np.nan   # a single NaN representation
+                hasher.update(f"f8{normalized.shape};".encode())
+                hasher.update(np.ascontiguousarray(normalized).tobytes())
+            else:
+                hasher.update(repr(column_key(values.ravel())).encode())
+        return hasher.hexdigest()
 
 
 class DataContainer:
     """Container for data used in TikZ plots.
     """
 
-    def __init__(self):
+    def __init__(self, profile=NULL_PROFILE, serialize_column=treat_column):
+        """Initialize a DataContainer object.
+
+        Parameters
+        ----------
+        profile, optional
+            Profile object recording the time spent adding and exporting the data, by default NULL_PROFILE
+        serialize_column, optional
+            function converting a column to a list of strings, by default `treat_column`
+        """
         self.data = []
+        self.x_index = {}
+        # Expression of the x column of the tables whose x column is an arithmetic progression, by macro
+        self.x_exprs = {}
+        self.names = set()
+        self.profile = profile
+        self.serialize_column = serialize_column
+        # Format of the floats of the tables added, see `format_floats`
+        self.float_format = None
+        # List where the calls to add_data and add_data3d are recorded, if not None
+        self.recorder = None
+        # Paths of the files where the tables were written by iter_export_data
+        self.data_files = []
+
+    def checkpoint(self):
+        """Get the current state of the container, to be restored by `rollback`.
+
+        Returns
+        -------
+            tuple (number of tables, number of columns of each 2D table)
+        """
+        return len(self.data), [len(data.y_data) for data in self.data if not hasattr(data, "z")]
+
+    def rollback(self, checkpoint):
+        """Remove the tables and columns added since a checkpoint.
+
+        Parameters
+        ----------
+        checkpoint
+            state returned by `checkpoint`
+        """
+        nb_tables, nb_columns = checkpoint
+        for data in self.data[nb_tables:]:
+            self.names.discard(data.name)
+            if not hasattr(data, "z"):
+                self.x_index[data.x_key].remove(data)
+                self.x_exprs.pop(data.macro_name, None)
+        del self.data[nb_tables:]
+        for data, nb in zip((data for data in self.data if not hasattr(data, "z")), nb_columns):
+            del data.y_label[nb:]
+            del data.y_data[nb:]
+
+    def unique_name(self, name):
+        """Reserve a table name, suffixed with letters if another table already has it.
+
+        Parameters
+        ----------
+        name
+            name of the table
+
+        Returns
+        -------
+            name, or name followed by A, B, ... if it was already taken
+        """
+        unique = name
+        index = 0
+        while unique in self.names:
+            unique = name + index_to_letters(index)
+            index += 1
+        self.names.add(unique)
+        return unique
 
     def add_data(self, x, y, name=None, y_label=None):
         """Add data to the container.
@@ -146,21 +293,51 @@ class DataContainer:
         -------
             tuple (macro_name, y_label), where macro_name is the name of the data in LaTeX and y_label the name of the y data in LaTeX
         """
-        for data in self.data:
-            if len(data.x) != len(x):
+        with self.profile.stage("add_data"):
+            result = self._add_data(x, y, name, y_label)
+        if self.recorder is not None:
+            self.recorder.append(("add_data", (x, y, name, y_label), result))
+        return result
+
+    def _add_data(self, x, y, name=None, y_label=None):
+        """Add data to the container, see `add_data`."""
+        key = column_key(x)
+        for data in self.x_index.get(key, []):
+            if data.float_format != self.float_format:
                 continue
             are_equals = data.x == x
             if isinstance(are_equals, bool):
                 if are_equals:
                     y_label_val = data.add_y_data(y, y_label or name)
-                    return data.macro_name, treat_data(y_label_val)
+                    return data.macro_name, column_label(y_label_val)
             elif hasattr(are_equals, "all") and are_equals.all():
                 y_label_val = data.add_y_data(y, y_label or name)
-                return data.macro_name, treat_data(y_label_val)
-        data_to_add = Data(f"data{index_to_letters(len(self.data))}", x)
+                return data.macro_name, column_label(y_label_val)
+        data_to_add = Data(self.unique_name(digest_name(key[2])), x, self.float_format)
+        data_to_add.x_key = key
+        if data_to_add.x_expr is not None:
+            self.x_exprs[data_to_add.macro_name] = data_to_add.x_expr
         y_label_val = data_to_add.add_y_data(y, y_label or name)
         self.data.append(data_to_add)
-        return data_to_add.macro_name, treat_data(y_label_val)
+        self.x_index.setdefault(key, []).append(data_to_add)
+        return data_to_add.macro_name, column_label(y_label_val)
+
+    def x_expr(self, macro):
+        """Get the expression replacing the x column of a table, if its values are an arithmetic progression.
+
+        The x column of such tables is not exported, the plots reading it should use the option
+        `x expr=<expression>` (or `y expr` if it gives their y coordinates) instead of `x=x`.
+
+        Parameters
+        ----------
+        macro
+            macro of the table, as returned by `add_data`
+
+        Returns
+        -------
+            expression of `\\coordindex`, or None if the x column is exported
+        """
+        return self.x_exprs.get(macro)
 
     def add_data3d(self, x, y, z, name=None):
         """Add data to the container.
@@ -180,47 +357,95 @@ class DataContainer:
         -------
             tuple (macro_name, z_name), where macro_name is the name of the data in LaTeX and z_name the name of the z data in LaTeX
         """
+        with self.profile.stage("add_data3d"):
+            result = self._add_data3d(x, y, z, name)
+        if self.recorder is not None:
+            self.recorder.append(("add_data3d", (x, y, z, name), result))
+        return result
+
+    def _add_data3d(self, x, y, z, name=None):
+        """Add 3D data to the container, see `add_data3d`."""
         for data in self.data:
-            if hasattr(data, "x") and hasattr(data, "y") and hasattr(data, "z"):
+            if hasattr(data, "z") and data.float_format == self.float_format:
                 if np.array_equal(data.x, x) and np.array_equal(data.y, y) and np.array_equal(data.z, z):
                     return data.name, data.z_name
-        data_obj = Data3D(x, y, z, name)
+        data_obj = Data3D(x, y, z, name, self.float_format)
+        data_obj.name = self.unique_name(data_obj.name)
         self.data.append(data_obj)
         return data_obj.name, data_obj.z_name
 
-    def export_data(self):
-        """Generate LaTeX code to export the data from DataContainer.
+    def iter_export_data(self, data_dir=None, data_store=None):
+        """Generate LaTeX code to export the data from DataContainer, one table at a time.
 
-        Returns
-        -------
-            string of LaTeX code
+        Parameters
+        ----------
+        data_dir, optional
+            directory where each table is written to its own file, named by the hash of its content, by default
+            None (the tables are written inline)
+        data_store, optional
+            DataStore where the columns of the tables are stored, the tables being then built from the shared
+            columns, by default None
+
+        Yields
+        ------
+            string of LaTeX code defining one table
         """
-        export_string = ""
+        return self.profile.timed_iter("export_data", self._iter_export_data(data_dir, data_store))
 
+    def iter_tables(self):
+        """Iterate over the tables of the container.
+
+        Yields
+        ------
+            tuple (macro, labels, columns, float_format), where macro is the macro of the table in LaTeX, labels the
+            names of its columns, columns their values and float_format the format of their floats
+        """
         for data in self.data:
             # 3D
             if hasattr(data, "z"):
-                export_string += "\\pgfplotstableread{\n"
-                export_string += "x y z\n"
-                for x, y, z in zip(data.x, data.y, data.z):
-                    export_string += f"{treat_data(x)} {treat_data(y)} {treat_data(z)}\n"
-                export_string += f"}}{{\\{data.name}}}\n"
+                yield f"{{\\{data.name}}}", ["x", "y", "z"], [data.x, data.y, data.z], data.float_format
 
             # 2D
             else:
-                export_string += "\\pgfplotstableread{\n"
-                header = "x"
                 if hasattr(data, "y_label") and data.y_label:
-                    for label in data.y_label:
-                        header += f" {treat_data(label)}"
+                    labels = ["x"] + [column_label(label) for label in data.y_label]
                 else:
-                    header += " y"
-                export_string += header + "\n"
-                for i, x in enumerate(data.x):
-                    row = [treat_data(x)]
-                    for y_col in data.y_data:
-                        row.append(treat_data(y_col[i]))
-                    export_string += " ".join(row) + "\n"
-                export_string += f"}}\\{data.name}\n"
-
-        return post_treat_data(export_string)
+                    labels = ["x", "y"]
+                columns = [data.x] + data.y_data
+                if data.x_expr is not None:
+                    labels, columns = labels[1:], columns[1:]
+                yield f"\\{data.name}", labels, columns, data.float_format
+
+    def _iter_export_data(self, data_dir, data_store):
+        """Generate LaTeX code to export the data, see `iter_export_data`."""
+        if data_store is not None:
+            yield data_store.input_code()
+            for macro, labels, columns, float_format in self.iter_tables():
+                yield data_store.add_table(macro, labels, columns, self.serialize_column, float_format)
+            data_store.write()
+            return
+
+        for macro, labels, columns, float_format in self.iter_tables():
+            body = table_rows(" ".join(labels), columns, self.serialize_column, float_format)
+            if data_dir is None:
+                yield post_treat_data(f"\\pgfplotstableread{{\n{body}}}{macro}\n")
+            else:
+                file_path = write_data_file(post_treat_data(body), data_dir)
+                self.data_files.append(file_path)
+                yield f"\\pgfplotstableread{{{file_path}}}{post_treat_data(macro)}\n"
+
+    def export_data(self, data_dir=None, data_store=None):
+        """Generate LaTeX code to export the data from DataContainer.
+
+        Parameters
+        ----------
+        data_dir, optional
+            directory where each table is written to its own file, by default None (the tables are written inline)
+        data_store, optional
+            DataStore where the columns of the tables are stored, by default None
+
+        Returns
+        -------
+            string of LaTeX code
+        """
+        return "".join(self.iter_export_data(data_dir, data_store))
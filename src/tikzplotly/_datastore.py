@@ -0,0 +1,123 @@
+"""
+Data shared by the figures of a document.
+
+A document with many figures over the same data (e.g. 40 figures over the same time axis) would embed and parse the
+same columns in each figure. A `DataStore` given to several conversions writes each distinct column once, as a
+one-column table, in a shared file. Each figure inputs this file, which TeX only reads once per document, and builds
+its tables from the shared columns with `\\pgfplotstablenew` (package `pgfplotstable`).
+"""
+import hashlib
+from pathlib import Path
+from .__about__ import __version__
+from ._data import post_treat_data
+from ._dataContainer import hexid_to_alpha, index_to_letters
+from ._files import write_if_changed
+
+# Name of the single column of the shared tables
+COLUMN_NAME = "v"
+
+
+class DataStore:
+    """Columns shared by the figures of a document, to give as the `data_store` argument of `get_tikz_code`,
+    `iter_tikz_code` or `save`.
+    """
+
+    def __init__(self, path, input_path=None):
+        """Initialize a DataStore object.
+
+        Parameters
+        ----------
+        path
+            path of the file where the shared columns are written
+        input_path, optional
+            path of this file in the `\\input` of the figures, which must be valid from the directory where LaTeX is
+            run, by default path
+        """
+        self.path = Path(path)
+        self.input_path = Path(input_path if input_path is not None else path).as_posix()
+        # Body of each shared column, by name
+        self.columns = {}
+        # Name of each shared column, by digest of its body
+        self.names = {}
+        digest = hashlib.blake2b(self.input_path.encode(), digest_size=4).hexdigest()
+        self.guard = f"tikzplotlydatastore{hexid_to_alpha(digest)}"
+
+    def add_column(self, serialized):
+        """Add a column to the store, unless an identical column is already stored.
+
+        Parameters
+        ----------
+        serialized
+            list of the strings of the values of the column
+
+        Returns
+        -------
+            name of the macro of the shared table of the column
+        """
+        body = post_treat_data("\n".join(serialized))
+        digest = hashlib.blake2b(body.encode(), digest_size=16).hexdigest()
+        if digest in self.names:
+            return self.names[digest]
+        name = base_name = f"datacol{hexid_to_alpha(digest[:8])}"
+        index = 0
+        while name in self.columns:
+            name = base_name + index_to_letters(index)
+            index += 1
+        self.columns[name] = body
+        self.names[digest] = name
+        return name
+
+    def add_table(self, macro, labels, columns, serialize_column, float_format=None):
+        """Add the columns of a table to the store, and return the code building the table from them.
+
+        Parameters
+        ----------
+        macro
+            macro of the table in LaTeX
+        labels
+            names of the columns of the table
+        columns
+            values of the columns of the table
+        serialize_column
+            function converting a column to a list of strings
+        float_format, optional
+            format of the floats of the table, see `format_floats`, by default None
+
+        Returns
+        -------
+            LaTeX code defining the table
+        """
+        styles = []
+        for label, column in zip(labels, columns):
+            name = self.add_column(serialize_column(column, float_format))
+            styles.append(f"  create on use/{label}/.style={{create col/copy column from table={{\\{name}}}"
+                          f"{{{COLUMN_NAME}}}}},\n")
+        return (f"\\pgfplotstablenew[\n{''.join(styles)}  columns={{{','.join(labels)}}},\n]"
+                f"{{{len(columns[0])}}}{macro}\n")
+
+    def input_code(self):
+        """Return the code reading the shared columns in a figure."""
+        return f"\\input{{{self.input_path}}}\n"
+
+    def code(self):
+        """Return the content of the file of the shared columns.
+
+        The file ends its own input if it was already read, so that the columns are only parsed once per document.
+        """
+        chunks = [
+            f"% Data shared by figures created with tikzplotly version {__version__}.\n",
+            f"\\ifdefined\\{self.guard}\\endinput\\fi\n",
+            f"\\def\\{self.guard}{{}}\n",
+        ]
+        for name, body in self.columns.items():
+            chunks.append(f"\\pgfplotstableread{{\n{COLUMN_NAME}\n{body}\n}}\\{name}\n")
+        return "".join(chunks)
+
+    def write(self):
+        """Write the file of the shared columns, if its content changed.
+
+        Returns
+        -------
+            True if the file was written, False if it already had this content
+        """
+        return write_if_changed(self.path, [self.code()])
@@ -0,0 +1,175 @@
+"""
+Dates of the data: parsing, and the encodings handled by the axes.
+
+Dates can be given as NumPy `datetime64` arrays, `datetime` objects (including pandas Timestamps), or ISO strings such
+as '2021-07-20' or '2021-07-20 19:30'. They are parsed at once by `parse_dates`, and written either:
+    - 'dateplot' : as date strings, parsed by the `pgfplots.dateplot` library while compiling the figure
+    - 'numeric' : as numbers of days since an origin shared by the traces of the axis, labelled by ticks computed by
+      tikzplotly, which compiles much faster on long time series
+"""
+import datetime
+import warnings
+import numpy as np
+
+DATE_ENCODINGS = ("dateplot", "numeric")
+
+# Candidate steps between the ticks of a date axis, with their approximate length in seconds
+TICK_STEPS = [
+    (step, unit, step * seconds) for unit, seconds, steps in [
+        ("s", 1, (1, 2, 5, 10, 15, 30)),
+        ("m", 60, (1, 2, 5, 10, 15, 30)),
+        ("h", 3600, (1, 2, 3, 6, 12)),
+        ("D", 86400, (1, 2, 7, 14)),
+        ("M", 2629746, (1, 2, 3, 6)),
+        ("Y", 31556952, (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)),
+    ] for step in steps
+]
+
+# Precision of the labels of the ticks, by unit of the step between them
+LABEL_UNITS = {"s": "s", "m": "m", "h": "m", "D": "D", "M": "M", "Y": "Y"}
+
+# Default maximal number of ticks of a date axis
+MAX_TICKS = 6
+
+
+def check_date_encoding(date_encoding):
+    """Check the date_encoding option of a conversion.
+
+    Parameters
+    ----------
+    date_encoding
+        encoding of the dates, see `DATE_ENCODINGS`
+
+    Raises
+    ------
+    ValueError
+        if the encoding is unknown
+    """
+    if date_encoding not in DATE_ENCODINGS:
+        raise ValueError(f"Unknown date encoding {date_encoding}, should be one of {DATE_ENCODINGS}.")
+
+def parse_dates(values):
+    """Parse a column of dates.
+
+    Parameters
+    ----------
+    values
+        `datetime64` array, or sequence of `datetime` objects, `datetime64` values or ISO strings, None for missing
+        dates
+
+    Returns
+    -------
+        NumPy `datetime64` array, with NaT for the missing dates
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+        return values
+    try:
+        with warnings.catch_warnings():
+            # NumPy converts timezone-aware datetimes to UTC, with a warning
+            warnings.simplefilter("error", UserWarning)
+            return np.array(values, dtype="datetime64")
+    except (TypeError, ValueError, UserWarning):
+        # Timezone-aware datetimes are written as their local time, as Plotly displays them
+        return np.array([value.replace(tzinfo=None) if isinstance(value, datetime.datetime) else value
+                         for value in values], dtype="datetime64")
+
+def format_dates(dates):
+    """Format dates as strings read by the `pgfplots.dateplot` library: 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM'.
+
+    Parameters
+    ----------
+    dates
+        NumPy `datetime64` array
+
+    Returns
+    -------
+        NumPy array of strings, 'nan' for the missing dates
+    """
+    valid = ~np.isnat(dates)
+    midnight = (dates[valid] == dates[valid].astype("datetime64[D]")).all()
+    formatted = np.char.replace(np.datetime_as_string(dates, unit="D" if midnight else "m"), "T", " ")
+    return np.where(valid, formatted, "nan")
+
+def format_coordinates(values):
+    """Format coordinates for `axis cs`: the dates as read by the `pgfplots.dateplot` library, see `format_dates`.
+
+    Parameters
+    ----------
+    values
+        NumPy `datetime64` array, or sequence of other coordinates
+
+    Returns
+    -------
+        list of the coordinates
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+        return format_dates(values).tolist()
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+def format_date_cells(dates):
+    """Format dates as the cells of a table read by the `pgfplots.dateplot` library, see `format_dates`.
+
+    The dates with a time are braced, so that the space between the day and the time does not split the cell.
+
+    Parameters
+    ----------
+    dates
+        NumPy `datetime64` array
+
+    Returns
+    -------
+        list of strings, one per date
+    """
+    formatted = format_dates(dates)
+    return np.where(np.char.find(formatted, " ") >= 0, np.char.add(np.char.add("{", formatted), "}"),
+                    formatted).tolist()
+
+def date_offsets(dates, origin):
+    """Encode dates as numbers of days since an origin.
+
+    Parameters
+    ----------
+    dates
+        NumPy `datetime64` array
+    origin
+        `datetime64` origin of the encoding
+
+    Returns
+    -------
+        NumPy array of floats, NaN for the missing dates
+    """
+    return (dates - origin) / np.timedelta64(1, "D")
+
+def date_ticks(low, high, max_ticks=MAX_TICKS):
+    """Compute the ticks of a date axis: dates at round steps (every 6 hours, every month, every 5 years...).
+
+    Parameters
+    ----------
+    low
+        first date of the axis, `datetime64`
+    high
+        last date of the axis, `datetime64`
+    max_ticks, optional
+        maximal number of ticks, by default MAX_TICKS
+
+    Returns
+    -------
+        tuple (ticks, labels), where ticks is the `datetime64` array of the dates of the ticks and labels the list of
+        their labels
+    """
+    if high <= low:
+        return np.array([low]), format_dates(np.array([low])).tolist()
+    span = (high - low) / np.timedelta64(1, "s")
+    step, unit = next(((step, unit) for step, unit, seconds in TICK_STEPS if span / seconds < max_ticks),
+                      TICK_STEPS[-1][:2])
+    # Multiples of the step from the epoch, in the unit of the step, from the first one after low
+    first = low.astype(f"datetime64[{unit}]").astype(np.int64)
+    first += -first % step
+    last = high.astype(f"datetime64[{unit}]").astype(np.int64)
+    ticks = np.arange(first, last + 1, step).astype(f"datetime64[{unit}]")
+    ticks = ticks[(ticks >= low) & (ticks <= high)]
+    if len(ticks) == 0:
+        # Dates closer than the smallest step
+        return np.array([low]), format_dates(np.array([low])).tolist()
+    labels = np.char.replace(np.datetime_as_string(ticks, unit=LABEL_UNITS[unit]), "T", " ")
+    return ticks, labels.tolist()
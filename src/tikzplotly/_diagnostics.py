@@ -0,0 +1,187 @@
+"""
+Diagnostics of the conversion of a figure: unsupported features, assumptions made on the data, replaced characters...
+
+The converters report them with `report`, identified by a code. During a conversion, they are collected by a
+`Diagnostics` object, which deduplicates them by code and counts their occurrences, so that a diagnostic raised for
+each value of a large column costs a dictionary lookup instead of going through the `warnings` machinery. Outside a
+conversion, or when a converter is called directly, `report` emits a warning.
+"""
+from contextvars import ContextVar
+import warnings
+
+# Diagnostics collecting the reports of the conversion being computed, None outside conversions
+_current_diagnostics = ContextVar("current_diagnostics", default=None)
+
+
+class Diagnostic:
+    """Diagnostic reported during a conversion, with the number of times it was reported.
+    """
+
+    def __init__(self, code, message, category=UserWarning):
+        """Initialize a Diagnostic object.
+
+        Parameters
+        ----------
+        code
+            identifier of the diagnostic
+        message
+            message of the first report of the diagnostic
+        category, optional
+            category of the warning emitted for the diagnostic, by default UserWarning
+        """
+        self.code = code
+        self.message = message
+        self.category = category
+        self.count = 1
+
+    def as_dict(self):
+        """Return the diagnostic as a dictionary."""
+        return {"code": self.code, "message": self.message, "category": self.category.__name__, "count": self.count}
+
+    def __repr__(self):
+        return f"Diagnostic({self.code!r}, {self.message!r}, count={self.count})"
+
+
+class Diagnostics:
+    """Diagnostics of the conversion of a figure, deduplicated by code.
+
+    Pass an instance as the `diagnostics` argument of `get_tikz_code`, `iter_tikz_code` or `save`: it is filled during
+    the conversion, and no warning is emitted unless `emit_warnings` is True. Iterating over it gives the `Diagnostic`
+    objects, in the order in which they were first reported.
+    """
+
+    def __init__(self, callback=None, emit_warnings=False):
+        """Initialize a Diagnostics object.
+
+        Parameters
+        ----------
+        callback, optional
+            function called with the diagnostics once the whole code is generated, by default None
+        emit_warnings, optional
+            emit a warning the first time each diagnostic is reported, by default False
+        """
+        self.callback = callback
+        self.emit_warnings = emit_warnings
+        self.entries = {}
+        # List where the reports are recorded, if not None
+        self.recorder = None
+
+    def report(self, code, message, category=UserWarning, count=1):
+        """Report a diagnostic.
+
+        Parameters
+        ----------
+        code
+            identifier of the diagnostic, the reports with the same code are counted together
+        message
+            description of the diagnostic, only the message of the first report of a code is kept
+        category, optional
+            category of the warning emitted for the diagnostic, by default UserWarning
+        count, optional
+            number of reports, by default 1
+        """
+        if self.recorder is not None:
+            self.recorder.extend([(code, message, category)] * count)
+        entry = self.entries.get(code)
+        if entry is not None:
+            entry.count += count
+            return
+        self.entries[code] = Diagnostic(code, message, category)
+        self.entries[code].count = count
+        if self.emit_warnings:
+            warnings.warn(message, category, stacklevel=3)
+
+    def scoped_iter(self, iterator):
+        """Iterate over an iterator, collecting the diagnostics reported while each item is computed.
+
+        The diagnostics are only collected while the iterator runs, not while the caller handles the items. The
+        callback is called once the iterator is exhausted.
+
+        Parameters
+        ----------
+        iterator
+            iterator to run
+
+        Yields
+        ------
+            items of the iterator
+        """
+        while True:
+            token = _current_diagnostics.set(self)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                _current_diagnostics.reset(token)
+            yield item
+        if self.callback is not None:
+            self.callback(self)
+
+    def counts(self):
+        """Return the number of reports of each code, as a dictionary."""
+        return {code: entry.count for code, entry in self.entries.items()}
+
+    def as_list(self):
+        """Return the diagnostics as a list of dictionaries, to be logged or serialized."""
+        return [entry.as_dict() for entry in self.entries.values()]
+
+    def __getitem__(self, code):
+        return self.entries[code]
+
+    def __contains__(self, code):
+        return code in self.entries
+
+    def __iter__(self):
+        return iter(self.entries.values())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"Diagnostics({list(self.entries.values())!r})"
+
+
+def report(code, message, category=UserWarning):
+    """Report a diagnostic to the conversion being computed, or emit a warning outside conversions.
+
+    Parameters
+    ----------
+    code
+        identifier of the diagnostic
+    message
+        description of the diagnostic
+    category, optional
+        category of the warning, by default UserWarning
+    """
+    diagnostics = _current_diagnostics.get()
+    if diagnostics is None:
+        warnings.warn(message, category, stacklevel=2)
+    else:
+        diagnostics.report(code, message, category)
+
+
+def current_diagnostics():
+    """Return the Diagnostics collecting the reports of the conversion being computed, or None."""
+    return _current_diagnostics.get()
+
+
+def get_diagnostics(diagnostics):
+    """Get the diagnostics to use for a conversion.
+
+    Parameters
+    ----------
+    diagnostics
+        None, a Diagnostics object, or a function called with a new Diagnostics object at the end of the conversion
+
+    Returns
+    -------
+        Diagnostics object, emitting warnings if diagnostics is None
+    """
+    if diagnostics is None:
+        return Diagnostics(emit_warnings=True)
+    if isinstance(diagnostics, Diagnostics):
+        return diagnostics
+    if callable(diagnostics):
+        return Diagnostics(callback=diagnostics)
+    raise TypeError(f"diagnostics should be a Diagnostics object or a callable, not {type(diagnostics).__name__}.")
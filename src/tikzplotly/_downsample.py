@@ -0,0 +1,187 @@
+"""
+Downsampling of large line traces, to keep the number of points in the TeX file within a budget.
+
+Two methods are available:
+- 'lttb' : Largest-Triangle-Three-Buckets, which keeps the points preserving the visual shape of the line,
+- 'minmax' : min/max envelope, which keeps the extrema of each bucket, so the visual extent of the line is unchanged.
+
+In both cases, the first and last points are kept, and the gaps (NaN or None values) are preserved: each run of
+missing values is kept as a single missing point, so that `unbounded coords=jump` still breaks the line.
+"""
+import numbers
+import numpy as np
+from ._diagnostics import report
+
+DOWNSAMPLING_METHODS = ("lttb", "minmax")
+
+def get_point_budget(max_points, trace_index, trace_name):
+    """Get the maximal number of points of a trace.
+
+    Parameters
+    ----------
+    max_points
+        None (no downsampling), an integer (same budget for all the traces), or a dictionary mapping trace indices or
+        trace names to their budget, with the key None for the default budget
+    trace_index
+        index of the trace in the figure
+    trace_name
+        name of the trace
+
+    Returns
+    -------
+        maximal number of points of the trace, or None if it should not be downsampled
+    """
+    if max_points is None or (isinstance(max_points, numbers.Integral) and not isinstance(max_points, bool)):
+        return max_points
+    if trace_index in max_points:
+        return max_points[trace_index]
+    if trace_name is not None and trace_name in max_points:
+        return max_points[trace_name]
+    return max_points.get(None)
+
+def lttb_indices(x, y, n_out):
+    """Select points of a line with the Largest-Triangle-Three-Buckets algorithm.
+
+    Parameters
+    ----------
+    x, y
+        arrays of the finite coordinates of the points, x being sorted or not
+    n_out
+        number of points to keep, at least 3
+
+    Returns
+    -------
+        sorted array of the indices of the selected points, including the first and last one
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    # Buckets of (almost) equal size between the first and the last points
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = bounds[i], bounds[i + 1]
+        # The third point of the triangle is the average of the next bucket
+        next_start, next_end = end, (bounds[i + 2] if i + 2 < n_out - 1 else n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+def minmax_indices(y, n_out):
+    """Select the minimum and the maximum of each bucket of a line.
+
+    Parameters
+    ----------
+    y
+        array of the finite values of the points
+    n_out
+        number of points to keep, at least 4
+
+    Returns
+    -------
+        sorted array of the indices of the selected points, including the first and last one
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    nb_buckets = max((n_out - 2) // 2, 1)
+    # Bucket of each inner point, the first and last points being kept apart
+    bucket = (np.arange(n - 2) * nb_buckets) // (n - 2)
+    # Sort the inner points by bucket then by value: the extrema are at the edges of each bucket
+    order = np.lexsort((y[1:n - 1], bucket))
+    edges = np.flatnonzero(np.diff(bucket[order])) + 1
+    minima = order[np.concatenate(([0], edges))]
+    maxima = order[np.concatenate((edges - 1, [n - 3]))]
+    return np.unique(np.concatenate(([0, n - 1], minima + 1, maxima + 1)))
+
+def downsample_indices(x, y, max_points, method="lttb"):
+    """Select the points of a line to keep within a budget of points.
+
+    The finite points are split in segments separated by missing values. Each segment is downsampled with a
+    budget proportional to its length, and the first missing value of each gap is kept between the segments.
+
+    Parameters
+    ----------
+    x, y
+        arrays of float of the coordinates of the points, NaN for missing values
+    max_points
+        maximal number of points to keep (approximately, as each segment keeps at least its two endpoints)
+    method, optional
+        'lttb' or 'minmax', by default 'lttb'
+
+    Returns
+    -------
+        sorted array of the indices of the points to keep
+    """
+    n = len(x)
+    if max_points is None or n <= max_points:
+        return np.arange(n)
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Unknown downsampling method {method}, should be one of {DOWNSAMPLING_METHODS}.")
+
+    valid = np.isfinite(x) & np.isfinite(y)
+    # Boundaries of the runs of valid and invalid points
+    changes = np.flatnonzero(np.diff(valid.astype(np.int8))) + 1
+    run_starts = np.concatenate(([0], changes))
+    run_ends = np.concatenate((changes, [n]))
+
+    nb_valid = int(valid.sum())
+    nb_gaps = int((~valid[run_starts]).sum())
+    budget = max(max_points - nb_gaps, 2)
+    selected = []
+    for start, end in zip(run_starts, run_ends):
+        if not valid[start]:
+            selected.append(np.array([start]))
+            continue
+        length = end - start
+        n_out = max(int(round(budget * length / nb_valid)), 2)
+        if n_out >= length or length <= 2:
+            selected.append(np.arange(start, end))
+        elif method == "lttb":
+            selected.append(start + lttb_indices(x[start:end], y[start:end], max(n_out, 3)))
+        else:
+            selected.append(start + minmax_indices(y[start:end], max(n_out, 4)))
+    return np.concatenate(selected)
+
+def downsample_trace(x, y, max_points, method="lttb"):
+    """Downsample the coordinates of a line trace.
+
+    Parameters
+    ----------
+    x, y
+        coordinates of the points, as given in the trace
+    max_points
+        maximal number of points to keep, None to keep all the points
+    method, optional
+        'lttb' or 'minmax', by default 'lttb'
+
+    Returns
+    -------
+        tuple (x, y) of the coordinates to export, unchanged if the trace has no more than max_points points or if
+        its coordinates are not numeric
+    """
+    if max_points is None or len(x) <= max_points or len(x) != len(y):
+        return x, y
+    try:
+        x_values = np.asarray(x, dtype=float)
+        y_values = np.asarray(y, dtype=float)
+    except (TypeError, ValueError):
+        report("downsampling-non-numeric", "Only traces with numeric coordinates can be downsampled, the trace is exported with all its points.")
+        return x, y
+    indices = downsample_indices(x_values, y_values, max_points, method)
+
+    def take(values):
+        if isinstance(values, np.ndarray):
+            return values[indices]
+        return [values[i] for i in indices]
+
+    return take(x), take(y)
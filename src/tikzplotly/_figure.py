@@ -0,0 +1,204 @@
+"""
+Read plain figure dictionaries (the output of `fig.to_plotly_json()`) and JSON files like Plotly figures.
+
+The converters access the figure with attributes (`trace.marker.line.color`, `layout.scene.xaxis.title.text`...).
+`FigureDict` and `Node` provide the same access on dictionaries, without constructing `graph_objects`, so that no
+Plotly validator runs during the conversion. As with Plotly objects, an unset compound attribute (`marker`,
+`xaxis`...) is an empty node, and an unset value is None. The enumerated attributes that drive the conversion (`mode`,
+`line.dash`, `barmode`...) are checked when they are read, and raise a ValueError as Plotly would.
+"""
+import base64
+import json
+import os
+import re
+import numpy as np
+
+# Attributes whose value is an object, an empty Node is returned when they are not set
+COMPOUND_KEYS = frozenset({
+    "angularaxis", "camera", "center", "colorbar", "cumulative", "error_x", "error_y", "error_z", "eye", "font",
+    "hoverlabel", "legend", "legendgrouptitle", "line", "margin", "marker", "minor", "pad", "radialaxis", "rangeslider",
+    "textfont", "title", "up", "xbins", "ybins",
+})
+# Subplot attributes of the layout, possibly numbered (xaxis2, polar3...), in traces they are references to subplots
+COMPOUND_PATTERN = re.compile(r"(xaxis|yaxis|zaxis|scene|polar|coloraxis)\d*")
+# Attributes whose value is a list of objects, an empty tuple is returned when they are not set
+COMPOUND_ARRAY_KEYS = frozenset({"annotations", "images", "shapes", "sliders", "updatemenus"})
+# Values of the enumerated attributes read by the converters
+ENUMERATIONS = {
+    "barmode": {"stack", "group", "overlay", "relative"},
+    "dash": {"solid", "dot", "dash", "longdash", "dashdot", "longdashdot"},
+    "fill": {"none", "tozeroy", "tozerox", "tonexty", "tonextx", "toself", "tonext"},
+    "histfunc": {"count", "sum", "avg", "min", "max"},
+    "histnorm": {"", "percent", "probability", "density", "probability density"},
+    "orientation": {"v", "h"},
+}
+# Flag lists read by the converters: flags that can be joined with "+", and values that cannot be combined
+FLAGLISTS = {
+    "mode": ({"lines", "markers", "text"}, {"none"}),
+}
+# Dash lengths, also accepted for line.dash (e.g. "5px,10px,2px")
+DASH_LENGTHS_PATTERN = re.compile(r"\s*\d+(\.\d+)?(px|%)?(\s*,\s*\d+(\.\d+)?(px|%)?)*\s*")
+
+
+def decode_typed_arrays(obj):
+    """Decode the typed arrays of a plotly JSON representation to NumPy arrays.
+
+    Plotly encodes the NumPy arrays of a figure as base64 typed arrays `{"dtype": ..., "bdata": ...}`. Integer
+    arrays, which Plotly shrinks to the smallest integer type, are decoded as int64 so that computations on them
+    cannot overflow.
+
+    Parameters
+    ----------
+    obj
+        dictionary representation of a figure, or any of its values
+
+    Returns
+    -------
+        copy of obj where the typed arrays are replaced by NumPy arrays
+    """
+    if isinstance(obj, dict):
+        if "bdata" in obj and "dtype" in obj:
+            array = np.frombuffer(base64.b64decode(obj["bdata"]), dtype=np.dtype(obj["dtype"]).newbyteorder("<"))
+            if "shape" in obj:
+                array = array.reshape([int(n) for n in str(obj["shape"]).split(",") if n.strip()])
+            if array.dtype.kind in "iu":
+                return array.astype(np.int64)
+            return array.astype(array.dtype.newbyteorder("="))
+        return {key: decode_typed_arrays(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(decode_typed_arrays(value) for value in obj)
+    return obj
+
+
+def check_value(name, value):
+    """Check the value of an enumerated attribute, as Plotly validators do.
+
+    Parameters
+    ----------
+    name
+        name of the attribute
+    value
+        value of the attribute, not None
+
+    Raises
+    ------
+    ValueError
+        if the value is not valid for the attribute
+    """
+    if name in ENUMERATIONS:
+        valid = ENUMERATIONS[name]
+        if isinstance(value, str) and (value in valid or (name == "dash" and DASH_LENGTHS_PATTERN.fullmatch(value))):
+            return
+        raise ValueError(f"Invalid value {value!r} received for the '{name}' property, "
+                         f"should be one of {sorted(valid)}.")
+    flags, extras = FLAGLISTS[name]
+    if isinstance(value, str) and (value in extras or (value and set(value.split("+")) <= flags)):
+        return
+    raise ValueError(f"Invalid value {value!r} received for the '{name}' property, should be a combination of "
+                     f"{sorted(flags)} joined with '+', or one of {sorted(extras)}.")
+
+def wrap(name, value, in_layout):
+    """Wrap the value of an attribute, as Plotly would return it.
+
+    Parameters
+    ----------
+    name
+        name of the attribute
+    value
+        value of the attribute in the dictionary, None if it is not set
+    in_layout
+        True if the attribute belongs to the layout of the figure, False if it belongs to a trace
+
+    Returns
+    -------
+        Node for objects, tuple of Node for lists of objects, the value itself otherwise
+    """
+    if value is None:
+        if name in COMPOUND_KEYS or (in_layout and COMPOUND_PATTERN.fullmatch(name)):
+            return Node({}, in_layout)
+        if name in COMPOUND_ARRAY_KEYS:
+            return ()
+        return None
+    if isinstance(value, dict):
+        return Node(value, in_layout)
+    if name == "title" and isinstance(value, str):
+        # Former shorthand of Plotly for title.text
+        return Node({"text": value}, in_layout)
+    if name in COMPOUND_ARRAY_KEYS:
+        return tuple(Node(item, in_layout) for item in value)
+    if name in ENUMERATIONS or name in FLAGLISTS:
+        check_value(name, value)
+    return value
+
+
+class Node:
+    """Read-only attribute access to a dictionary of a figure.
+    """
+    __slots__ = ("_values", "_in_layout")
+
+    def __init__(self, values, in_layout=False):
+        """Initialize a Node object.
+
+        Parameters
+        ----------
+        values
+            dictionary of the attributes, it is never modified
+        in_layout, optional
+            True if the node is (part of) the layout of the figure, False if it is (part of) a trace, by default False
+        """
+        self._values = values
+        self._in_layout = in_layout
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return wrap(name, self._values.get(name), self._in_layout)
+
+    def __getitem__(self, name):
+        return wrap(name, self._values.get(name), self._in_layout)
+
+    def __contains__(self, name):
+        return name in self._values
+
+    def __repr__(self):
+        return f"Node({self._values!r})"
+
+
+class FigureDict:
+    """Figure read from its dictionary representation, with the attributes `data` and `layout` of Plotly figures.
+    """
+
+    def __init__(self, figure_dict):
+        """Initialize a FigureDict object.
+
+        Parameters
+        ----------
+        figure_dict
+            dictionary with the keys "data" (list of traces) and "layout", as returned by `fig.to_plotly_json()`
+        """
+        figure_dict = decode_typed_arrays(figure_dict)
+        # The type of the traces defaults to scatter, as in Plotly
+        self.data = tuple(Node(trace if "type" in trace else dict(trace, type="scatter"))
+                          for trace in figure_dict.get("data") or [])
+        self.layout = Node(figure_dict.get("layout") or {}, in_layout=True)
+
+
+def as_figure(fig):
+    """Get a figure that can be converted.
+
+    Parameters
+    ----------
+    fig
+        Plotly figure, figure dictionary (`fig.to_plotly_json()`), or path of a JSON file of a figure
+        (`fig.write_json(path)`)
+
+    Returns
+    -------
+        Plotly figure as is, or FigureDict reading the dictionary or the JSON file
+    """
+    if isinstance(fig, (str, os.PathLike)):
+        with open(fig, encoding="utf-8") as f:
+            fig = json.load(f)
+    if isinstance(fig, dict):
+        return FigureDict(fig)
+    return fig
@@ -0,0 +1,93 @@
+"""
+Write the output files only when their content changes, atomically.
+
+Rewriting a file with the same content bumps its modification time, and build tools (latexmk, make...) then redo
+everything that depends on it. The content is written to a temporary file next to the target and compared with the
+existing file: the temporary file is discarded if they are identical, otherwise it replaces the target with a
+rename, so that readers never see a partially written file.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import hashlib
+import os
+from pathlib import Path
+
+# List of the paths written by write_if_changed in the current context, see `track_writes`
+_written_files = ContextVar("written_files", default=None)
+
+
+def file_digest(path):
+    """Compute the hash of the content of a file.
+
+    Parameters
+    ----------
+    path
+        path of the file
+
+    Returns
+    -------
+        digest of the content, or None if the file cannot be read
+    """
+    hasher = hashlib.blake2b()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(block)
+    except OSError:
+        return None
+    return hasher.digest()
+
+
+def write_if_changed(path, chunks):
+    """Write content to a file, unless the file already has this content.
+
+    Parameters
+    ----------
+    path
+        path of the file, its directory is created if needed
+    chunks
+        iterable of strings (encoded in UTF-8) or bytes, written one after the other
+
+    Returns
+    -------
+        True if the file was written, False if it already had this content
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.urandom(4).hex()}.tmp")
+    hasher = hashlib.blake2b()
+    try:
+        with open(tmp_path, "xb") as f:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                hasher.update(chunk)
+                f.write(chunk)
+        if path.is_file() and file_digest(path) == hasher.digest():
+            os.remove(tmp_path)
+            return False
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            os.remove(tmp_path)
+        raise
+    written_files = _written_files.get()
+    if written_files is not None:
+        written_files.append(os.fspath(path))
+    return True
+
+
+@contextmanager
+def track_writes():
+    """Record the files actually written by `write_if_changed` in the block.
+
+    Yields
+    ------
+        list to which the paths of the written files are appended
+    """
+    written_files = []
+    token = _written_files.set(written_files)
+    try:
+        yield written_files
+    finally:
+        _written_files.reset(token)
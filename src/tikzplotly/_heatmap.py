@@ -1,72 +1,119 @@
 """
 This module contains the code to draw a heatmap in TikZ using Plotly data.
 """
-from warnings import warn
 import io
 import os
-from copy import deepcopy
 import numpy as np
 from PIL import Image
 from ._tex import tex_addplot, get_tikz_colorscale
 from ._axis import Axis
-from ._color import DEFAULT_COLORSCALE
+from ._color import DEFAULT_COLORSCALE, color_to_rgb, resolve_colorscale
+from ._files import write_if_changed
 from ._utils import get_ticks_str
+from ._diagnostics import report
 
-def crop_image(img_data):
-    """Crops an image to the smallest bounding box that contains all non-white pixels.
+def get_colorscale(data, fig):
+    """Get the colorscale used for a heatmap trace.
 
     Parameters
     ----------
-    img_data
-        A PIL Image object.
+    data
+        heatmap trace
+    fig
+        whole plotly figure
 
     Returns
     -------
-        cropped_image : PIL Image
+        tuple of (position, color) pairs, or None if no colorscale is defined and the scale is not displayed
     """
-    image_np = np.array(img_data)
-    non_white_rows = np.any(image_np != [255, 255, 255, 255], axis=1)
-    non_white_cols = np.any(image_np != [255, 255, 255, 255], axis=0)
+    if (colorscale := data.colorscale) is not None:
+        pass
+    elif (colorscale := fig.layout.coloraxis.colorscale) is not None:
+        pass
+    elif data.showscale is not False:
+        report("heatmap-default-colorscale", "No colorscale found, using default")
+        colorscale = DEFAULT_COLORSCALE
+    else:
+        return None
 
-    top, bottom = np.where(non_white_rows)[0][[0, -1]]
-    left, right = np.where(non_white_cols)[0][[0, -1]]
-    cropped_image = Image.fromarray(image_np[top:bottom+1, left:right+1])
+    colorscale = resolve_colorscale(colorscale)
+    if data.reversescale or (data.coloraxis is not None and fig.layout.coloraxis.reversescale):
+        colorscale = tuple((1 - position, color) for position, color in reversed(colorscale))
+    return tuple(colorscale)
 
-    return cropped_image
+def get_color_bounds(values, data, fig):
+    """Get the values mapped to the bounds of the colorscale, following the rules of Plotly.
 
-def resize_image(img, nb_row, nb_col):
-    """Resizes an image to a given number of rows and columns.
+    If `zmin` (resp. `zmax`) is set, it is used as lower (resp. upper) bound, otherwise the bound is computed from
+    the data. If `zmid` is set and the bounds are computed from the data, they are made symmetric around `zmid`.
+    When the trace uses a coloraxis, the attributes `cmin`, `cmax` and `cmid` of the coloraxis are used instead.
 
     Parameters
     ----------
-    img
-        A PIL Image object.
-    nb_row
-        The number of rows of the resized image.
-    nb_col
-        The number of columns of the resized image.
+    values
+        array of the values of the heatmap, with NaN for missing values
+    data
+        heatmap trace
+    fig
+        whole plotly figure
 
     Returns
     -------
-        resized_image : PIL Image
+        tuple (vmin, vmax)
     """
-    resized_image = Image.new("RGBA", size = (nb_col, nb_row))
-    block_size = (img.width // nb_col, img.height // nb_row)
+    if data.coloraxis is not None:
+        coloraxis = fig.layout[data.coloraxis]
+        vmin, vmax, vmid = coloraxis.cmin, coloraxis.cmax, coloraxis.cmid
+    else:
+        vmin, vmax, vmid = data.zmin, data.zmax, data.zmid
 
-    if block_size[0] != img.width / nb_col or block_size[1] != img.height / nb_row:
-        warn("png image has not been reduced, see https://github.com/thomas-saigre/tikzplotly/issues/6#issuecomment-2106180586")
-        return img
+    finite = values[np.isfinite(values)]
+    data_min = finite.min().item() if finite.size > 0 else 0.
+    data_max = finite.max().item() if finite.size > 0 else 1.
 
-    for i in range(nb_row):
-        for j in range(nb_col):
-            color = img.getpixel((j * block_size[0], i * block_size[1]))
-            resized_image.putpixel((j, i), color)
+    if vmid is not None and (vmin is None or vmax is None):
+        half_range = max(abs(data_max - vmid), abs(data_min - vmid))
+        return vmid - half_range, vmid + half_range
+    return (data_min if vmin is None else vmin), (data_max if vmax is None else vmax)
 
-    return resized_image
+def rasterize(values, colorscale, vmin, vmax):
+    """Map the values of a heatmap through a colorscale, one pixel per value.
+
+    Parameters
+    ----------
+    values
+        2D array of the values, with NaN for missing values (which are transparent)
+    colorscale
+        tuple of (position, color) pairs, the positions being between 0 and 1
+    vmin, vmax
+        values mapped to the bounds of the colorscale, values outside are clipped
+
+    Returns
+    -------
+        RGBA image, as an array of shape (rows, columns, 4) and type uint8
+    """
+    positions = np.array([position for position, _ in colorscale], dtype=float)
+    rgb = np.array([color_to_rgb(color) for _, color in colorscale], dtype=float)
+
+    missing = ~np.isfinite(values)
+    if vmax > vmin:
+        scaled = (np.where(missing, vmin, values) - vmin) / (vmax - vmin)
+    else:
+        scaled = np.full(values.shape, 0.5)
+    scaled = np.clip(scaled, 0., 1.)
+
+    image = np.empty(values.shape + (4,), dtype=np.uint8)
+    for channel in range(3):
+        image[..., channel] = np.rint(np.interp(scaled, positions, rgb[:, channel]))
+    image[..., 3] = np.where(missing, 0, 255)
+    return image
 
 def draw_heatmap(data, fig, img_name, axis: Axis):
     """Draw a heatmap, and return the tikz code.
 
+    The values are mapped through the colorscale of the trace and saved as a PNG image with one pixel per value,
+    row `i` of the image containing `z[i]`.
+
     Parameters
     ----------
     data
@@ -85,27 +132,20 @@ def draw_heatmap(data, fig, img_name, axis: Axis):
 
     code = ""
 
-    figure_data = np.array(data.z)
-
-    # We create a new figure with only the data, and export it as a png
-    fig_copy = deepcopy(fig)
-    fig_copy.update_layout(coloraxis_showscale=False, coloraxis_colorbar=None, xaxis_visible=False, yaxis_visible=False)
-    try:
-        fig_copy.update_traces(showscale=False)
-    except ValueError as _:
-        pass
+    figure_data = np.array(data.z, dtype=float)
 
     if data.texttemplate is not None:
-        warn("Text template is not supported yet.")
-        fig_copy.update_traces(texttemplate=None)
-    fig_copy.update_layout(title=None)
+        report("texttemplate-unsupported", "Text template is not supported yet.")
 
-    img_bytes = fig_copy.to_image(format="png")  # The image created by plotly keeps places around the heatmap
-    cropped_image = crop_image(Image.open(io.BytesIO(img_bytes)))   # so we crop all the white around the figure
-    resized_image = resize_image(cropped_image, *figure_data.shape)  # and we resize it so each square is a 1px x 1px square
+    colorscale = get_colorscale(data, fig)
+    vmin, vmax = get_color_bounds(figure_data, data, fig)
 
-    os.makedirs(os.path.dirname(img_name), exist_ok=True) # Make sure the directory exists
-    resized_image.save(img_name)
+    image = rasterize(figure_data, colorscale or DEFAULT_COLORSCALE, vmin, vmax)
+    # The image is only written if it changed, so that LaTeX builds are not triggered for nothing
+    image_file = io.BytesIO()
+    image_format = Image.registered_extensions().get(os.path.splitext(img_name)[1].lower(), "PNG")
+    Image.fromarray(image, mode="RGBA").save(image_file, format=image_format)
+    write_if_changed(img_name, [image_file.getvalue()])
 
 
     xmin = -0.5
@@ -127,17 +167,11 @@ def draw_heatmap(data, fig, img_name, axis: Axis):
         axis.add_option("ytick", ytick)
         axis.add_option("yticklabels", yticklabels)
 
-    if (colorscale := data.colorscale) is not None:
+    if colorscale is not None:
         axis.add_option("colormap", get_tikz_colorscale(colorscale))
-    elif (colorscale := fig.layout.coloraxis.colorscale) is not None:
-        axis.add_option("colormap", get_tikz_colorscale(colorscale))
-    elif data.showscale is not False:
-        warn("No colorscale found, using default")
-        axis.add_option("colormap", get_tikz_colorscale(DEFAULT_COLORSCALE))
 
-    tmp = np.where(figure_data == None, np.nan, figure_data)
-    axis.add_option("point meta max", np.nanmax(tmp))
-    axis.add_option("point meta min", np.nanmin(tmp))
+    axis.add_option("point meta max", int(vmax) if float(vmax).is_integer() else vmax)
+    axis.add_option("point meta min", int(vmin) if float(vmin).is_integer() else vmin)
     axis.add_option("xmin", xmin)
     axis.add_option("xmax", xmax)
     axis.add_option("ymin", ymax)
@@ -3,23 +3,38 @@ Functions to convert Plotly histogram traces into TikZ/PGFPlots code.
 
 Notes:
 ------
-- Some advanced Plotly histogram features (such as normalization modes and text templates) are not fully supported and will issue warnings.
-- Only the 'count' aggregation function is supported; other functions require pre-processing of data.
+- By default, the raw samples are written in the TeX file and binned by pgfplots. Some advanced Plotly histogram
+  features (such as normalization modes and text templates) are then not fully supported and will issue warnings.
+  Only the 'count' aggregation function is supported; other functions require pre-processing of data.
+- With `draw_histogram_prebinned`, the samples are binned with NumPy and only the bins are written in the TeX file.
 """
-import numbers
-from warnings import warn
+import numpy as np
 from ._axis import Axis
-from ._utils import get_ticks_str, option_dict_to_str
+from ._utils import option_dict_to_str
 from ._tex import tex_addplot
 from ._color import convert_color
+from ._dataContainer import DataContainer
+from ._data import column_info
+from ._diagnostics import report
 
-def formalize_data(data, axis:Axis, row_sep="\\\\"):
+# Steps to which Plotly rounds the sizes of the bins, relative to a power of ten: the automatic sizes, and the minimal
+# size computed from the smallest difference between the samples
+NICE_BIN_STEPS = (2, 5, 10)
+MIN_BIN_STEPS = (0.9, 1.9, 4.9, 9.9)
+
+def formalize_data(data, axis:Axis, row_sep="\\\\", direction="x"):
     """Formalize the data for the histogram trace.
 
     Parameters
     ----------
     data
         data from Plotly figure
+    axis
+        axis of the figure, on which categorical data is placed
+    row_sep, optional
+        row separator of the inline table, by default "\\\\"
+    direction, optional
+        axis of the samples, "x" or "y", by default "x"
 
     Returns
     -------
@@ -27,26 +42,14 @@ def formalize_data(data, axis:Axis, row_sep="\\\\"):
     """
 
     data_str = f"data{row_sep}\n"
-    if isinstance(data[0], numbers.Number):
+    if column_info(data).is_number:
         for x in data:
             data_str += f"{x}{row_sep} "
 
     else:
-        flag_axis = True
-        if axis.xticks is not None:
-            flag_axis = False
-            data_names = axis.xticks
-        else: data_names = []
-
-        for x in data:
-            if x not in data_names:
-                data_names.append(x)
-            data_str += f"{data_names.index(x)}{row_sep} "
-        if flag_axis:
-            ticks, ticklabels = get_ticks_str(data_names)
-            axis.add_option("xtick", ticks)
-            axis.add_option("xticklabels", ticklabels)
-
+        # Categories are written as their positions on the axis, shared with the other traces
+        positions = axis.encode_categories(direction, [str(x) for x in data])
+        data_str += "".join(f"{position}{row_sep} " for position in positions.tolist())
 
     return data_str
 
@@ -87,7 +90,7 @@ def draw_histogram(trace, axis: Axis, colors_set, row_sep="\\\\"):
         data_str = formalize_data(trace.x, axis, row_sep=row_sep)
         axis.add_option("ybar", None)
     elif trace.y is not None:
-        data_str = formalize_data(trace.y, axis, row_sep=row_sep)
+        data_str = formalize_data(trace.y, axis, row_sep=row_sep, direction="y")
         axis.add_option("ybar", None)
         axis.add_option("x filter/.expression", "rawy")
         axis.add_option("y filter/.expression", "rawx")
@@ -99,7 +102,7 @@ def draw_histogram(trace, axis: Axis, colors_set, row_sep="\\\\"):
         hist_options["bins"] = trace.nbinsx
 
     if trace.histnorm == "percent":
-        warn(
+        report("histnorm-unsupported",
             f"Sorry, I did not find an equivalent for histnorm='{trace.histnorm}' in TikZ. "
             "If you need this feature implemented, please open an issue, if possible with a MWE pgfplots code "
             "that would plot this :).\nFor now, the histogram will be plotted without normalization "
@@ -107,14 +110,14 @@ def draw_histogram(trace, axis: Axis, colors_set, row_sep="\\\\"):
         )
         hist_options["density"] = None
     elif trace.histnorm == "probability":
-        warn(
+        report("histnorm-unsupported",
             f"Sorry, I did not find an equivalent for histnorm='{trace.histnorm}' in TikZ. "
             "If you need this feature implemented, please open an issue, if possible with a MWE pgfplots code that would plot this :).\n"
             "For now, the histogram will be plotted without normalization (as if histnorm='probability density')."
         )
         hist_options["density"] = None
     elif trace.histnorm == "density":
-        warn(
+        report("histnorm-unsupported",
             f"Sorry, I did not find an equivalent for histnorm='{trace.histnorm}' in TikZ. "
             "If you need this feature implemented, please open an issue, if possible with a MWE pgfplots code that would plot this :).\n"
             "For now, the histogram will be plotted without normalization (as if histnorm='probability density')."
@@ -130,7 +133,7 @@ def draw_histogram(trace, axis: Axis, colors_set, row_sep="\\\\"):
         plot_options["hist"] = f"{{{option_dict_to_str(hist_options)}}}"
 
     if trace.texttemplate is not None:
-        warn("Text template is not supported yet.")
+        report("texttemplate-unsupported", "Text template is not supported yet.")
 
     if (m := trace.marker) is not None:
 
@@ -144,7 +147,7 @@ def draw_histogram(trace, axis: Axis, colors_set, row_sep="\\\\"):
 
     if (f := trace.histfunc) is not None:
         if f != "count":
-            warn(
+            report("histfunc-unsupported",
                 "To the best of our knowledge, other aggregate function than 'count' are not supported in pgfplots. "
                 "Please pre-treat your data to display what you want. Sorry for the inconvenience."
             )
@@ -154,3 +157,309 @@ def draw_histogram(trace, axis: Axis, colors_set, row_sep="\\\\"):
 
 
     return code
+
+
+def round_to_step(value, steps, down=False):
+    """Round a value to one of increasing steps, as Plotly does: to the first step above the value, or with `down`
+    to the last step below or at the value (clamped to the first or last step).
+
+    Parameters
+    ----------
+    value
+        value to round
+    steps
+        increasing steps
+    down, optional
+        round down instead of up, by default False
+
+    Returns
+    -------
+        the step
+    """
+    index = np.searchsorted(steps, value, side="right")
+    return steps[max(index - 1, 0)] if down else steps[min(index, len(steps) - 1)]
+
+def get_bin_size(values, nbins):
+    """Compute the automatic size of the bins of a numeric histogram, following Plotly.
+
+    Plotly picks a 'nice' size (1, 2 or 5 times a power of ten), the smallest one above the span of the samples divided
+    by `nbins`, so that `nbins` is the maximal number of bins. Without `nbins`, the size is computed from the standard
+    deviation of the samples, but not below the smallest difference between them.
+
+    Parameters
+    ----------
+    values
+        array of the finite samples, not empty
+    nbins
+        `nbinsx` (or `nbinsy`) attribute of the trace, maximal number of bins, or None
+
+    Returns
+    -------
+        size of the bins
+    """
+    span = values.max() - values.min()
+    if nbins:
+        rough_size = span / nbins
+    else:
+        distinct = np.unique(values)
+        differences = np.diff(distinct)
+        differences = differences[differences > (span or 1.) / max(len(values) - 1, 1) / 1e4]
+        min_difference = differences.min(initial=span or 1.)
+        scale = 10. ** np.floor(np.log10(min_difference))
+        min_size = scale * round_to_step(min_difference / scale, MIN_BIN_STEPS, down=True)
+        rough_size = max(min_size, 2 * values.std() / len(values) ** 0.4)
+    if not np.isfinite(rough_size) or rough_size <= 0:
+        return 1.
+    scale = 10. ** np.floor(np.log10(rough_size))
+    return scale * round_to_step(rough_size / scale, NICE_BIN_STEPS)
+
+def get_bin_start(values, size):
+    """Compute the automatic first edge of the bins of a numeric histogram, following Plotly.
+
+    The edges are multiples of the size, shifted by half a bin when all the samples are integers (to center them in
+    their bins) or when many samples are on the edges.
+
+    Parameters
+    ----------
+    values
+        array of the finite samples, not empty
+    size
+        size of the bins
+
+    Returns
+    -------
+        first edge of the bins
+    """
+    low, high = values.min(), values.max()
+    start = np.ceil(low / size) * size - size
+
+    def near_edge(samples):
+        # Samples within 1% of the size from an edge
+        return np.fmod(1 + (samples - start) * 100 / size, 100) < 2
+
+    if np.all(values % 1 == 0):
+        if size < 1:
+            return low - 0.5 * size
+        start -= 0.5
+        return start + size if start + size < low else start
+    on_edges = np.count_nonzero(near_edge(values))
+    in_middles = np.count_nonzero(near_edge(values + size / 2))
+    if in_middles < 0.1 * len(values) and (on_edges > 0.3 * len(values) or near_edge(low) or near_edge(high)):
+        start += size / 2 if start + size / 2 < low else -size / 2
+    return start
+
+def get_bin_edges(values, bins, nbins):
+    """Compute the edges of the bins of a numeric histogram, following Plotly attributes.
+
+    The unset `start`, `end` and `size` of the bins are computed with the rules of Plotly, see `get_bin_size` and
+    `get_bin_start`.
+
+    Parameters
+    ----------
+    values
+        array of the finite samples
+    bins
+        `xbins` (or `ybins`) attribute of the trace, with optional `start`, `end` and `size`
+    nbins
+        `nbinsx` (or `nbinsy`) attribute of the trace, maximal number of bins used if `bins.size` is not set
+
+    Returns
+    -------
+        array of the edges of the bins
+    """
+    # Without samples, a single empty bin is drawn around 0
+    values = values if values.size > 0 else np.zeros(1)
+    if bins is not None and bins.size is not None and bins.size > 0:
+        size = bins.size
+    else:
+        size = get_bin_size(values, nbins)
+    auto_start = get_bin_start(values, size)
+    start = bins.start if bins is not None and bins.start is not None else auto_start
+    if bins is not None and bins.end is not None:
+        end = bins.end
+    else:
+        end = auto_start + (1 + np.floor((values.max() - auto_start) / size)) * size
+    # Plotly increments the last edge by size from start until it reaches or exceeds end
+    nb_edges = int(np.ceil((end - start) / size - 1e-9)) + 1
+    return start + size * np.arange(max(nb_edges, 2))
+
+def aggregate_bins(codes, nb_bins, weights, histfunc):
+    """Aggregate the samples of each bin.
+
+    Parameters
+    ----------
+    codes
+        array of the index of the bin of each sample
+    nb_bins
+        number of bins
+    weights
+        array of the values to aggregate, or None to count the samples
+    histfunc
+        aggregation function, one of 'count', 'sum', 'avg', 'min' or 'max'
+
+    Returns
+    -------
+        array of the value of each bin
+    """
+    counts = np.bincount(codes, minlength=nb_bins).astype(float)
+    if weights is None or histfunc in (None, "count"):
+        return counts
+    sums = np.bincount(codes, weights=weights, minlength=nb_bins)
+    if histfunc == "sum":
+        return sums
+    if histfunc == "avg":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / counts, 0.)
+    if histfunc in ("min", "max"):
+        ufunc = np.minimum if histfunc == "min" else np.maximum
+        result = np.full(nb_bins, np.inf if histfunc == "min" else -np.inf)
+        ufunc.at(result, codes, weights)
+        return np.where(np.isfinite(result), result, 0.)
+    report("histfunc-unsupported", f"Histogram function {histfunc} is not supported, counting the samples instead.")
+    return counts
+
+def normalize_bins(heights, widths, histnorm, cumulative):
+    """Normalize and accumulate the values of the bins, as Plotly does.
+
+    Parameters
+    ----------
+    heights
+        array of the value of each bin
+    widths
+        array of the width of each bin
+    histnorm
+        normalization, one of None, '', 'percent', 'probability', 'density' or 'probability density'
+    cumulative
+        `cumulative` attribute of the trace
+
+    Returns
+    -------
+        array of the normalized value of each bin
+    """
+    total = heights.sum()
+    if cumulative is not None and cumulative.enabled:
+        # In cumulative mode, Plotly handles the density normalizations as their equivalent without density
+        histnorm = {"density": "", "probability density": "probability"}.get(histnorm, histnorm)
+    if histnorm == "percent":
+        heights = 100. * heights / total if total else heights
+    elif histnorm == "probability":
+        heights = heights / total if total else heights
+    elif histnorm == "density":
+        heights = heights / widths
+    elif histnorm == "probability density":
+        heights = heights / (total * widths) if total else heights
+    if cumulative is not None and cumulative.enabled:
+        if cumulative.direction == "decreasing":
+            heights = np.cumsum(heights[::-1])[::-1]
+        else:
+            heights = np.cumsum(heights)
+    return heights
+
+def draw_histogram_prebinned(trace, axis: Axis, colors_set, data_container: DataContainer):
+    """
+    Bin a histogram with NumPy, and return the TikZ code plotting the bins.
+
+    Numeric samples are binned following `nbinsx`/`xbins` (resp. `nbinsy`/`ybins`), and the edges and values of
+    the bins are added to the data container, to be plotted as a `ybar interval` (resp. `xbar interval`).
+    Textual samples are counted per category, and plotted as bars at the position of each category.
+
+    Parameters
+    ----------
+    trace : plotly.graph_objs._histogram.Histogram
+        The histogram trace object containing data and style information.
+    axis : Axis
+        The axis object to which the histogram will be added.
+    colors_set : set
+        A set to keep track of colors used in the plot.
+    data_container : DataContainer
+        Container of the data tables, to which the bins are added.
+
+    Returns
+    -------
+    str
+        A string containing the TikZ code for the histogram.
+    """
+    horizontal = trace.orientation == "h" or (trace.orientation is None and trace.x is None)
+    if horizontal:
+        samples, weights, bins, nbins = trace.y, trace.x, trace.ybins, trace.nbinsy
+    else:
+        samples, weights, bins, nbins = trace.x, trace.y, trace.xbins, trace.nbinsx
+
+    if samples is None:
+        report("empty-trace", "Adding empty trace.")
+        return "\\addplot coordinates {};\n"
+
+    if weights is not None and trace.histfunc in (None, "count"):
+        weights = None
+    if weights is not None:
+        weights = np.array(weights, dtype=float)
+
+    plot_options = {}
+    type_options = {}
+
+    if column_info(samples).is_number:
+        samples = np.array(samples, dtype=float)
+        finite = np.isfinite(samples)
+        if weights is not None:
+            finite &= np.isfinite(weights)
+            weights = weights[finite]
+        samples = samples[finite]
+
+        edges = get_bin_edges(samples, bins, nbins)
+        codes = np.searchsorted(edges, samples, side="right") - 1
+        codes[samples == edges[-1]] = len(edges) - 2            # the last bin is closed
+        in_bins = (codes >= 0) & (codes < len(edges) - 1)
+        heights = aggregate_bins(codes[in_bins], len(edges) - 1, weights[in_bins] if weights is not None else None,
+                                 trace.histfunc)
+        heights = normalize_bins(heights, np.diff(edges), trace.histnorm, trace.cumulative)
+
+        # The last value of an interval plot is not drawn, it is repeated to close the last bin
+        positions, values = edges, np.append(heights, heights[-1])
+        axis.add_option("xbar interval" if horizontal else "ybar interval", None)
+
+    else:
+        # Categories are placed on the axis, shared with the other traces
+        direction = "y" if horizontal else "x"
+        codes = axis.encode_categories(direction, [str(sample) for sample in samples])
+        nb_categories = len(axis.categories[direction])
+        heights = aggregate_bins(codes, nb_categories, weights, trace.histfunc)
+        heights = normalize_bins(heights, np.ones(nb_categories), trace.histnorm, trace.cumulative)
+
+        positions, values = np.arange(nb_categories), heights
+        axis.add_option("xbar" if horizontal else "ybar", None)
+
+    if np.all(values == np.round(values)):
+        values = values.astype(int)
+    data_name_macro, y_name = data_container.add_data(positions, values, trace.name)
+    x_expr = data_container.x_expr(data_name_macro)
+    if horizontal:
+        type_options["x"] = y_name
+        if x_expr is None:
+            type_options["y"] = "x"
+        else:
+            type_options["y expr"] = x_expr
+    else:
+        if x_expr is None:
+            type_options["x"] = "x"
+        else:
+            type_options["x expr"] = x_expr
+        type_options["y"] = y_name
+
+    if trace.texttemplate is not None:
+        report("texttemplate-unsupported", "Text template is not supported yet.")
+
+    if (m := trace.marker) is not None:
+
+        if (c := m.color) is not None:
+            colors_set.add(convert_color(c)[:3])
+            plot_options["fill"] = convert_color(c)[0]
+            plot_options["color"] = convert_color(c)[0]
+
+        if m.opacity is not None:
+            plot_options["opacity"] = m.opacity
+
+    if trace.opacity is not None:
+        plot_options["opacity"] = trace.opacity
+
+    return tex_addplot(data_name_macro, plot_type="table",
+                       options=option_dict_to_str(plot_options), type_options=option_dict_to_str(type_options))
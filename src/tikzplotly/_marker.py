@@ -7,7 +7,7 @@ If the symbol is not supported, a warning is issued and the default '*' symbol i
 Dotted markers (symbols containing '-dot') are not supported yet; a warning is issued and the non-dotted version is used instead.
 """
 
-from warnings import warn
+from ._diagnostics import report
 
 # Source : https://github.com/plotly/plotly.py/blob/51eb5ea9fefda27bccfdb21e660b8d4035cef3b0/packages/python/plotly/plotly/graph_objs/box/_marker.py#L256-L344
 AUTHORIZED_SYMBOLS = [0, '0', 'circle', 100, '100', 'circle-open', 200, '200',
@@ -229,7 +229,7 @@ def marker_symbol_to_tex(symbol):
     """
 
     if symbol not in AUTHORIZED_SYMBOLS:
-        warn(f"Symbol '{symbol}' not supported, defaulting to '*'")
+        report("marker-symbol-unsupported", f"Symbol '{symbol}' not supported, defaulting to '*'")
         return "*", None
 
     # Explanation : with plotly, there is a list of predefined symbols that can be given with a string or a corresponding integer.
@@ -244,5 +244,5 @@ def marker_symbol_to_tex(symbol):
         symbol_name = AUTHORIZED_SYMBOLS[idx]
 
     if "-dot" in symbol_name:
-        warn("Dotted markers are not supported (yet), the symbol without dot will be used instead.")
+        report("marker-dot-unsupported", "Dotted markers are not supported (yet), the symbol without dot will be used instead.")
     return marker_symbol_dict.get(symbol_name.replace("-dot", ""), ("*", None))
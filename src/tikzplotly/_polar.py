@@ -1,13 +1,13 @@
 """
 Provides functionality to convert Plotly 3D polar plots into TikZ/PGFPlots code for LaTeX documents.
 """
-from warnings import warn
 import numpy as np
 from ._axis import Axis
 from ._utils import option_dict_to_str
 from ._tex import tex_addplot
 from ._color import convert_color
 from ._dataContainer import DataContainer
+from ._diagnostics import report
 
 def get_polar_coord(trace, axis: Axis, data_container: DataContainer):
     """Get polar coordinates from the trace
@@ -61,7 +61,7 @@ def get_polar_coord(trace, axis: Axis, data_container: DataContainer):
             # Type
             radial_axis_type = getattr(radialaxis, 'type', None)
             if radial_axis_type is not None and radial_axis_type not in ['-', 'linear', 'category']:
-                warn(f"Polar: Radial axis type {radial_axis_type} is not supported yet.")
+                report("polar-radial-axis-type-unsupported", f"Polar: Radial axis type {radial_axis_type} is not supported yet.")
 
             # Category
             radial_categoryorder = getattr(radialaxis, 'categoryorder', 'trace')
@@ -97,7 +97,7 @@ def get_polar_coord(trace, axis: Axis, data_container: DataContainer):
             elif angular_categoryorder == "category descending":
                 symbolic_theta = sorted(set(symbolic_theta), reverse=True)
             else:
-                warn(f"Polar: Angular category order {angular_categoryorder} is not supported yet.")
+                report("polar-angular-categoryorder-unsupported", f"Polar: Angular category order {angular_categoryorder} is not supported yet.")
 
         n_theta = len(symbolic_theta)
         if period is not None:
@@ -105,7 +105,7 @@ def get_polar_coord(trace, axis: Axis, data_container: DataContainer):
 
         numeric_theta = [symbolic_theta.index(t) * (360 / n_theta) for t in theta]
 
-        axis.environment = "polaraxis"
+        axis.set_environment("polaraxis")
         axis.add_option("xtick", f"{{{','.join(str( i * (360 / n_theta)) for i in range(n_theta))}}}")
         axis.add_option("xticklabels", "{" + ",".join(symbolic_theta) + "}")
     else:
@@ -127,7 +127,7 @@ def get_polar_coord(trace, axis: Axis, data_container: DataContainer):
             elif radial_categoryorder == "category descending":
                 symbolic_r = sorted(set(symbolic_r), reverse=True)
             else:
-                warn(f"Polar: Radial category order {radial_categoryorder} is not supported yet.")
+                report("polar-radial-categoryorder-unsupported", f"Polar: Radial category order {radial_categoryorder} is not supported yet.")
 
         axis.add_option("symbolic y coords", "{" + ",".join(symbolic_r) + "}")
         axis.add_option("ytick", "data")
@@ -137,7 +137,7 @@ def get_polar_coord(trace, axis: Axis, data_container: DataContainer):
 
     return data_name_macro, theta_col_name, r_col_name
 
-def draw_scatterpolar(data_name_macro, theta_col_name, r_col_name, trace, axis: Axis, colors_set):
+def draw_scatterpolar(data_name_macro, theta_col_name, r_col_name, trace, axis: Axis, colors_set, theta_expr=None):
     """
     Draw a scatterpolar plot using pgfplots polaraxis environment.
 
@@ -155,6 +155,8 @@ def draw_scatterpolar(data_name_macro, theta_col_name, r_col_name, trace, axis:
         Axis object (to add axis-level options)
     colors_set : set
         Set of colors defined
+    theta_expr : str, optional
+        Expression of the theta values, when their column is not exported (see `DataContainer.x_expr`).
 
     Returns
     -------
@@ -182,7 +184,7 @@ def draw_scatterpolar(data_name_macro, theta_col_name, r_col_name, trace, axis:
             plot_options["mark options"] = "{" + option_dict_to_str(mark_opts) + "}"
         if marker.size is not None:
             if isinstance(marker.size, np.ndarray):
-                warn("Polar: Individual marker sizes in a trace are not supported yet.")
+                report("polar-marker-sizes-unsupported", "Polar: Individual marker sizes in a trace are not supported yet.")
             else:
                 plot_options["mark size"] = marker.size/4
 
@@ -203,14 +205,14 @@ def draw_scatterpolar(data_name_macro, theta_col_name, r_col_name, trace, axis:
             plot_options["opacity"] = 0.6
 
     # Axis options for polar plot
-    axis.environment = "polaraxis"
+    axis.set_environment("polaraxis")
 
     # Construct TikZ addplot
     code = tex_addplot(
         data_str=data_name_macro,
         plot_type="table",
         options=option_dict_to_str(plot_options),
-        type_options=f"x={theta_col_name}, y={r_col_name}"
+        type_options=f"x={theta_col_name}, y={r_col_name}" if theta_expr is None else f"x expr={theta_expr}, y={r_col_name}"
     )
 
     return code
@@ -0,0 +1,212 @@
+"""
+Opt-in instrumentation of the conversion of a figure, to find out where the time goes.
+
+A `Profile` records the wall time and the number of calls of each stage of the conversion, of each trace and of
+each trace type. When no profile is requested, the conversion uses `NULL_PROFILE`, whose methods do nothing.
+"""
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+# Stages partitioning the conversion, the other stages are nested in them
+TOP_LEVEL_STAGES = ("axis", "traces", "annotations", "assembly")
+
+
+class Timing:
+    """Accumulated wall time and number of calls of a stage.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.
+
+    def add(self, seconds):
+        """Record one call of the stage.
+
+        Parameters
+        ----------
+        seconds
+            wall time of the call, in seconds
+        """
+        self.count += 1
+        self.seconds += seconds
+
+    def as_dict(self):
+        """Return the timing as a dictionary."""
+        return {"count": self.count, "seconds": self.seconds}
+
+    def __repr__(self):
+        return f"Timing(count={self.count}, seconds={self.seconds:.6f})"
+
+
+class Profile:
+    """Timings of the conversion of a figure.
+
+    Pass an instance as the `profile` argument of `get_tikz_code`, `iter_tikz_code` or `save`: it is filled during
+    the conversion. The stages are
+    - 'axis' : construction of the Axis and of its options,
+    - 'traces' : conversion of all the traces, including the nested stages 'add_data', 'add_data3d' and 'heatmap',
+    - 'annotations' : conversion of the annotations,
+    - 'assembly' : generation of the code, including the nested stages 'export_data' and 'colors'.
+    """
+
+    def __init__(self, callback=None):
+        """Initialize a Profile object.
+
+        Parameters
+        ----------
+        callback, optional
+            function called with the profile once the whole code is generated, by default None
+        """
+        self.callback = callback
+        self.stages = {}
+        self.trace_types = {}
+        self.traces = []
+
+    @contextmanager
+    def stage(self, name):
+        """Context manager recording the time spent in a stage.
+
+        Parameters
+        ----------
+        name
+            name of the stage
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.setdefault(name, Timing()).add(perf_counter() - start)
+
+    @contextmanager
+    def trace(self, index, trace):
+        """Context manager recording the time spent converting a trace, also counted in the stage 'traces'.
+
+        Parameters
+        ----------
+        index
+            index of the trace in the figure
+        trace
+            Plotly trace
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            seconds = perf_counter() - start
+            self.traces.append({"index": index, "type": trace.type, "name": trace.name, "seconds": seconds})
+            self.trace_types.setdefault(trace.type, Timing()).add(seconds)
+            self.stages.setdefault("traces", Timing()).add(seconds)
+
+    def timed_iter(self, name, iterable):
+        """Iterate over an iterable, recording the time spent producing its items as a stage.
+
+        The time spent by the consumer between two items is not recorded.
+
+        Parameters
+        ----------
+        name
+            name of the stage
+        iterable
+            iterable to time
+
+        Yields
+        ------
+            items of the iterable
+        """
+        timing = self.stages.setdefault(name, Timing())
+        iterator = iter(iterable)
+        seconds = 0.
+        while True:
+            start = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                timing.add(seconds + perf_counter() - start)
+                return
+            seconds += perf_counter() - start
+            yield item
+
+    def done(self):
+        """Signal the end of the conversion, calling the callback if any."""
+        if self.callback is not None:
+            self.callback(self)
+
+    @property
+    def total(self):
+        """Total wall time of the conversion, in seconds."""
+        return sum(self.stages[name].seconds for name in TOP_LEVEL_STAGES if name in self.stages)
+
+    def as_dict(self):
+        """Return the timings as a dictionary, to be logged or serialized.
+
+        Returns
+        -------
+            dictionary with the keys 'total', 'stages', 'trace_types' and 'traces'
+        """
+        return {
+            "total": self.total,
+            "stages": {name: timing.as_dict() for name, timing in self.stages.items()},
+            "trace_types": {name: timing.as_dict() for name, timing in self.trace_types.items()},
+            "traces": list(self.traces),
+        }
+
+    def report(self):
+        """Format the timings as a human readable table.
+
+        Returns
+        -------
+            string of the report
+        """
+        lines = [f"{'stage':<24}{'calls':>8}{'ms':>12}"]
+        for title, timings in (("", self.stages), ("trace type ", self.trace_types)):
+            for name, timing in timings.items():
+                lines.append(f"{title + name:<24}{timing.count:>8}{timing.seconds * 1e3:>12.3f}")
+        lines.append(f"{'total':<24}{'':>8}{self.total * 1e3:>12.3f}")
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.report()
+
+
+class NullProfile:
+    """Profile recording nothing, used when no profiling is requested.
+    """
+
+    def stage(self, name):
+        """Return a context manager doing nothing."""
+        return nullcontext()
+
+    def trace(self, index, trace):
+        """Return a context manager doing nothing."""
+        return nullcontext()
+
+    def timed_iter(self, name, iterable):
+        """Return the iterable unchanged."""
+        return iterable
+
+    def done(self):
+        """Do nothing."""
+
+
+NULL_PROFILE = NullProfile()
+
+
+def get_profile(profile):
+    """Get the profile to use for a conversion.
+
+    Parameters
+    ----------
+    profile
+        None, a Profile object, or a function called with a new Profile object at the end of the conversion
+
+    Returns
+    -------
+        Profile object, or NULL_PROFILE if profile is None
+    """
+    if profile is None:
+        return NULL_PROFILE
+    if isinstance(profile, Profile):
+        return profile
+    if callable(profile):
+        return Profile(callback=profile)
+    raise TypeError(f"profile should be a Profile object or a callable, not {type(profile).__name__}.")
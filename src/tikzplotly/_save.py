@@ -4,38 +4,74 @@ It includes utilities to process different Plotly trace types (scatter, heatmap,
 configuration, manage data containers, and export the resulting TikZ code to a file or stream.
 """
 
+from inspect import signature
 from pathlib import Path
-from warnings import warn
-import re
 import numpy as np
 from .__about__ import __version__
 from ._tex import tex_add_legendentry, tex_comment, tex_begin_environment, tex_add_color, tex_end_all_environment
+# The converters of the other trace types (and their dependencies, e.g. Pillow) are imported on first use
 from ._scatter import draw_scatter2d
-from ._scatter3d import draw_scatter3d
-from ._heatmap import draw_heatmap
-from ._histogram import draw_histogram
-from ._bar import draw_bar
-from ._polar import get_polar_coord, draw_scatterpolar
 from ._axis import Axis
 from ._color import convert_color
 from ._annotations import str_from_annotation
 from ._dataContainer import DataContainer
-from ._utils import sanitize_tex_text, sanitize_text
+from ._data import get_float_format, column_info, column_scope
+from ._dates import check_date_encoding, format_dates, parse_dates
+from ._downsample import get_point_budget, downsample_trace
+from ._profile import get_profile
+from ._figure import as_figure
+from ._files import track_writes, write_if_changed
+from ._utils import sanitize_tex_text
+from ._diagnostics import get_diagnostics, report
 
 
-def get_tikz_code(
+def get_tikz_code(fig, *args, **kwargs):
+    """Get the tikz code of a figure.
+
+    Parameters
+    ----------
+    fig
+        Plotly figure, figure dictionary or path of a JSON file of a figure
+    *args, **kwargs
+        Additional arguments are passed to `iter_tikz_code`.
+
+    Returns
+    -------
+        string of tikz code
+    """
+    return "".join(iter_tikz_code(fig, *args, **kwargs))
+
+
+def iter_tikz_code(
         fig,
         tikz_options = None,
         axis_options = None,
         include_disclamer = True,
         img_name = "heatmap.png",
+        prebin_histograms = False,
+        max_points = None,
+        downsampling = "lttb",
+        precompute_bars = False,
+        precision = None,
+        float_format = None,
+        date_encoding = "dateplot",
+        data_dir = None,
+        data_store = None,
+        profile = None,
+        cache = None,
+        outputs = None,
+        diagnostics = None,
     ):
-    """Get the tikz code of a figure.
+    """Generate the tikz code of a figure, chunk by chunk.
+
+    The traces are converted when the first chunk is requested, then the preamble, each data table, the colors,
+    the axis and the plots are yielded one after the other, so the whole code never has to be held in memory.
 
     Parameters
     ----------
     fig
-        Plotly figure
+        Plotly figure, figure dictionary (as returned by `fig.to_plotly_json()`) or path of a JSON file of a figure.
+        Dictionaries and JSON files are read without constructing Plotly objects
     tikz_options, optional
         options given to the tikzpicture environment, by default None
     axis_options, optional
@@ -44,53 +80,133 @@ def get_tikz_code(
         include a disclamer in the code, by default True
     img_name, optional
         name of the PNG file for heatmap, by default "heatmap.png"
-
-    Returns
-    -------
-        string of tikz code
+    prebin_histograms, optional
+        bin the histograms with NumPy and only write the bins in the code, instead of writing all the samples
+        and letting pgfplots bin them, by default False
+    max_points, optional
+        maximal number of points of the line scatter traces, larger traces are downsampled before being exported.
+        Either an integer for all the traces, or a dictionary mapping trace indices or names to their budget, the key
+        None giving the default budget. By default None, all the points are exported
+    downsampling, optional
+        downsampling method used for the traces exceeding max_points: 'lttb' (Largest-Triangle-Three-Buckets,
+        keeps the shape of the line) or 'minmax' (minimum and maximum of each bucket, keeps the extent of the line),
+        by default 'lttb'
+    precompute_bars, optional
+        compute the layout of the bar traces (positions, widths and stacking, for every barmode) with NumPy and draw
+        them as filled rectangles, instead of letting pgfplots stack and group them, by default False
+    precision, optional
+        number of significant digits of the floats of the data tables and of the axis limits. Either an integer for
+        everything, or a dictionary mapping trace indices or names (for their tables) and 'xaxis' or 'yaxis' (for the
+        limits of the axis) to their number of digits, the key None giving the default. By default None, the floats
+        are written as Python prints them
+    float_format, optional
+        format of the floats, taking precedence over precision: 'shortest' (shortest representation reading back to
+        the same float), a number of significant digits, or a printf-style format (e.g. '%.3f'). Either a format for
+        everything, or a dictionary as for precision. With 'shortest' and a number of digits, the columns holding only
+        integers are written without decimal point. By default None
+    date_encoding, optional
+        how the dates of the scatter and bar traces (`datetime64` arrays, datetimes, pandas Timestamps or ISO strings)
+        are written: 'dateplot' (date strings, parsed while compiling by the library `pgfplots.dateplot`) or 'numeric'
+        (numbers of days since the first date of the axis, with ticks labelled by tikzplotly, which compiles much
+        faster on long time series), by default 'dateplot'
+    data_dir, optional
+        directory where each data table is written to its own `.dat` file, named by the hash of its content and read
+        by `\\pgfplotstableread`. Existing files are not rewritten. By default None, the tables are written inline
+    data_store, optional
+        DataStore shared by the figures of a document: each distinct column is written once in its file, which the
+        code inputs, and the tables are built from the shared columns. Requires the package pgfplotstable. By default
+        None, the tables are written inline (or in data_dir)
+    profile, optional
+        Profile object recording the wall time and the number of calls of each stage of the conversion, of each trace
+        and of each trace type, or a function called with such an object once the code is generated. By default None,
+        nothing is recorded
+    cache, optional
+        TraceCache object, where the conversion of each trace is stored and reused when the same trace is converted
+        again with the same layout and options. By default None, the traces are always converted
+    outputs, optional
+        list to which the paths of the files written besides the code (heatmap images and data files) are appended,
+        by default None
+    diagnostics, optional
+        Diagnostics object, filled with the diagnostics of the conversion (unsupported features, assumptions on the
+        data...) deduplicated by code and counted, or a function called with such an object once the code is
+        generated. By default None, a warning is emitted the first time each diagnostic is reported
+
+    Yields
+    ------
+        strings of tikz code, to be concatenated
     """
+    return get_diagnostics(diagnostics).scoped_iter(_iter_tikz_code(
+        fig, tikz_options, axis_options, include_disclamer, img_name, prebin_histograms, max_points, downsampling,
+        precompute_bars, precision, float_format, date_encoding, data_dir, data_store, profile, cache, outputs,
+    ))
+
+
+def _iter_tikz_code(fig, tikz_options, axis_options, include_disclamer, img_name, prebin_histograms, max_points,
+                    downsampling, precompute_bars, precision, float_format, date_encoding, data_dir, data_store, profile,
+                    cache, outputs):
+    """Generate the tikz code of a figure, chunk by chunk, see `iter_tikz_code`."""
+    check_date_encoding(date_encoding)
+    fig = as_figure(fig)
     figure_data = fig.data
     figure_layout = fig.layout
     colors_set = set()
     data_str = []
 
-    axis = Axis(figure_layout, colors_set, axis_options=axis_options)
-    data_container = DataContainer()
+    profiler = get_profile(profile)
+    with profiler.stage("axis"):
+        axis_formats = {name: get_float_format(precision, float_format, f"{name}axis") for name in ("x", "y")}
+        axis = Axis(figure_layout, colors_set, axis_options=axis_options, precompute_bars=precompute_bars,
+                    float_formats=axis_formats, date_encoding=date_encoding)
+        bar_layout = {}
+        if precompute_bars:
+            from ._bar import compute_bar_layout
+            bar_layout = compute_bar_layout(figure_data, figure_layout, axis)
+    if cache is None:
+        data_container = DataContainer(profile=profiler)
+    else:
+        data_container = DataContainer(profile=profiler, serialize_column=cache.serialize_column)
+        cache_context = cache.figure_context(figure_layout, prebin_histograms, downsampling, precompute_bars,
+                                             axis_formats, date_encoding)
+
+    show_legend = figure_layout.showlegend is not False
+
+    def legend_entry(trace):
+        """Return the legend entry of a trace, or an empty string if it should not appear in the legend."""
+        if show_legend and trace.name and trace['showlegend'] is not False:
+            return tex_add_legendentry(sanitize_tex_text(trace.name))
+        return ""
 
     if len(figure_data) == 0:
-        warn("No data in figure.")
-
-    for trace in figure_data:
+        report("empty-figure", "No data in figure.")
 
+    def convert_trace(trace_index, trace):
+        """Convert a trace, adding its code to data_str, its data to data_container and its colors to colors_set."""
         if trace.type == "scatter":
             # Handle the case where x or y is empty
             if trace.x is None and trace.y is None:
-                warn("Adding empty trace.")
+                report("empty-trace", "Adding empty trace.")
                 data_str.append( "\\addplot coordinates {};\n" )
-                continue
-
-            if trace.x is None:
-                trace.x = list(range(len(trace.y)))
-            if trace.y is None:
-                trace.y = list(range(len(trace.x)))
-
-            data_name_macro, y_name = data_container.add_data(trace.x, trace.y, trace.name)
-
-            # If x is textual => symbolic x coords
-            if all(isinstance(v, str) for v in trace.x):
-                sanitized_trace_x = [sanitize_text(x, keep_space=-1) for x in trace.x]
-                axis.add_option("symbolic x coords", "{" + ",".join(sanitized_trace_x) + "}")
-                axis.add_option("xtick", "data")
-
-            # If y is textual => symbolic y coords
-            if all(isinstance(v, str) for v in trace.y):
-                sanitized_trace_y = [sanitize_text(y, keep_space=-1) for y in trace.y]
-                axis.add_option("symbolic y coords", "{" + ",".join(sanitized_trace_y) + "}")
-                axis.add_option("ytick", "data")
-
-            data_str.append( draw_scatter2d(data_name_macro, trace, y_name, axis, colors_set) )
-            if trace.name and trace['showlegend'] is not False:
-                data_str.append( tex_add_legendentry(sanitize_tex_text(trace.name)) )
+                return
+
+            # Missing coordinates are the indices of the points, the trace itself is not modified
+            x = trace.x if trace.x is not None else list(range(len(trace.y)))
+            y = trace.y if trace.y is not None else list(range(len(x)))
+
+            # Textual coordinates are categories, written as their positions on the axis, and dates are written as
+            # date strings or numbers
+            x_values = axis.encode_coordinates("x", x)
+            y_values = axis.encode_coordinates("y", y)
+            # The texts are placed at all the points, as written before downsampling
+            positions = x_values, y_values
+            if "lines" in (trace.mode or "lines"):
+                budget = get_point_budget(max_points, trace_index, trace.name)
+                x_values, y_values = downsample_trace(x_values, y_values, budget, downsampling)
+
+            data_name_macro, y_name = data_container.add_data(x_values, y_values, trace.name)
+
+            data_str.append( draw_scatter2d(data_name_macro, trace, y_name, axis, colors_set, x=x, y=y,
+                                            x_expr=data_container.x_expr(data_name_macro), positions=positions) )
+            data_str.append(legend_entry(trace))
             if trace.line.color is not None:
                 colors_set.add(convert_color(trace.line.color)[:3])
             if trace.fillcolor is not None:
@@ -99,47 +215,71 @@ def get_tikz_code(
         elif trace.type == "heatmap":
             # Handle the case where x, y or z is empty
             if trace.z is None:
-                warn("Adding empty trace.")
+                report("empty-trace", "Adding empty trace.")
                 data_str.append( "\\addplot coordinates {};\n" )
-                continue
-            data_str.append( draw_heatmap(trace, fig, img_name, axis) )
+                return
+            from ._heatmap import draw_heatmap
+            with profiler.stage("heatmap"):
+                data_str.append( draw_heatmap(trace, fig, img_name, axis) )
+            if outputs is not None and img_name not in outputs:
+                outputs.append(img_name)
 
         elif trace.type == "histogram":
 
-            data_str.append( draw_histogram(trace, axis, colors_set) )
-            if trace.name and trace['showlegend'] is not False:
-                data_str.append( tex_add_legendentry(sanitize_tex_text(trace.name)) )
+            from ._histogram import draw_histogram, draw_histogram_prebinned
+            if prebin_histograms:
+                data_str.append( draw_histogram_prebinned(trace, axis, colors_set, data_container) )
+            else:
+                data_str.append( draw_histogram(trace, axis, colors_set) )
+            data_str.append(legend_entry(trace))
+
+        elif trace.type == "bar" and trace_index in bar_layout:
+            from ._bar import draw_bar_rectangles
+            data_str.append(draw_bar_rectangles(bar_layout[trace_index], trace, axis, colors_set, data_container))
+            data_str.append(legend_entry(trace))
 
         elif trace.type == "bar":
             orientation = getattr(trace, "orientation", "v")
             cat_list = trace.y if orientation == "h" else trace.x
             val_list = trace.x if orientation == "h" else trace.y
 
+            cat_direction = "y" if orientation == "h" else "x"
+            if column_info(cat_list).kind == "datetime" and date_encoding == "numeric":
+                cat_list = axis.encode_dates(cat_direction, cat_list)
+            else:
+                # Textual positions, including dates, are categories
+                if column_info(cat_list).kind == "datetime" and not column_info(cat_list).strings:
+                    cat_list = format_dates(parse_dates(cat_list))
+                cat_codes = axis.encode_categories(cat_direction, cat_list)
+                if cat_codes is not None:
+                    cat_list = cat_codes
             data_name_macro, val_col_name = data_container.add_data(cat_list, val_list, trace.name)
             x_col_name = "x"
 
-            bar_code = draw_bar(data_name_macro, x_col_name, val_col_name, trace, axis, colors_set)
+            from ._bar import draw_bar
+            bar_code = draw_bar(data_name_macro, x_col_name, val_col_name, trace, axis, colors_set,
+                                data_container.x_expr(data_name_macro), axis_style=not bar_layout)
             data_str.append(bar_code)
 
-            if trace.name and trace['showlegend'] is not False:
-                data_str.append(tex_add_legendentry(sanitize_tex_text(trace.name)))
+            data_str.append(legend_entry(trace))
 
         elif trace.type in ('scatterpolar', 'scatterpolargl'):
+            from ._polar import get_polar_coord, draw_scatterpolar
             data_name_macro, theta_col_name, r_col_name = get_polar_coord(trace, axis, data_container)
             theta_col_name = "x"
 
-            polar_code = draw_scatterpolar(data_name_macro, theta_col_name, r_col_name, trace, axis, colors_set)
+            polar_code = draw_scatterpolar(data_name_macro, theta_col_name, r_col_name, trace, axis, colors_set,
+                                           data_container.x_expr(data_name_macro))
             data_str.append(polar_code)
 
-            if trace.name and trace['showlegend'] is not False:
-                data_str.append(tex_add_legendentry(sanitize_tex_text(trace.name)))
+            data_str.append(legend_entry(trace))
 
         elif trace.type == "scatter3d":
             # Handle the case where x, y, or z is empty
             if trace.x is None or trace.y is None or trace.z is None:
-                warn("Adding empty 3D trace.")
+                report("empty-trace", "Adding empty 3D trace.")
                 data_str.append("\\addplot3 coordinates {};\n")
-                continue
+                return
 
             # View
             if hasattr(figure_layout.scene, "camera") and hasattr(figure_layout.scene.camera, "eye"):
@@ -174,73 +314,180 @@ def get_tikz_code(
                 axis.add_option("title", f"{{{sanitize_tex_text(figure_layout.scene.title.text)}}}")
 
             data_name_macro, z_name = data_container.add_data3d(trace.x, trace.y, trace.z, trace.name)
+            from ._scatter3d import draw_scatter3d
             data_str.append(draw_scatter3d(data_name_macro, trace, colors_set))
 
-            if trace.name and trace['showlegend'] is not False:
-                data_str.append(tex_add_legendentry(sanitize_tex_text(trace.name)))
+            data_str.append(legend_entry(trace))
             if getattr(trace, "line", None) and getattr(trace.line, "color", None) is not None:
                 colors_set.add(convert_color(trace.line.color)[:3])
             if getattr(trace, "fillcolor", None) is not None:
                 colors_set.add(convert_color(trace.fillcolor)[:3])
 
         else:
-            warn(f"Trace type {trace.type} is not supported yet.")
+            report("trace-type-unsupported", f"Trace type {trace.type} is not supported yet.")
 
-    annotation_str = str_from_annotation(figure_layout.annotations, axis, colors_set)
+    # The type of each column is inferred once, and shared by the converters examining it
+    with column_scope():
+        for trace_index, trace in enumerate(figure_data):
+            with profiler.trace(trace_index, trace):
+                data_container.float_format = get_float_format(precision, float_format, trace_index, trace.name)
+                if cache is None:
+                    convert_trace(trace_index, trace)
+                else:
+                    key = cache.trace_key(trace, cache_context, get_point_budget(max_points, trace_index, trace.name),
+                                          bar_layout.get(trace_index), data_container.float_format,
+                                          axis.category_state(), axis.date_state())
+                    cache.convert_trace(key, lambda: convert_trace(trace_index, trace),
+                                        data_container, axis, colors_set, data_str)
 
-    code = """"""
-    stack_env = []
+    with profiler.stage("annotations"):
+        annotation_str = str_from_annotation(figure_layout.annotations, axis, colors_set)
 
-    if include_disclamer:
-        code += tex_comment(f"This file was created with tikzplotly version {__version__}.")
+    def assemble():
+        """Generate the code of the figure, once all the traces are converted."""
+        stack_env = []
 
-    if len(data_container.data) > 0:
-        code += data_container.export_data()
-        code += "\n"
+        if include_disclamer:
+            yield tex_comment(f"This file was created with tikzplotly version {__version__}.")
 
-    code += tex_begin_environment("tikzpicture", stack_env, options=tikz_options)
+        if len(data_container.data) > 0:
+            yield from data_container.iter_export_data(data_dir, data_store)
+            yield "\n"
+            if outputs is not None:
+                outputs.extend(data_container.data_files)
 
-    if bool(colors_set):
-        code += "\n"
-    color_list = list(colors_set)
-    color_list.sort()
-    for color in color_list:
-        code += tex_add_color(color[0], color[1], color[2])
-    if bool(colors_set):
-        code += "\n"
+        yield tex_begin_environment("tikzpicture", stack_env, options=tikz_options)
 
-    code += axis.open_environment(stack_env)
+        with profiler.stage("colors"):
+            color_list = sorted(colors_set)
+            color_code = "".join(tex_add_color(color[0], color[1], color[2]) for color in color_list)
+        if color_list:
+            yield "\n" + color_code + "\n"
 
-    if figure_layout.legend.title.text is not None and figure_layout.showlegend:
-        code += "\\addlegendimage{empty legend}\n"
-        code += tex_add_legendentry(sanitize_tex_text(fig.layout.legend.title.text), options="yshift=5pt")
+        yield axis.open_environment(stack_env)
 
-    for trace_str in data_str:
-        code += trace_str
+        if figure_layout.legend.title.text is not None and figure_layout.showlegend:
+            yield "\\addlegendimage{empty legend}\n"
+            yield tex_add_legendentry(sanitize_tex_text(fig.layout.legend.title.text), options="yshift=5pt")
 
-    code += annotation_str
+        yield from data_str
 
-    if figure_layout.showlegend is False:
-        code = re.sub(r"\\addlegendentry{.+}\n", "", code)
+        yield annotation_str
 
-    code += tex_end_all_environment(stack_env)
+        yield tex_end_all_environment(stack_env)
 
-    return code
+    yield from profiler.timed_iter("assembly", assemble())
+    profiler.done()
 
 
-def save(filepath, *args, **kwargs):
+def write_code(filepath, chunks):
+    """Write chunks of code to a file or a stream.
+
+    Files are only written if their content changes, with an atomic rename, see `write_if_changed`.
+
+    Parameters
+    ----------
+    filepath : str, Path or text stream
+        path of the file, created with its directory if needed, or object with a `write` method
+    chunks
+        iterable of strings
+
+    Returns
+    -------
+        True if the code was written, False if the file already had this content
+    """
+    if hasattr(filepath, "write"):
+        for chunk in chunks:
+            filepath.write(chunk)
+        return True
+    return write_if_changed(filepath, chunks)
+
+
+def save(filepath, *args, cache_dir=None, cache_max_age=30 * 24 * 3600, cache_max_size=512 * 2**20, **kwargs):
     """Save a figure to a file or a stream.
 
+    The code is written chunk by chunk as it is generated by `iter_tikz_code`.
+
     Parameters
     ----------
-    filepath : str or Path
-        A string containing a path to a filename, or a Path object.
+    filepath : str, Path or text stream
+        A string containing a path to a filename, a Path object, or an object with a `write` method
+        (e.g. an opened text file or an `io.StringIO`).
     *args, **kwargs
         Additional arguments are passed to the backend.
+    cache_dir : str or Path, optional
+        Directory where the outputs of the figure (code, heatmap images and data files) are stored, under the hash of
+        the figure, of the options and of the version of tikzplotly. When this hash is unchanged, the figure is not
+        converted and its outputs are restored from the cache. By default None, the figure is always converted.
+    cache_max_age : float, optional
+        Entries of the cache unused for this time, in seconds, are evicted. By default 30 days.
+    cache_max_size : int, optional
+        Maximal total size of the cache, in bytes, the least recently used entries are evicted beyond it.
+        By default 512 MiB.
+
+    Returns
+    -------
+    bool
+        True if anything was written: the code (always the case for streams), a heatmap image or a data file.
+        Files whose content did not change are not rewritten, so that their modification time is kept.
+    """
+    with track_writes() as written_files:
+        written = _save(filepath, args, kwargs, cache_dir, cache_max_age, cache_max_size)
+    return written or len(written_files) > 0
+
+
+def _save(filepath, args, kwargs, cache_dir, cache_max_age, cache_max_size):
+    """Save a figure, see `save`.
+
+    Returns
+    -------
+        value returned by `write_code` for the code of the figure
     """
-    code = get_tikz_code(*args, **kwargs)
-    directory = Path(filepath).parent
-    if not directory.exists():
-        directory.mkdir(parents=True)
-    with open(filepath, "w", encoding='utf-8') as fd:
-        fd.write(code)
+    if cache_dir is None:
+        return write_code(filepath, iter_tikz_code(*args, **kwargs))
+
+    from ._cache import FigureCache
+    figure_cache = FigureCache(cache_dir, cache_max_age, cache_max_size)
+    arguments = signature(iter_tikz_code).bind(*args, **kwargs)
+    arguments.apply_defaults()
+    options = dict(arguments.arguments)
+    fig = as_figure(options.pop("fig"))
+    # Arguments receiving information on the conversion, they do not change the code
+    observers = {name: options.pop(name) for name in ("profile", "cache", "diagnostics")}
+    diagnostics = observers["diagnostics"] = get_diagnostics(observers["diagnostics"])
+    outputs = options.pop("outputs")
+    if options["data_store"] is not None:
+        # The shared columns have to be added to the store, the figure cannot be restored without converting it
+        return write_code(filepath, iter_tikz_code(fig, outputs=outputs, **observers, **options))
+    key = figure_cache.key(fig, options)
+
+    restored = figure_cache.restore(key)
+    if restored is not None:
+        code, files, reports = restored
+        # The diagnostics of the conversion are reported again, as if the figure was converted
+        for code_name, message, category, count in reports:
+            diagnostics.report(code_name, message, category, count)
+        if diagnostics.callback is not None:
+            diagnostics.callback(diagnostics)
+        if outputs is not None:
+            outputs.extend(files)
+        return write_code(filepath, [code])
+
+    files = []
+    chunks = []
+
+    def record(chunk_iterator):
+        """Keep the chunks of code written, to store them in the cache."""
+        for chunk in chunk_iterator:
+            chunks.append(chunk)
+            yield chunk
+
+    counts_before = diagnostics.counts()
+    written = write_code(filepath,
+                         record(iter_tikz_code(fig, outputs=files, **observers, **options)))
+    reports = [(entry.code, entry.message, entry.category, entry.count - counts_before.get(entry.code, 0))
+               for entry in diagnostics if entry.count > counts_before.get(entry.code, 0)]
+    figure_cache.store(key, "".join(chunks), files, reports)
+    if outputs is not None:
+        outputs.extend(files)
+    return written
@@ -2,17 +2,18 @@
 Provides functionality to convert Plotly scatter traces into TikZ/PGFPlots code for LaTeX documents.
 """
 
-from warnings import warn
 import numpy as np
 from ._tex import tex_addplot, tex_add_text
 from ._color import convert_color
 from ._marker import marker_symbol_to_tex
 from ._dash import DASH_PATTERN
 from ._axis import Axis
-from ._data import data_type
+from ._data import column_info
+from ._dates import format_coordinates
 from ._utils import px_to_pt, option_dict_to_str
+from ._diagnostics import report
 
-def draw_scatter2d(data_name, scatter, y_name, axis: Axis, color_set):
+def draw_scatter2d(data_name, scatter, y_name, axis: Axis, color_set, x=None, y=None, x_expr=None, positions=None):
     """Get code for a scatter trace.
 
     Parameters
@@ -27,6 +28,14 @@ def draw_scatter2d(data_name, scatter, y_name, axis: Axis, color_set):
         axis object previously created
     color_set
         set of colors used in the figure
+    x, y, optional
+        coordinates of the points, by default those of the trace
+    x_expr, optional
+        expression of the x coordinates, when the x column is not exported (see `DataContainer.x_expr`),
+        by default None
+    positions, optional
+        tuple of the x and y coordinates of the points as written in the table (see `Axis.encode_coordinates`), at
+        which the texts are placed, by default x and y
 
     Returns
     -------
@@ -34,18 +43,18 @@ def draw_scatter2d(data_name, scatter, y_name, axis: Axis, color_set):
     """
     code = ""
 
+    x = scatter.x if x is None else x
+    y = scatter.y if y is None else y
+
     mode = scatter.mode
     marker = scatter.marker
 
-    type_of_data = data_type(scatter.x[0])
+    x_info = column_info(x)
 
-    if type_of_data == "date":
+    if x_info.kind == "datetime" and axis.date_encoding == "dateplot":
+        report("date-assumed", "Assuming this is a date, add \"\\usetikzlibrary{pgfplots.dateplot}\" to your tex preamble.")
         axis.add_option("date coordinates in", "x")
 
-    if type_of_data == "month":
-        scatter_x_str = "{" + ", ".join(list(scatter.x)) + "}"
-        axis.add_option("xticklabels", scatter_x_str)
-
     if mode is None:
         # by default, plot markers and lines
         mode = "markers+lines"
@@ -101,13 +110,13 @@ def draw_scatter2d(data_name, scatter, y_name, axis: Axis, color_set):
                 mark_option_dict[symbol_options[0]] = symbol_options[1]
 
     else:
-        warn(f"Scatter : Mode {mode} is not supported yet.")
+        report("scatter-mode-unsupported", f"Scatter : Mode {mode} is not supported yet.")
 
     if scatter.line.width is not None:
         options_dict["line width"] = px_to_pt(scatter.line.width)
     if scatter.line.dash is not None:
         options_dict[DASH_PATTERN[scatter.line.dash]] = None
-    if scatter.connectgaps in [False, None] and None in scatter.x:
+    if scatter.connectgaps in [False, None] and x_info.has_missing:
         options_dict["unbounded coords"] = "jump"
 
 
@@ -128,10 +137,12 @@ def draw_scatter2d(data_name, scatter, y_name, axis: Axis, color_set):
         options_dict["forget plot"] = None
 
     options = option_dict_to_str(options_dict)
-    code += tex_addplot(data_name, plot_type="table", options=options, type_options=f"y={y_name}")
+    type_options = f"y={y_name}" if x_expr is None else f"x expr={x_expr}, y={y_name}"
+    code += tex_addplot(data_name, plot_type="table", options=options, type_options=type_options)
 
     if scatter.text is not None:
-        for x_data, y_data, text_data in zip(scatter.x, scatter.y, scatter.text):
+        text_x, text_y = (x, y) if positions is None else map(format_coordinates, positions)
+        for x_data, y_data, text_data in zip(text_x, text_y, scatter.text):
             code += tex_add_text(x_data, y_data, str(text_data).rstrip('.0'))
 
     return code
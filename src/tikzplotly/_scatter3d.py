@@ -1,11 +1,11 @@
 """
 Provides functionality to convert Plotly 3D scatter traces into TikZ/PGFPlots code for LaTeX documents.
 """
-from warnings import warn
 import numpy as np
 from ._color import convert_color
 from ._marker import marker_symbol_to_tex
 from ._utils import px_to_pt, option_dict_to_str
+from ._diagnostics import report
 
 def draw_scatter3d(data_name, scatter, color_set):
     """
@@ -80,7 +80,7 @@ def draw_scatter3d(data_name, scatter, color_set):
                 mark_option_dict[symbol_options[0]] = symbol_options[1]
 
     else:
-        warn(f"Scatter3d : Mode {mode} is not supported yet.")
+        report("scatter3d-mode-unsupported", f"Scatter3d : Mode {mode} is not supported yet.")
 
     if scatter.line is not None:
         if scatter.line.width is not None:
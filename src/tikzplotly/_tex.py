@@ -2,7 +2,7 @@
     specifically for documents using the pgfplots package.
     It includes functions to create document classes, environments, and TikZ commands.
 """
-from ._color import hex2rgb
+from ._color import color_to_rgb
 from ._utils import sanitize_tex_text
 
 def tex_comment(text):
@@ -242,7 +242,7 @@ def get_tikz_colorscale(colorscale, name="mycolor"):
 
     code = "{" + str(name) + "}{\n"
     for dist, color in colorscale:
-        rgb_color = hex2rgb(color)
-        code += f"  rgb255({dist}cm)=({rgb_color})".replace(" ", "") + ";\n"
+        red, green, blue = color_to_rgb(color)
+        code += f"  rgb255({dist}cm)=({red},{green},{blue})".replace(" ", "") + ";\n"
     code += "}"
     return code
@@ -9,9 +9,9 @@ This module provides helper functions for:
 - Generating tick strings for axis labeling.
 """
 import re
-import warnings
 from math import floor
 import numpy as np
+from ._diagnostics import report
 
 rep_digit = {'0': 'Z', '1': 'O', '2': 'T', '3': 'Th', '4': 'F', '5': 'Fi', '6': 'S', '7': 'Se', '8': 'E', '9': 'N'}
 rep_digit = dict((re.escape(k), v) for k, v in rep_digit.items())
@@ -144,7 +144,7 @@ def sanitize_tex_char(ch: str) -> str:
     if ch in "_{}":
         return f"\\{ch}"
     if ord(ch) > 127 or not ch.isprintable():
-        warnings.warn(f"Character {ch} has been replaced by \"x{ord(ch):x}\" in output file")
+        report("tex-character-replaced", f"Character {ch} has been replaced by \"x{ord(ch):x}\" in output file")
         return f"x{ord(ch):x}"
     return ch
 
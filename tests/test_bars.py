@@ -5,6 +5,9 @@ import os
 from .helpers import assert_equality
 import pathlib
 import pytest
+import tikzplotly
+from tikzplotly._axis import Axis
+from tikzplotly._bar import compute_bar_layout
 
 this_dir = pathlib.Path(__file__).resolve().parent
 test_name = "test_bars"
@@ -55,3 +58,81 @@ def test_horizontal1():
 
 def test_horizontal2():
     assert_equality(plot_horizontal2(), os.path.join(this_dir, test_name, test_name + "_horizontal2_reference.tex"))
+
+
+def plot_modes(barmode):
+    fig = go.Figure([
+        go.Bar(x=["a", "b", "c"], y=[1, -2, 3], name="A"),
+        go.Bar(x=["a", "b", "c"], y=[2, -1, np.nan], name="B"),
+    ])
+    fig.update_layout(barmode=barmode)
+    return fig
+
+def compute_layout(fig):
+    axis = Axis(fig.layout, set(), precompute_bars=True)
+    return compute_bar_layout(fig.data, fig.layout, axis), axis
+
+def test_precomputed_layout():
+    fig = plot_modes("group")
+    geometry, axis = compute_layout(fig)
+    np.testing.assert_allclose(geometry[0].position_low, [-0.4, 0.6, 1.6])
+    np.testing.assert_allclose(geometry[0].position_high, [0, 1, 2])
+    np.testing.assert_allclose(geometry[1].position_low, [0, 1], atol=1e-12)
+    assert list(axis.categories["x"]) == ["a", "b", "c"]
+
+    fig = plot_modes("stack")
+    geometry, _ = compute_layout(fig)
+    np.testing.assert_allclose(geometry[1].position_high, [0.4, 1.4])
+    np.testing.assert_allclose(geometry[1].value_low, [1, -2])
+    np.testing.assert_allclose(geometry[1].value_high, [3, -3])
+
+    fig = plot_modes("relative")
+    fig.data[1].y = [-2, 1, np.nan]
+    geometry, _ = compute_layout(fig)
+    np.testing.assert_allclose(geometry[1].value_low, [0, 0])
+    np.testing.assert_allclose(geometry[1].value_high, [-2, 1])
+
+    fig = plot_modes("overlay")
+    geometry, _ = compute_layout(fig)
+    np.testing.assert_allclose(geometry[1].value_low, [0, 0])
+    np.testing.assert_allclose(geometry[1].position_low, [-0.4, 0.6])
+
+def test_precomputed_code():
+    fig = plot_modes("stack")
+    code = tikzplotly.get_tikz_code(fig, precompute_bars=True)
+    assert "ybar" not in code
+    assert "xticklabels={a,b,c}" in code
+    assert code.count("unbounded coords=jump") == 2
+    assert code.count("nan nan") == 3
+
+    fig = plot_horizontal1()
+    code = tikzplotly.get_tikz_code(fig, precompute_bars=True)
+    assert "xbar" not in code
+    assert "yticklabels={giraffes,orangutans,monkeys}" in code
+    assert "20.0 -0.4" in code
+
+
+def test_precomputed_missing_positions():
+    fig = go.Figure([go.Bar(x=[0, 1, None, 3], y=[1, 2, 3, 4]), go.Bar(x=[0, 1, 2, 3], y=[1, 1, 1, 1])])
+    fig.update_layout(barmode="stack")
+    geometry, _ = compute_layout(fig)
+    np.testing.assert_allclose(geometry[0].value_high, [1, 2, 4])
+    # The bar without position does not raise the bar stacked at 2
+    np.testing.assert_allclose(geometry[1].value_low, [1, 2, 0, 4])
+
+
+def test_precomputed_mixed_figure():
+    fig = go.Figure([go.Bar(x=["a", "b"], y=[1, 2]), go.Bar(x=["a", "b"], y=["x", "y"])])
+    fig.update_layout(barmode="stack")
+    code = tikzplotly.get_tikz_code(fig, precompute_bars=True, diagnostics=lambda diagnostics: None)
+    # The bars drawn by pgfplots do not change the style of the rectangles
+    assert "ybar" not in code.split("\\addplot")[0]
+    assert "\\addplot+ [ybar" in code
+
+
+def test_precomputed_constant_x():
+    fig = go.Figure(go.Bar(x=[0], y=[0], orientation="h"))
+    code = tikzplotly.get_tikz_code(fig, precompute_bars=True)
+    # The x column of the rectangles is constant, it is not exported but given as an expression
+    assert "\ny0\n" in code
+    assert "table[x expr=\\coordindex*0, y=y0]" in code
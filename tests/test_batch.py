@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import plotly.graph_objects as go
+from tikzplotly import Profile, get_tikz_code, save_many
+from tikzplotly._figure import decode_typed_arrays
+from .test_scatter import plot_1 as plot_scatter_1, plot_2 as plot_scatter_2
+from .test_bars import plot_vertical1
+from .test_histograms import plot_1 as plot_histogram_1
+
+
+def test_decode_typed_arrays():
+    arrays = [np.arange(5), np.linspace(0, 1, 4, dtype=np.float32), np.arange(6, dtype=np.uint16).reshape(2, 3)]
+    fig = go.Figure([go.Scatter(x=arrays[0], y=arrays[1]), go.Heatmap(z=arrays[2])])
+    decoded = decode_typed_arrays(fig.to_plotly_json())
+    np.testing.assert_array_equal(decoded["data"][0]["x"], arrays[0])
+    assert decoded["data"][0]["y"].dtype == np.float32
+    np.testing.assert_array_equal(decoded["data"][1]["z"], arrays[2])
+
+
+def test_save_many(tmp_path):
+    figures = [plot_scatter_1(), plot_scatter_2(), plot_vertical1(), plot_histogram_1()]
+    items = [(tmp_path / f"fig{i}.tex", fig) for i, fig in enumerate(figures)]
+    items.append((tmp_path / "fig_dict.tex", figures[0].to_plotly_json(), {"axis_options": "grid=major"}))
+    results = save_many(items, workers=2, include_disclamer=False)
+
+    assert [r.filepath for r in results] == [str(item[0]) for item in items]
+    assert all(r.ok and r.written for r in results)
+    for result, fig in zip(results, figures):
+        with open(result.filepath, encoding="utf-8") as f:
+            assert f.read() == get_tikz_code(fig, include_disclamer=False)
+    with open(results[-1].filepath, encoding="utf-8") as f:
+        assert f.read() == get_tikz_code(figures[0], include_disclamer=False, axis_options="grid=major")
+
+
+def test_save_many_errors(tmp_path):
+    items = [
+        (tmp_path / "empty.tex", go.Figure()),
+        (tmp_path / "invalid.tex", {"data": [{"type": "scatter", "x": [0, 1], "y": [0, 1], "mode": "invalid"}]}),
+        (tmp_path / "scatter.tex", plot_scatter_1()),
+    ]
+    empty, invalid, scatter = save_many(items, workers=1)
+    assert empty.ok and "No data in figure." in empty.warnings
+    assert not invalid.ok and invalid.error.startswith("ValueError")
+    assert scatter.ok
+
+
+def test_save_many_in_process_arguments(tmp_path):
+    items = [(tmp_path / f"fig{i}.tex", plot_scatter_1()) for i in range(2)]
+    # The outputs would be filled in the workers, and lost
+    with pytest.raises(ValueError, match="outputs"):
+        save_many(items, workers=2, outputs=[])
+    with pytest.raises(ValueError, match="profile"):
+        save_many(items[:1] + [(*items[1], {"profile": Profile()})], workers=2)
+    outputs = []
+    results = save_many(items, workers=1, outputs=outputs, data_dir=tmp_path / "data")
+    assert all(r.ok for r in results) and len(outputs) == 2
@@ -0,0 +1,205 @@
+import os
+import time
+import warnings
+from unittest.mock import patch
+import numpy as np
+import plotly.graph_objects as go
+from tikzplotly import TraceCache, get_tikz_code, save
+from .test_scatter import plot_1 as plot_scatter_1
+from .test_bars import plot_vertical1
+from .test_histograms import plot_1 as plot_histogram_1
+
+
+def multi_trace_figure():
+    fig = go.Figure()
+    x = np.arange(50)
+    for i in range(3):
+        fig.add_scatter(x=x, y=np.sin(x / (i + 1)), name=f"trace{i}", mode="lines")
+    fig.add_scatter(x=x + 0.5, y=np.cos(x), name="other x", mode="markers")
+    fig.add_bar(x=["a", "b", "c"], y=[1, 3, 2])
+    return fig
+
+
+def test_cache_identical_output():
+    cache = TraceCache()
+    for fig in [plot_scatter_1(), plot_vertical1(), plot_histogram_1(), multi_trace_figure()]:
+        reference = get_tikz_code(fig)
+        assert get_tikz_code(fig, cache=cache) == reference
+        assert get_tikz_code(fig, cache=cache) == reference
+
+
+def test_cache_hits():
+    fig = multi_trace_figure()
+    cache = TraceCache()
+    get_tikz_code(fig, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 5)
+    get_tikz_code(fig, cache=cache)
+    assert (cache.hits, cache.misses) == (5, 5)
+    assert cache.column_hits > 0
+
+    # Only the modified trace is converted again
+    fig.data[1].y = np.tan(np.arange(50))
+    assert get_tikz_code(fig, cache=cache) == get_tikz_code(fig)
+    assert (cache.hits, cache.misses) == (9, 6)
+
+    # The layout and the options are part of the keys
+    get_tikz_code(fig, cache=cache, prebin_histograms=True)
+    fig.update_layout(showlegend=False)
+    assert get_tikz_code(fig, cache=cache) == get_tikz_code(fig)
+    assert cache.misses == 16
+
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "column_hits": 0, "column_misses": 0, "traces": 0, "columns": 0}
+
+
+def test_cache_shared_data():
+    # A cached trace whose table gets another name in a new figure is converted again
+    x = np.array([0, np.nan, 2])
+    trace = go.Scatter(x=x, y=[1, 2, 3], name="gap")
+    cache = TraceCache()
+    get_tikz_code(go.Figure([trace]), cache=cache)
+    fig = go.Figure([go.Scatter(x=x, y=[3, 2, 1]), trace])
+    assert get_tikz_code(fig, cache=cache) == get_tikz_code(fig)
+    assert cache.hits == 0
+
+
+def test_cache_warnings():
+    fig = go.Figure(go.Scatter(x=[0, 1], y=[0, 1], mode="text", text=["a", "b"]))
+    cache = TraceCache()
+    for _ in range(2):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            get_tikz_code(fig, cache=cache)
+        assert len(caught) == 1
+    assert cache.hits == 1
+
+
+def test_cache_directory(tmp_path):
+    fig = multi_trace_figure()
+    reference = get_tikz_code(fig)
+    assert get_tikz_code(fig, cache=TraceCache(directory=tmp_path)) == reference
+    cache = TraceCache(directory=tmp_path)
+    assert get_tikz_code(fig, cache=cache) == reference
+    assert (cache.hits, cache.misses) == (5, 0)
+
+    cache = TraceCache(maxsize=2, directory=tmp_path / "small")
+    get_tikz_code(fig, cache=cache)
+    assert cache.stats()["traces"] == 2
+
+
+def test_save_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache_dir = tmp_path / "cache"
+    fig = multi_trace_figure()
+    fig.add_heatmap(z=[[1, 2], [3, 4]])
+    kwargs = {"img_name": "img/heatmap.png", "data_dir": "data", "cache_dir": cache_dir}
+    outputs = []
+    save("figure.tex", fig, outputs=outputs, **kwargs)
+    code = (tmp_path / "figure.tex").read_text(encoding="utf-8")
+    image = (tmp_path / "img" / "heatmap.png").read_bytes()
+    assert "img/heatmap.png" in outputs and len(outputs) == 4
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # The outputs are restored without converting the figure
+    for path in ["figure.tex", "img/heatmap.png", *outputs]:
+        (tmp_path / path).unlink(missing_ok=True)
+    with patch("tikzplotly._save.DataContainer", side_effect=AssertionError):
+        save("figure.tex", fig, **kwargs)
+    assert (tmp_path / "figure.tex").read_text(encoding="utf-8") == code
+    assert (tmp_path / "img" / "heatmap.png").read_bytes() == image
+    assert all((tmp_path / path).exists() for path in outputs)
+
+    # Another option or another figure is another entry
+    save("figure.tex", fig, axis_options="grid=major", **kwargs)
+    fig.data[0].name = "renamed"
+    save("figure.tex", fig, **kwargs)
+    assert len(list(cache_dir.iterdir())) == 3
+    assert (tmp_path / "figure.tex").read_text(encoding="utf-8") == get_tikz_code(fig, img_name="img/heatmap.png",
+                                                                                  data_dir="data")
+
+
+def test_save_cache_eviction(tmp_path):
+    cache_dir = tmp_path / "cache"
+    figures = [plot_scatter_1(), plot_vertical1(), plot_histogram_1()]
+    for i, fig in enumerate(figures):
+        save(tmp_path / f"fig{i}.tex", fig, cache_dir=cache_dir)
+    assert len(list(cache_dir.iterdir())) == 3
+
+    # Entries unused for longer than the maximal age are removed, the restored entry is used again
+    for entry in cache_dir.iterdir():
+        os.utime(entry, (time.time() - 3600, time.time() - 3600))
+    save(tmp_path / "fig0.tex", figures[0], cache_dir=cache_dir, cache_max_age=60)
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # The least recently used entries are removed beyond the maximal size
+    save(tmp_path / "fig1.tex", figures[1], cache_dir=cache_dir, cache_max_size=1)
+    assert len(list(cache_dir.iterdir())) == 0
+
+
+def test_save_cache_dir_evicted_entry(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache_dir = tmp_path / "cache"
+    fig = go.Figure(go.Heatmap(z=[[1, 2], [3, 4]]))
+    save("figure.tex", fig, img_name="heatmap.png", cache_dir=cache_dir)
+    code = (tmp_path / "figure.tex").read_text(encoding="utf-8")
+
+    # A file of the entry removed by another process is a miss, the figure is converted again
+    entry, = cache_dir.iterdir()
+    (entry / "0").unlink()
+    (tmp_path / "heatmap.png").unlink()
+    save("figure.tex", fig, img_name="heatmap.png", cache_dir=cache_dir)
+    assert (tmp_path / "figure.tex").read_text(encoding="utf-8") == code
+    assert (tmp_path / "heatmap.png").exists()
+
+
+def test_save_cache_dir_diagnostics(tmp_path):
+    cache_dir = tmp_path / "cache"
+    fig = go.Figure([go.Scatter(x=[1, 2], y=[1, 2], mode="text"), go.Scatter(x=[1, 2], y=[3, 4], mode="text")])
+    got = []
+    for _ in range(2):
+        save(tmp_path / "fig.tex", fig, cache_dir=cache_dir, diagnostics=got.append)
+    # The diagnostics of the restored figure are reported as those of the converted one
+    assert len(got) == 2
+    assert got[1].counts() == got[0].counts() == {"scatter-mode-unsupported": 2}
+    assert got[1].as_list() == got[0].as_list()
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        save(tmp_path / "fig.tex", fig, cache_dir=cache_dir)
+    assert [str(warning.message) for warning in caught] == [got[0]["scatter-mode-unsupported"].message]
+
+
+def test_cache_shared_categories():
+    fig = go.Figure([go.Bar(x=["a", "b"], y=[1, 2]), go.Scatter(x=["b", "c"], y=[3, 4])])
+    cache = TraceCache()
+    assert get_tikz_code(fig, cache=cache) == get_tikz_code(fig)
+    assert get_tikz_code(fig, cache=cache) == get_tikz_code(fig)
+    assert cache.hits == 2
+
+    # The categories of the first trace change the positions of the second one
+    fig.data[0].x = ["c", "a"]
+    assert get_tikz_code(fig, cache=cache) == get_tikz_code(fig)
+    assert cache.hits == 2
+
+
+def test_cache_date_encoding():
+    fig = go.Figure([go.Scatter(x=["2021-01-01", "2021-01-02"], y=[1, 2]),
+                     go.Scatter(x=["2021-01-05", "2021-01-09"], y=[3, 4])])
+    cache = TraceCache()
+    for _ in range(2):
+        assert get_tikz_code(fig, cache=cache, date_encoding="numeric") == get_tikz_code(fig, date_encoding="numeric")
+    assert cache.hits == 2
+
+
+def test_cache_options_set_by_previous_traces():
+    bar_a = go.Bar(x=[1, 2], y=[1, 2], name="a")
+    bar_b = go.Bar(x=[1, 2], y=[3, 4], name="b")
+    cache = TraceCache()
+    get_tikz_code(go.Figure([bar_a, bar_b]), cache=cache)
+
+    # The options of b were already set by a when b was cached
+    fig = go.Figure([bar_b])
+    code = get_tikz_code(fig, cache=cache)
+    assert cache.hits == 1
+    assert code == get_tikz_code(fig)
+    assert "ybar" in code.split("\\addplot")[0]
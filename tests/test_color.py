@@ -0,0 +1,27 @@
+import types
+import pytest
+from tikzplotly._color import convert_color, color_to_rgb, named_colors
+
+
+def test_named_colors():
+    table = named_colors()
+    assert isinstance(table, types.MappingProxyType)
+    assert table["aliceblue"] == (240, 248, 255)
+    assert all(len(rgb) == 3 and all(isinstance(c, int) and 0 <= c <= 255 for c in rgb) for rgb in table.values())
+    with pytest.raises(TypeError):
+        table["aliceblue"] = (0, 0, 0)
+    assert named_colors() is table
+
+
+@pytest.mark.parametrize("color, expected", [
+    ("AliceBlue", ("aliceblue", "RGB", "240, 248, 255", 1)),
+    ("red", ("red", None, None, 1)),
+    ("#1f77b4", ("1f77b4", "HTML", "1f77b4", 1)),
+])
+def test_convert_color(color, expected):
+    assert convert_color(color) == expected
+
+
+@pytest.mark.parametrize("color", ["#f0f8ff", "#F0F8FF", "rgb(240, 248, 255)", "rgba(240,248,255,0.5)", "aliceblue"])
+def test_color_to_rgb(color):
+    assert color_to_rgb(color) == (240, 248, 255)
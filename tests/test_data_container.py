@@ -0,0 +1,263 @@
+import datetime
+import re
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from tikzplotly import DataStore, get_tikz_code, save
+from tikzplotly._data import (treat_data, treat_column, format_floats, get_float_format, infer_column, column_info,
+                              column_scope)
+from tikzplotly._dataContainer import DataContainer
+from tikzplotly._dates import parse_dates, format_dates, date_ticks
+
+
+def export_cell_by_cell(data_container):
+    """Reference serialization, formatting each cell with `treat_data`."""
+    export_string = ""
+    for data in data_container.data:
+        export_string += "\\pgfplotstableread{\n"
+        export_string += "x " + " ".join(treat_data(label) for label in data.y_label) + "\n"
+        for i, x in enumerate(data.x):
+            export_string += " ".join([treat_data(x)] + [treat_data(y_col[i]) for y_col in data.y_data]) + "\n"
+        export_string += f"}}\\{data.name}\n"
+    return export_string.replace("None", "nan")
+
+
+@pytest.mark.parametrize("values", [
+    np.array([0.1, 1e16, -0.0, np.nan, np.inf, 1 / 3, 1e-300]),
+    np.arange(10, dtype=np.int32),
+    np.array([0.5, 1.5], dtype=np.float32),
+    (1, 2, 3),
+    (1, 2.5, None),
+    (True, 1, 1.0),
+    ("a b", "c@d", "é[1]", "a b"),
+    np.array(["2020-01-01", "x=y"]),
+    np.array([1.5, "a", None], dtype=object),
+    (2**70, 1),
+])
+def test_treat_column(values):
+    assert treat_column(values) == [treat_data(v) for v in values]
+
+
+@pytest.mark.parametrize("float_format, expected", [
+    (None, ["0.30000000000000004", "12345.678", "nan", "-2.5e-07"]),
+    ("shortest", ["0.30000000000000004", "12345.678", "nan", "-2.5e-07"]),
+    (3, ["0.3", "12300.0", "nan", "-2.5e-07"]),
+    ("%.2f", ["0.30", "12345.68", "nan", "-0.00"]),
+])
+def test_format_floats(float_format, expected):
+    values = np.array([0.1 + 0.2, 12345.678, np.nan, -2.5e-7])
+    assert format_floats(values, float_format) == expected
+
+
+def test_format_floats_integers():
+    assert format_floats(np.array([1.0, -2.0, np.nan]), "shortest") == ["1", "-2", "nan"]
+    assert format_floats(np.array([1234567.0, 2.0]), 2) == ["1200000", "2"]
+    assert format_floats(np.array([1.0, 2.0])) == ["1.0", "2.0"]
+    assert format_floats(np.array([1, 2]), 3) == ["1", "2"]
+    with pytest.raises(ValueError):
+        format_floats(np.array([1.5]), 0)
+
+
+def test_get_float_format():
+    assert get_float_format(None, None, 0, "a") is None
+    assert get_float_format(3, None, 0, "a") == 3
+    assert get_float_format(3, "%.1f", 0, "a") == "%.1f"
+    assert get_float_format({"a": 2, None: 5}, None, 0, "a") == 2
+    assert get_float_format({1: 2, None: 5}, None, 0, "a") == 5
+    assert get_float_format({"a": 2}, {None: "shortest"}, 0, "a") == 2
+    assert get_float_format({"a": 2}, {"a": "shortest"}, 0, "a") == "shortest"
+    assert get_float_format({"xaxis": 2}, None, "xaxis") == 2
+
+
+def test_float_format_tables():
+    data_container = DataContainer()
+    x = np.array([0.0, 0.5])
+    data_container.add_data(x, np.array([1 / 3, 2 / 3]), "a")
+    data_container.float_format = 2
+    data_container.add_data(x, np.array([1 / 3, 2 / 3]), "b")
+    assert len(data_container.data) == 2
+    code = data_container.export_data()
+    assert "0.5 0.6666666666666666\n" in code
+    assert "0.5 0.67\n" in code
+
+
+def test_export_data():
+    data_container = DataContainer()
+    x = np.linspace(0, 1, 50) ** 2
+    data_container.add_data(x, np.sin(x), "sin x")
+    data_container.add_data(x, [None] * 25 + list(range(25)), "None")
+    data_container.add_data(("a", "b", "c d"), (1, 2.5, 3), "cat")
+    assert data_container.export_data() == export_cell_by_cell(data_container)
+
+
+@pytest.mark.parametrize("x, expr", [
+    (range(5), "\\coordindex"),
+    ([1952, 1957, 1962], "\\coordindex*5+1952"),
+    (np.linspace(-1, 1, 51), "\\coordindex*0.04-1"),
+    (np.array([3.0, 2.0, 1.0]), "\\coordindex*(-1)+3"),
+    ([0, 1, 3], None),
+    ([0.0, 1.0, np.nan], None),
+    ([0, 1], None),
+    (["a", "b", "c"], None),
+])
+def test_x_expr(x, expr):
+    data_container = DataContainer()
+    macro, _ = data_container.add_data(x, np.arange(len(x)), "y")
+    assert data_container.x_expr(macro) == expr
+    header = data_container.export_data().split("\n")[1]
+    assert header == ("y" if expr is not None else "x y")
+
+
+@pytest.mark.parametrize("values, kind, missing", [
+    ([], "empty", []),
+    ([1, 2, True], "integer", [False, False, False]),
+    (np.arange(3), "integer", [False, False, False]),
+    ([1, 2.5, None], "numeric", [False, False, True]),
+    (np.array([1, np.nan]), "numeric", [False, True]),
+    (["2021-07-20", "2021-07-21 12:00"], "datetime", [False, False]),
+    (np.array(["a", "b"]), "categorical", [False, False]),
+    (["a", None, "b"], "categorical", [False, True, False]),
+    (["1-2-3", "a"], "categorical", [False, False]),
+    ([1, "a"], "mixed", [False, False]),
+])
+def test_infer_column(values, kind, missing):
+    info = infer_column(values)
+    assert info.kind == kind
+    assert info.missing.tolist() == missing
+
+def test_infer_column_numeric():
+    assert infer_column([1, 2, 3]).numeric.tolist() == [1, 2, 3]
+    assert infer_column([1.0, np.nan]).numeric is not None
+    # Values of several types, or missing, are written one by one
+    assert infer_column([1, 2.5]).numeric is None
+    assert infer_column([1.0, None]).numeric is None
+    assert infer_column(["a"]).numeric is None
+
+def test_column_scope():
+    values = [1, 2, 3]
+    assert column_info(values) is not column_info(values)
+    with column_scope():
+        assert column_info(values) is column_info(values)
+        assert column_info(list(values)) is not column_info(values)
+
+def test_parse_dates():
+    dates = parse_dates([pd.Timestamp("2021-07-20", tz="Europe/Paris"), datetime.date(2021, 7, 21), None,
+                         "2021-07-22 19:30"])
+    assert dates.dtype.kind == "M"
+    assert format_dates(dates).tolist() == ["2021-07-20 00:00", "2021-07-21 00:00", "nan", "2021-07-22 19:30"]
+    assert format_dates(dates[:2]).tolist() == ["2021-07-20", "2021-07-21"]
+
+@pytest.mark.parametrize("low, high, labels", [
+    ("2021-01-01", "2021-01-01T05:00", ["2021-01-01 00:00", "2021-01-01 01:00", "2021-01-01 02:00",
+                                        "2021-01-01 03:00", "2021-01-01 04:00", "2021-01-01 05:00"]),
+    ("2021-01-15", "2021-12-31", ["2021-03", "2021-05", "2021-07", "2021-09", "2021-11"]),
+    ("1998-06-01", "2021-01-01", ["2000", "2005", "2010", "2015", "2020"]),
+    ("2021-01-01", "2021-01-01", ["2021-01-01"]),
+])
+def test_date_ticks(low, high, labels):
+    ticks, tick_labels = date_ticks(np.datetime64(low, "s"), np.datetime64(high, "s"))
+    assert tick_labels == labels
+    assert len(ticks) == len(labels)
+
+def test_add_data_shared_x():
+    data_container = DataContainer()
+    macro_1, _ = data_container.add_data(np.arange(5), np.arange(5))
+    macro_2, _ = data_container.add_data([0.0, 1.0, 2.0, 3.0, 4.0], np.arange(5))
+    macro_3, _ = data_container.add_data(np.arange(5) + 1, np.arange(5))
+    macro_4, _ = data_container.add_data(("a", "b"), (1, 2))
+    macro_5, _ = data_container.add_data(("a", "b"), (3, 4))
+    assert macro_1 == macro_2
+    assert len({macro_1, macro_3, macro_4}) == 3
+    assert macro_4 == macro_5
+    assert len(data_container.data) == 3
+
+
+def test_add_data_nan_x_not_shared():
+    data_container = DataContainer()
+    macro_1, _ = data_container.add_data(np.array([0.0, np.nan]), [1, 2])
+    macro_2, _ = data_container.add_data(np.array([0.0, np.nan]), [1, 2])
+    assert len(data_container.data) == 2
+    assert macro_2 == macro_1 + "A"
+
+
+def test_table_names():
+    x = np.linspace(0, 1, 5000)
+    tables = [(x, x ** 2), (x + 1, x), (("a", "b"), (1, 2))]
+    names = []
+    for order in [tables, tables[::-1]]:
+        data_container = DataContainer()
+        names.append({str(x_values[:2]): data_container.add_data(x_values, y_values)[0] for x_values, y_values in order})
+    # The names only depend on the content of the tables, not on their order
+    assert names[0] == names[1]
+    assert all(re.fullmatch(r"\\data[A-P]{8}", name) for name in names[0].values())
+
+    # Arrays differing beyond what their repr shows have different names
+    z = np.zeros(5000)
+    other_z = z.copy()
+    other_z[2500] = 1
+    data_container = DataContainer()
+    assert data_container.add_data3d(x, x, z)[0] != data_container.add_data3d(x, x, other_z)[0]
+    assert data_container.add_data3d(x, x, z)[0] == DataContainer().add_data3d(x, x, z + 1e-9)[0]
+
+
+def test_data_dir(tmp_path):
+    data_container = DataContainer()
+    data_container.add_data([0, 1, 2], [3, 4, None], "a")
+    data_container.add_data([0, 1], [1, 2], "b")
+    data_container.add_data3d([0, 1], [1, 2], [2, 3])
+    inline = data_container.export_data()
+    code = data_container.export_data(data_dir=tmp_path / "data")
+
+    files = sorted((tmp_path / "data").iterdir())
+    assert len(files) == 3
+    for line, table in zip(code.splitlines(), inline.split("\\pgfplotstableread{\n")[1:]):
+        file_name, macro = line[len("\\pgfplotstableread{"):].split("}", 1)
+        body, inline_macro = table.split("}", 1)
+        with open(file_name, encoding="utf-8") as f:
+            assert f.read() == body
+        assert macro == inline_macro.rstrip("\n")
+
+    # Unchanged tables are not rewritten
+    mtimes = [f.stat().st_mtime_ns for f in files]
+    assert data_container.export_data(data_dir=tmp_path / "data") == code
+    assert [f.stat().st_mtime_ns for f in files] == mtimes
+
+
+def test_data_store(tmp_path):
+    store = DataStore(tmp_path / "shared.tex", input_path="figures/shared.tex")
+    t = np.linspace(0, 1, 100)
+    figures = [
+        go.Figure([go.Scatter(x=t, y=np.sin(t), name="sin"), go.Scatter(x=t, y=np.cos(t), name="cos")]),
+        go.Figure([go.Scatter(x=t, y=np.sin(t), name="sine"), go.Scatter3d(x=t, y=t, z=np.cos(t))]),
+    ]
+    for i, fig in enumerate(figures):
+        assert save(tmp_path / f"fig{i}.tex", fig, data_store=store) is True
+
+    # Each distinct column is stored once: t, sin(t) and cos(t)
+    shared = (tmp_path / "shared.tex").read_text(encoding="utf-8")
+    assert shared.count("\\pgfplotstableread") == len(store.columns) == 3
+    assert shared.index(f"\\ifdefined\\{store.guard}\\endinput\\fi") < shared.index("\\pgfplotstableread")
+    for i in range(2):
+        code = (tmp_path / f"fig{i}.tex").read_text(encoding="utf-8")
+        assert "\\input{figures/shared.tex}" in code
+        assert "\\pgfplotstableread" not in code
+        assert "{100}" in code
+    assert "columns={x,y,z}" in code
+
+    # Saving again adds nothing to the store
+    assert save(tmp_path / "fig0.tex", figures[0], data_store=store) is False
+
+
+def test_data_store_column_names(tmp_path):
+    store = DataStore(tmp_path / "shared.tex")
+    fig = go.Figure([go.Scatter(x=[1, 2, 3], y=[1, 2, 4], name=name)
+                     for name in ["New Zealand", "a=b, {c}%", "sin/cos #1"]])
+    code = get_tikz_code(fig, data_store=store)
+    keys = re.findall(r"create on use/(.*)/\.style", code)
+    assert len(keys) == 3
+    # The names of the columns are single pgfkeys path components, referenced as such by the plots
+    for key in keys:
+        assert re.fullmatch(r"[A-Za-z0-9_.()-]+", key)
+        assert f"y={key}]" in code
+    assert "columns={" + ",".join(keys) + "}" in code
@@ -0,0 +1,69 @@
+import warnings
+import plotly.graph_objects as go
+import pytest
+from tikzplotly import Diagnostics, TraceCache, get_tikz_code
+from tikzplotly._utils import sanitize_tex_char
+
+
+def figure_with_diagnostics():
+    fig = go.Figure()
+    fig.add_scatter(x=["2021-01-01", "2021-01-02", "2021-01-03"], y=[1, 2, 3], name="é")
+    fig.add_scatter(x=[0, 1], y=[0, 1], mode="text", text=["a", "b"])
+    fig.add_scatter(x=[0, 1], y=[1, 0], mode="text", text=["c", "d"])
+    return fig
+
+
+def test_diagnostics_collected():
+    fig = figure_with_diagnostics()
+    diagnostics = Diagnostics()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        code = get_tikz_code(fig, diagnostics=diagnostics)
+    assert code == get_tikz_code(fig)
+
+    counts = diagnostics.counts()
+    assert counts["scatter-mode-unsupported"] == 2
+    assert "date-assumed" in counts
+    assert "tex-character-replaced" in diagnostics
+    assert diagnostics["scatter-mode-unsupported"].message == "Scatter : Mode text is not supported yet."
+    assert [entry["code"] for entry in diagnostics.as_list()] == [entry.code for entry in diagnostics]
+
+
+def test_diagnostics_warnings():
+    # Without collector, a warning is emitted once per code
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        get_tikz_code(figure_with_diagnostics())
+    messages = [str(w.message) for w in caught]
+    assert messages.count("Scatter : Mode text is not supported yet.") == 1
+    assert len(messages) == len(set(messages))
+
+    # Outside a conversion, the functions still warn
+    with pytest.warns(UserWarning, match="has been replaced"):
+        sanitize_tex_char("é")
+
+    with pytest.warns(UserWarning, match="not supported"):
+        get_tikz_code(figure_with_diagnostics(), diagnostics=Diagnostics(emit_warnings=True))
+
+
+def test_diagnostics_callback():
+    received = []
+    chunks = get_tikz_code(figure_with_diagnostics(), diagnostics=received.append)
+    assert len(received) == 1 and isinstance(received[0], Diagnostics)
+    assert "scatter-mode-unsupported" in received[0]
+    assert chunks
+
+    with pytest.raises(TypeError):
+        get_tikz_code(figure_with_diagnostics(), diagnostics="verbose")
+
+
+def test_diagnostics_cache():
+    fig = figure_with_diagnostics()
+    cache = TraceCache()
+    counts = []
+    for _ in range(2):
+        diagnostics = Diagnostics()
+        get_tikz_code(fig, cache=cache, diagnostics=diagnostics)
+        counts.append(diagnostics.counts())
+    assert cache.hits == 3
+    assert counts[0] == counts[1]
@@ -0,0 +1,67 @@
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+from tikzplotly import get_tikz_code
+from tikzplotly._downsample import downsample_indices, downsample_trace, get_point_budget
+
+
+def noisy_line(n=10_000, seed=0):
+    x = np.arange(n, dtype=float)
+    y = np.sin(x / 500) + np.random.default_rng(seed).normal(0, 0.1, n)
+    return x, y
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_budget_and_endpoints(method):
+    x, y = noisy_line()
+    indices = downsample_indices(x, y, 200, method)
+    assert len(indices) <= 200
+    assert indices[0] == 0 and indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_minmax_extent():
+    x, y = noisy_line()
+    selected = y[downsample_indices(x, y, 100, "minmax")]
+    assert selected.min() == y.min()
+    assert selected.max() == y.max()
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_gaps(method):
+    x, y = noisy_line()
+    y[3000:3050] = np.nan
+    x[7000] = np.nan
+    indices = downsample_indices(x, y, 300, method)
+    # One missing point is kept per gap, surrounded by the ends of the segments
+    assert list(indices[~np.isfinite(y[indices]) | ~np.isfinite(x[indices])]) == [3000, 7000]
+    assert {2999, 3050, 6999, 7001} <= set(indices)
+
+
+def test_small_trace_unchanged():
+    x, y = [0, 1, 2], [None, 1, 2]
+    assert downsample_trace(x, y, 3) == (x, y)
+    assert downsample_trace(x, y, None) == (x, y)
+
+
+def test_point_budget():
+    budgets = {0: 10, "b": 20, None: 30}
+    assert get_point_budget(budgets, 0, "a") == 10
+    assert get_point_budget(budgets, 1, "b") == 20
+    assert get_point_budget(budgets, 2, "c") == 30
+    assert get_point_budget({1: 10}, 0, "a") is None
+    assert get_point_budget(50, 3, None) == 50
+    assert get_point_budget(np.int64(50), 3, None) == 50
+
+
+def test_max_points():
+    x, y = noisy_line(1000)
+    fig = go.Figure()
+    fig.add_scatter(x=x, y=y, mode="lines", name="line")
+    fig.add_scatter(x=x, y=y, mode="markers", name="markers")
+    code = get_tikz_code(fig, max_points=50)
+    tables = [table.split("}\\data")[0] for table in code.split("\\pgfplotstableread{\n")[1:]]
+    assert len(tables[0].splitlines()) == 50 + 1  # header and rows
+    assert len(tables[1].splitlines()) == 1000 + 1
+    # The figure is not modified
+    assert len(fig.data[0].x) == 1000
@@ -0,0 +1,77 @@
+import copy
+import subprocess
+import sys
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+from tikzplotly import get_tikz_code
+from tikzplotly._figure import FigureDict
+from .test_scatter import plot_2 as plot_scatter_2
+from .test_bars import plot_horizontal1
+from .test_scatter3d import plot_scatter_3d_view
+from .test_heatmap import plot_3 as plot_heatmap_3
+
+
+@pytest.mark.parametrize("plot", [plot_scatter_2, plot_horizontal1, plot_scatter_3d_view, plot_heatmap_3])
+def test_figure_dict(plot, tmp_path):
+    fig = plot()
+    img_name = str(tmp_path / "heatmap.png")
+    expected = get_tikz_code(fig, img_name=img_name)
+    assert get_tikz_code(fig.to_plotly_json(), img_name=img_name) == expected
+
+    json_path = tmp_path / "figure.json"
+    fig.write_json(json_path)
+    assert get_tikz_code(json_path, img_name=img_name) == expected
+    assert get_tikz_code(str(json_path), img_name=img_name) == expected
+
+
+def test_figure_dict_not_modified():
+    figure_dict = {"data": [{"y": [1, 3, 2], "mode": "lines"}]}
+    original = copy.deepcopy(figure_dict)
+    code = get_tikz_code(figure_dict)
+    assert figure_dict == original
+    assert code == get_tikz_code(go.Figure(go.Scatter(y=[1, 3, 2], mode="lines")))
+
+
+def test_node_defaults():
+    fig = FigureDict({"data": [{"x": [1], "coloraxis": "coloraxis"}], "layout": {"title": "Title"}})
+    trace = fig.data[0]
+    assert trace.type == "scatter"
+    assert trace.marker.line.color is None
+    assert trace.coloraxis == "coloraxis"
+    assert fig.layout.xaxis2.title.text is None
+    assert fig.layout.title.text == "Title"
+    assert fig.layout.annotations == ()
+    assert isinstance(FigureDict({"data": [{"x": {"dtype": "i1", "bdata": "AQI="}}]}).data[0].x, np.ndarray)
+
+
+def test_without_plotly():
+    code = (
+        "import sys, tikzplotly\n"
+        "tikzplotly.get_tikz_code({'data': [{'type': 'bar', 'x': ['a', 'b'], 'y': [1, 2]}]})\n"
+        "assert 'plotly' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.parametrize("trace", [
+    {"type": "scatter", "y": [1, 2], "mode": "lines+invalid"},
+    {"type": "scatter", "y": [1, 2], "line": {"dash": "dotted"}},
+    {"type": "bar", "y": [1, 2], "orientation": "vertical"},
+])
+def test_figure_dict_invalid(trace):
+    with pytest.raises(ValueError, match="Invalid value"):
+        get_tikz_code({"data": [trace]})
+
+
+def test_figure_dict_valid_enumerations():
+    figure_dict = {"data": [{"y": [1, 2], "mode": "lines+markers", "line": {"dash": "dot"}}]}
+    assert get_tikz_code(figure_dict) == get_tikz_code(go.Figure(figure_dict))
+
+
+@pytest.mark.parametrize("colorscale", ["Viridis", "viridis_r", ["red", "blue"]])
+def test_figure_dict_colorscale(colorscale, tmp_path):
+    figure_dict = {"data": [{"type": "heatmap", "z": [[1, 2], [3, 4]], "colorscale": colorscale}]}
+    code = get_tikz_code(figure_dict, img_name=str(tmp_path / "dict.png"))
+    expected = get_tikz_code(go.Figure(figure_dict), img_name=str(tmp_path / "dict.png"))
+    assert code == expected
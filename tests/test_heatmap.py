@@ -5,6 +5,8 @@ import os
 from .helpers import assert_equality
 import pathlib
 import datetime
+from PIL import Image
+import tikzplotly
 
 this_dir = pathlib.Path(__file__).resolve().parent
 test_name = "test_heatmap"
@@ -71,4 +73,22 @@ def test_4():
     assert_equality(plot_4(), os.path.join(this_dir, test_name, test_name + "_4_reference.tex"), img_name="/tmp/tikzplotly/fig4.png")
 
 def test_5():
-    assert_equality(plot_5(), os.path.join(this_dir, test_name, test_name + "_5_reference.tex"))
\ No newline at end of file
+    assert_equality(plot_5(), os.path.join(this_dir, test_name, test_name + "_5_reference.tex"))
+
+def test_image():
+    fig = go.Figure(data=go.Heatmap(z=[[0, None, 4], [8, 10, 12]], zmin=2, zmax=10, colorscale=[[0, "#000000"], [1, "rgb(255, 0, 0)"]]))
+    code = tikzplotly.get_tikz_code(fig, img_name="/tmp/tikzplotly/fig_image.png")
+    image = np.array(Image.open("/tmp/tikzplotly/fig_image.png"))
+    assert image.shape == (2, 3, 4)
+    assert image[0, 0].tolist() == [0, 0, 0, 255]        # clipped to zmin
+    assert image[0, 1, 3] == 0                           # missing value is transparent
+    assert image[0, 2].tolist() == [64, 0, 0, 255]
+    assert image[1, 2].tolist() == [255, 0, 0, 255]      # clipped to zmax
+    assert "point meta max=10," in code and "point meta min=2," in code
+
+def test_image_zmid():
+    fig = go.Figure(data=go.Heatmap(z=[[-1, 0, 3]], zmid=0, colorscale=[[0, "#0000ff"], [0.5, "#ffffff"], [1, "#ff0000"]]))
+    code = tikzplotly.get_tikz_code(fig, img_name="/tmp/tikzplotly/fig_image_zmid.png")
+    image = np.array(Image.open("/tmp/tikzplotly/fig_image_zmid.png"))
+    assert image[0, 1].tolist() == [255, 255, 255, 255]
+    assert "point meta max=3," in code and "point meta min=-3," in code
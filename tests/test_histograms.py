@@ -3,6 +3,7 @@ import plotly.graph_objects as go
 import numpy as np
 import os
 from .helpers import assert_equality
+from tikzplotly._histogram import get_bin_edges
 import pathlib
 import pytest
 
@@ -92,4 +93,43 @@ def test_8():
     assert_equality(plot_8(), os.path.join(this_dir, test_name, test_name + "_8_reference.tex"))
 
 def test_9():
-    assert_equality(plot_9(), os.path.join(this_dir, test_name, test_name + "_9_reference.tex"))
\ No newline at end of file
+    assert_equality(plot_9(), os.path.join(this_dir, test_name, test_name + "_9_reference.tex"))
+
+def test_prebinned_1():
+    assert_equality(plot_1(), os.path.join(this_dir, test_name, test_name + "_prebinned_1_reference.tex"), prebin_histograms=True)
+
+def test_prebinned_2():
+    assert_equality(plot_2(), os.path.join(this_dir, test_name, test_name + "_prebinned_2_reference.tex"), prebin_histograms=True)
+
+def test_prebinned_3():
+    assert_equality(plot_3(), os.path.join(this_dir, test_name, test_name + "_prebinned_3_reference.tex"), prebin_histograms=True)
+
+@pytest.mark.parametrize("histnorm", ["percent", "probability", "density", "probability density"])
+def test_prebinned_4(histnorm):
+    assert_equality(plot_4(histnorm), os.path.join(this_dir, test_name, test_name + f"_prebinned_4_{histnorm.replace(' ', '_')}_reference.tex"), prebin_histograms=True)
+
+def test_prebinned_5():
+    assert_equality(plot_5(), os.path.join(this_dir, test_name, test_name + "_prebinned_5_reference.tex"), prebin_histograms=True)
+
+def test_prebinned_7():
+    assert_equality(plot_7(), os.path.join(this_dir, test_name, test_name + "_prebinned_7_reference.tex"), prebin_histograms=True)
+
+def test_prebinned_9():
+    assert_equality(plot_9(), os.path.join(this_dir, test_name, test_name + "_prebinned_9_reference.tex"), prebin_histograms=True)
+
+def test_prebinned_xbins():
+    fig = go.Figure(data=[go.Histogram(x=[0.1, 0.2, 0.9, 1.0, 1.4], xbins=dict(start=0, end=1.5, size=0.5))])
+    edges = get_bin_edges(np.array(fig.data[0].x), fig.data[0].xbins, None)
+    assert np.allclose(edges, [0, 0.5, 1, 1.5])
+
+def test_prebinned_auto_bins():
+    tips = px.data.tips()
+    # nbinsx is a maximal number of bins, of a nice size
+    edges = get_bin_edges(tips.total_bill.to_numpy(), None, 20)
+    assert np.allclose(edges, np.arange(0, 60, 5))
+    # Without nbinsx, the size follows the spread of the samples
+    edges = get_bin_edges(tips.total_bill.to_numpy(), None, None)
+    assert np.allclose(edges, np.arange(2, 54, 2))
+    # Integers are centered in their bins
+    edges = get_bin_edges(np.array([1., 2, 2, 3, 5]), None, None)
+    assert np.allclose(edges, [-0.5, 1.5, 3.5, 5.5])
@@ -1,7 +1,11 @@
+import datetime
 import tikzplotly
 from tikzplotly._tex import *
 import os
 import plotly.express as px
+import plotly.graph_objects as go
+import numpy as np
+import pandas as pd
 import pytest
 import pathlib
 from .helpers import compare_two_files
@@ -38,3 +42,173 @@ def test_create_document(options):
         f.write(main_tex_content)
 
     compare_two_files(main_tex_path, os.path.join(this_dir, "test_tikzplotly", f"test_create_document_{options}.tex"))
+
+def test_iter_tikz_code():
+    fig = px.line(x=[1, 2, 3], y=[1, 4, 9], color=["a", "a", "b"])
+    chunks = list(tikzplotly.iter_tikz_code(fig))
+    assert len(chunks) > 1
+    assert "".join(chunks) == tikzplotly.get_tikz_code(fig)
+
+@pytest.mark.parametrize("showlegend", [True, False])
+def test_save_stream(showlegend):
+    import io
+    fig = px.line(x=[1, 2, 3], y=[1, 4, 9], color=["a", "a", "b"])
+    fig.update_layout(showlegend=showlegend)
+    stream = io.StringIO()
+    tikzplotly.save(stream, fig)
+    assert stream.getvalue() == tikzplotly.get_tikz_code(fig)
+    assert ("\\addlegendentry" in stream.getvalue()) == showlegend
+
+def test_profile():
+    import plotly.graph_objects as go
+    fig = px.line(x=[1, 2, 3], y=[1, 4, 9], color=["a", "a", "b"])
+    fig.add_trace(go.Heatmap(z=[[1, 2], [3, 4]], showscale=False))
+    fig.add_annotation(x=1, y=1, text="note")
+    profile = tikzplotly.Profile()
+    img_name = str(this_dir / "tmp_heatmap.png")
+    code = tikzplotly.get_tikz_code(fig, profile=profile, img_name=img_name)
+    assert code == tikzplotly.get_tikz_code(fig, img_name=img_name)
+
+    assert [trace["type"] for trace in profile.traces] == ["scatter", "scatter", "heatmap"]
+    assert profile.trace_types["scatter"].count == 2
+    stages = profile.as_dict()["stages"]
+    assert {"axis", "traces", "add_data", "heatmap", "annotations", "assembly", "export_data", "colors"} <= set(stages)
+    assert stages["add_data"]["count"] == 2 and stages["traces"]["count"] == 3
+    assert profile.total >= stages["traces"]["seconds"] > 0
+
+    collected = []
+    tikzplotly.get_tikz_code(fig, profile=collected.append, img_name=img_name)
+    os.remove(img_name)
+    assert len(collected) == 1 and isinstance(collected[0], tikzplotly.Profile)
+    assert "export_data" in collected[0].report()
+
+def test_save_if_changed(tmp_path):
+    import plotly.graph_objects as go
+    fig = px.line(x=[1, 2, 3], y=[1, 4, 9])
+    fig.add_trace(go.Heatmap(z=[[1, 2], [3, 4]], showscale=False))
+    tex_path = tmp_path / "figure.tex"
+    img_path = tmp_path / "img" / "heatmap.png"
+    assert tikzplotly.save(tex_path, fig, img_name=str(img_path)) is True
+    os.utime(tex_path, (0, 0))
+    os.utime(img_path, (0, 0))
+
+    # Nothing changed, nothing is written
+    assert tikzplotly.save(tex_path, fig, img_name=str(img_path)) is False
+    assert tex_path.stat().st_mtime == 0 and img_path.stat().st_mtime == 0
+
+    # Only the image changed
+    fig.data[1].z = [[4, 3], [2, 1]]
+    assert tikzplotly.save(tex_path, fig, img_name=str(img_path)) is True
+    assert tex_path.stat().st_mtime == 0 and img_path.stat().st_mtime > 0
+
+    fig.data[0].y = [1, 2, 3]
+    assert tikzplotly.save(tex_path, fig, img_name=str(img_path)) is True
+    assert tex_path.read_text(encoding="utf-8") == tikzplotly.get_tikz_code(fig, img_name=str(img_path))
+    assert sorted(os.listdir(tmp_path)) == ["figure.tex", "img"]
+
+
+def test_precision():
+    x = np.array([0, 1, 2, 5]) / 3
+    fig = go.Figure([go.Scatter(x=x, y=3 * x, name="a"), go.Scatter(x=x, y=x / 3, name="b")])
+    fig.update_layout(xaxis_range=[0.1 + 0.2, 1 / 3])
+    code = tikzplotly.get_tikz_code(fig, precision={"b": 3, "xaxis": 2}, float_format={None: "shortest"})
+    assert "0.3333333333333333 1\n" in code
+    assert "0.333 0.111\n" in code
+    assert "xmin=0.3," in code
+    assert "xmax=0.33\n" in code
+
+    # Float32 data is rounded and written as float32, without the digits of its float64 value
+    fig = go.Figure(go.Scatter(x=np.float32([0.1, 0.2]), y=np.float32([1 / 3, 2 / 3])))
+    code = tikzplotly.get_tikz_code(fig, precision=3)
+    assert "\n0.1 0.333\n0.2 0.667\n" in code
+
+
+def test_x_expr():
+    fig = go.Figure([go.Scatter(y=[3, 1, 2]), go.Bar(x=[2000, 2001, 2002], y=[1, 2, 3])])
+    code = tikzplotly.get_tikz_code(fig)
+    assert "table[x expr=\\coordindex, y=y0]" in code
+    assert "table[x expr=\\coordindex+2000, y=y0]" in code
+    assert "\nx y0\n" not in code
+
+
+def test_shared_categories():
+    fig = go.Figure([go.Bar(x=["a", "b"], y=[1, 2]), go.Scatter(x=["b", "c", "a"], y=[3, 4, 5])])
+    code = tikzplotly.get_tikz_code(fig)
+    assert "xtick={0,1,2},\nxticklabels={a,b,c}," in code
+    assert "symbolic x coords" not in code
+    assert "\n1 3\n2 4\n0 5\n" in code
+
+
+def test_shared_categories_text():
+    fig = go.Figure([go.Bar(x=["a", "b"], y=[1, 2]),
+                     go.Scatter(x=["b", "a"], y=[3, 4], mode="text+markers", text=["p", "q"])])
+    fig.add_annotation(x="b", y=3, text="hi", showarrow=False)
+    code = tikzplotly.get_tikz_code(fig)
+    # The texts and the annotations are placed at the positions of the categories
+    assert "\\node at (axis cs:1,3) {p};" in code
+    assert "\\node at (axis cs:0,4) {q};" in code
+    assert "at (axis cs:1, 3) {hi};" in code
+
+
+def test_date_encoding_text():
+    fig = go.Figure(go.Scatter(x=["2021-01-01", "2021-01-03"], y=[1, 2], mode="text", text=["p", "q"]))
+    fig.add_annotation(x="2021-01-02", y=2, text="hi", showarrow=False)
+    code = tikzplotly.get_tikz_code(fig, date_encoding="numeric", diagnostics=lambda diagnostics: None)
+    assert "\\node at (axis cs:2.0,2) {q};" in code
+    assert "at (axis cs:1.0, 2) {hi};" in code
+    code = tikzplotly.get_tikz_code(fig, diagnostics=lambda diagnostics: None)
+    assert "\\node at (axis cs:2021-01-03,2) {q};" in code
+    assert "at (axis cs:2021-01-02, 2) {hi};" in code
+
+
+def test_date_encoding():
+    days = pd.date_range("2021-01-01", periods=5, freq="D")
+    fig = go.Figure([
+        go.Scatter(x=days, y=[1, 2, 3, 4, 5], name="a"),
+        go.Scatter(x=["2021-01-03 12:00", None, "2021-01-11"], y=[1, 2, 3], name="b"),
+        go.Scatter(x=[datetime.datetime(2021, 1, 2, 6), np.datetime64("2021-01-03")], y=[1, 2], name="c"),
+    ])
+    code = tikzplotly.get_tikz_code(fig, date_encoding="numeric")
+    assert "date coordinates in" not in code
+    # Days since the first date of the axis
+    assert "table[x expr=\\coordindex, y=a]" in code
+    assert "\n2.5 1\nnan 2\n10.0 3\n" in code
+    assert "\n1.25 1\n2.0 2\n" in code
+    assert "xtick={0,2,4,6,8,10},\nxticklabels={2021-01-01,2021-01-03,2021-01-05,2021-01-07,2021-01-09,2021-01-11}" in code
+
+    code = tikzplotly.get_tikz_code(fig, diagnostics=lambda diagnostics: None)
+    assert "date coordinates in=x" in code
+    assert "\n2021-01-01 1\n2021-01-02 2\n" in code
+
+    with pytest.raises(ValueError):
+        tikzplotly.get_tikz_code(fig, date_encoding="julian")
+
+
+def test_dateplot_times():
+    hours = pd.date_range("2021-01-01", periods=3, freq="h")
+    fig = go.Figure([go.Scatter(x=hours, y=[1, 2, 3]), go.Scatter(x=["2021-01-02 12:30", None], y=[4, 5])])
+    code = tikzplotly.get_tikz_code(fig, diagnostics=lambda diagnostics: None)
+    assert "date coordinates in=x" in code
+    # The space between the day and the time does not split the cells
+    assert "\n{2021-01-01 00:00} 1\n{2021-01-01 01:00} 2\n{2021-01-01 02:00} 3\n" in code
+    assert "\n{2021-01-02 12:30} 4\nnan 5\n" in code
+
+
+def test_dateplot_y_dates():
+    fig = go.Figure(go.Scatter(x=[1, 2, 3], y=["2021-01-02", None, "2021-01-01"]))
+    code = tikzplotly.get_tikz_code(fig, diagnostics=lambda diagnostics: None)
+    # pgfplots.dateplot reads the dates of x only: the dates of y are categories
+    assert "date coordinates in" not in code
+    assert "ytick={0,1}" in code
+    assert "yticklabels={2021-01-02,2021-01-01}" in code
+    assert "\ny0\n0.0\nnan\n1.0\n" in code
+
+
+def test_date_encoding_range():
+    fig = go.Figure(go.Scatter(x=["2021-01-01", "2021-03-01"], y=[1, 2]))
+    fig.update_layout(xaxis_range=["2021-02-01", "2021-02-15"])
+    code = tikzplotly.get_tikz_code(fig, date_encoding="numeric")
+    # The origin of the dates is the first limit of the axis
+    assert "xmin=0.0,\nxmax=14.0," in code
+    assert "\n-31.0 1\n28.0 2\n" in code
+    assert "xticklabels={2021-02-04,2021-02-11}" in code